@@ -1,14 +1,17 @@
 """App module with app initialization function."""
 from fastapi import FastAPI
 
+from backend.api.app_service.body_limit import (MULTIPART_OVERHEAD,
+                                                BodyLimitMiddleware)
 from backend.api.app_service.exception_handlers import exception_handler
+from backend.api.app_service.json_response import FastJSONResponse
 from backend.api.app_service.middleware import LoggingMiddleware
-from backend.api.app_service.service_functions import shutdown, startup
+from backend.api.app_service.lifespan import shutdown, startup
+from backend.api.app_service.telemetry import MetricsMiddleware
 from backend.api.core.base import sessionmanager
 from backend.api.core.config import config
-from backend.api.routes.media import router as media_router
-from backend.api.routes.tweet import router as tweet_router
-from backend.api.routes.user import router as user_router
+from backend.api.routes import event, feed, follow, media, search
+from backend.api.routes import service, trend, tweet, user
 
 
 def init_app(init_db=True) -> FastAPI:
@@ -24,15 +27,37 @@ def init_app(init_db=True) -> FastAPI:
         FastAPI app with routers.
     """
     if init_db:
-        sessionmanager.init(config.db_config)
-
-    server = FastAPI(title='FastAPI server')
+        sessionmanager.init(
+            config.db_config,
+            config.db_pool,
+            config.db_replicas,
+            config.replica_retry_after,
+        )
+
+    server = FastAPI(
+        title='FastAPI server', default_response_class=FastJSONResponse,
+    )
     server.add_event_handler('startup', startup)
     server.add_event_handler('shutdown', shutdown)
+    server.add_middleware(
+        BodyLimitMiddleware,
+        max_body_size=config.max_upload_size + MULTIPART_OVERHEAD,
+    )
     server.add_middleware(LoggingMiddleware)
+    server.add_middleware(MetricsMiddleware)
     server.add_exception_handler(Exception, exception_handler)
-    server.include_router(user_router)
-    server.include_router(tweet_router)
-    server.include_router(media_router)
+    route_modules = (
+        user,
+        follow,
+        search,
+        tweet,
+        feed,
+        trend,
+        event,
+        media,
+        service,
+    )
+    for route_module in route_modules:
+        server.include_router(route_module.router)
 
     return server
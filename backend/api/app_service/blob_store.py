@@ -0,0 +1,105 @@
+"""
+A module contains the content-addressed media store.
+
+The name of a stored file is the SHA-256 of its content with the image
+extension, and files are sharded into two levels of subdirectories by
+the first characters of the digest. Uploads of content that is already
+stored keep only the existing file.
+"""
+
+
+import os
+import re
+from pathlib import Path
+
+from backend.api.app_service.media_storage import (MEDIA_EXTENSIONS,
+                                                   StagedUpload,
+                                                   discard_upload,
+                                                   publish_upload)
+from backend.api.core.config import config
+
+SHARD_LENGTH = 2
+BLOB_NAME_PATTERN = re.compile('^[0-9a-f]{64}[.][a-z]+$')
+
+
+def blob_name(sha256: str, content_type: str) -> str:
+    """
+    Get the public file name of stored content.
+
+    Args:
+        sha256: Hex digest of the content.
+        content_type: Media type of the content.
+
+    Returns:
+        File name made of the digest and the image extension.
+    """
+    return '{0}{1}'.format(sha256, MEDIA_EXTENSIONS[content_type])
+
+
+def is_blob_name(file_name: str) -> bool:
+    """
+    Check whether a file name addresses stored content.
+
+    Args:
+        file_name: Requested file name.
+
+    Returns:
+        True if the name is made of a digest and an extension.
+    """
+    return BLOB_NAME_PATTERN.match(file_name) is not None
+
+
+def blob_path(file_name: str) -> Path:
+    """
+    Get the path of stored content by its public file name.
+
+    Args:
+        file_name: File name made of the digest and the extension.
+
+    Returns:
+        Path of the file in the sharded media directory.
+    """
+    return Path(
+        config.media_root,
+        file_name[:SHARD_LENGTH],
+        file_name[SHARD_LENGTH:SHARD_LENGTH * 2],
+        file_name,
+    )
+
+
+def resolve_file_path(file_name: str) -> Path:
+    """
+    Find the file served under a public file name.
+
+    Other names come from links created before content addressing and
+    are served only from the flat media directory they were written to,
+    never mapped to stored content by the name given by the uploader.
+
+    Args:
+        file_name: Requested file name.
+
+    Returns:
+        Path of the stored content, or of the file in the flat media
+        directory if the name is not content-addressed.
+    """
+    if is_blob_name(file_name):
+        return blob_path(file_name)
+    return Path(config.media_root, Path(file_name).name)
+
+
+async def store_upload(staged: StagedUpload) -> Path:
+    """
+    Move a staged file into the store, unless the content is stored.
+
+    Args:
+        staged: Staged file.
+
+    Returns:
+        Path of the stored file.
+    """
+    file_path = blob_path(blob_name(staged.sha256, staged.content_type))
+    if os.path.exists(file_path):
+        await discard_upload(staged)
+    else:
+        await publish_upload(staged, file_path)
+    return file_path
@@ -0,0 +1,107 @@
+"""
+A module contains middleware limiting the size of request bodies.
+
+Multipart forms are parsed, and uploaded files spooled to disk, before
+the route handler runs, so the upload size limit of the media pipeline
+alone does not limit what the server receives. This middleware rejects
+requests whose declared Content-Length is too large before any of the
+body is read, and stops reading bodies without a declared length once
+they exceed the limit. Deployments behind nginx should also set
+client_max_body_size, so oversized bodies never reach the application.
+
+Attributes:
+    MULTIPART_OVERHEAD: Bytes allowed above the upload size limit for
+     the multipart boundaries and part headers.
+"""
+
+
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+MULTIPART_OVERHEAD = 65536
+TOO_LARGE_DETAIL = 'Request body is too large'
+
+
+class LimitedReceive:
+    """
+    Wrapper of receive that stops a body exceeding the limit.
+
+    Attributes:
+        max_body_size: Maximum number of body bytes.
+        received: Number of body bytes received.
+    """
+
+    def __init__(self, receive: Receive, max_body_size: int):
+        """
+        Initialize the wrapper.
+
+        Args:
+            receive: ASGI receive callable of the server.
+            max_body_size: Maximum number of body bytes.
+        """
+        self.max_body_size = max_body_size
+        self.received = 0
+        self._receive = receive
+
+    async def __call__(self) -> Message:
+        """
+        Receive a message, counting the body bytes.
+
+        Returns:
+            ASGI message.
+
+        Raises:
+            HTTPException: If the body exceeds the limit.
+        """
+        message = await self._receive()
+        if message['type'] == 'http.request':
+            self.received += len(message.get('body', b''))
+            if self.received > self.max_body_size:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=TOO_LARGE_DETAIL,
+                )
+        return message
+
+
+class BodyLimitMiddleware:
+    """Middleware rejecting request bodies above a size limit."""
+
+    def __init__(self, app: ASGIApp, max_body_size: int):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: Wrapped ASGI application.
+            max_body_size: Maximum number of body bytes.
+        """
+        self.app = app
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """
+        Process a request, rejecting it early if its body is too large.
+
+        Args:
+            scope: ASGI scope of the request.
+            receive: ASGI receive callable.
+            send: ASGI send callable.
+        """
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        content_length = Headers(scope=scope).get('content-length', '')
+        if content_length.isdigit() and (
+            int(content_length) > self.max_body_size
+        ):
+            response = JSONResponse(
+                {'detail': TOO_LARGE_DETAIL},
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+            await response(scope, receive, send)
+            return
+        await self.app(
+            scope, LimitedReceive(receive, self.max_body_size), send,
+        )
@@ -0,0 +1,176 @@
+"""A module contains in-process caches."""
+
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Bounded mapping with least recently used eviction and expiring entries.
+
+    The cache is local to the worker process and is not shared between
+    workers, so entries of other workers become consistent after the TTL.
+
+    Attributes:
+        maxsize: Maximum number of entries.
+        ttl: Lifetime of an entry in seconds.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Initialize an empty cache.
+
+        Args:
+            maxsize: Maximum number of entries.
+            ttl: Lifetime of an entry in seconds.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, Tuple[float, Any]] = (
+            OrderedDict()
+        )
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a cached value and mark it as recently used.
+
+        Args:
+            key: Key of the entry.
+
+        Returns:
+            Cached value, or None if it is missing or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, cached_value = entry
+        if expires_at < time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return cached_value
+
+    def set(self, key: Hashable, cached_value: Any) -> None:
+        """
+        Store a value, evicting the least recently used entries if full.
+
+        Args:
+            key: Key of the entry.
+            cached_value: Value to store.
+        """
+        self._entries[key] = (time.monotonic() + self.ttl, cached_value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Remove an entry if it exists.
+
+        Args:
+            key: Key of the entry.
+        """
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        """
+        Get the number of stored entries, including expired ones.
+
+        Returns:
+            Number of entries.
+        """
+        return len(self._entries)
+
+
+class ByteBudgetCache:
+    """
+    Bounded mapping of byte strings with least recently used eviction.
+
+    The cache is bounded by the total size of the stored values rather
+    than by the number of entries, and values larger than the entry
+    limit are never stored.
+
+    Attributes:
+        max_bytes: Maximum total size of the stored values.
+        max_entry_bytes: Maximum size of a single stored value.
+        nbytes: Current total size of the stored values.
+    """
+
+    def __init__(self, max_bytes: int, max_entry_bytes: int):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_bytes: Maximum total size of the stored values.
+            max_entry_bytes: Maximum size of a single stored value.
+        """
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.nbytes = 0
+        self._entries: OrderedDict[Hashable, Tuple[bytes, Any]] = (
+            OrderedDict()
+        )
+
+    def get(self, key: Hashable) -> Optional[Tuple[bytes, Any]]:
+        """
+        Get a cached value and mark it as recently used.
+
+        Args:
+            key: Key of the entry.
+
+        Returns:
+            Cached bytes with their metadata, or None if missing.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: Hashable, body: bytes, metadata: Any = None) -> None:
+        """
+        Store a value, evicting the least recently used entries if full.
+
+        Args:
+            key: Key of the entry.
+            body: Bytes to store.
+            metadata: Value stored along with the bytes.
+        """
+        if len(body) > self.max_entry_bytes:
+            return
+        self.invalidate(key)
+        self._entries[key] = (body, metadata)
+        self.nbytes += len(body)
+        while self.nbytes > self.max_bytes:
+            _, (evicted, _) = self._entries.popitem(last=False)
+            self.nbytes -= len(evicted)
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Remove an entry if it exists.
+
+        Args:
+            key: Key of the entry.
+        """
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.nbytes -= len(entry[0])
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+        self.nbytes = 0
+
+    def __len__(self) -> int:
+        """
+        Get the number of stored entries.
+
+        Returns:
+            Number of entries.
+        """
+        return len(self._entries)
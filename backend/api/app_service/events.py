@@ -0,0 +1,318 @@
+"""
+A module contains the fan-out of real-time events to connected clients.
+
+Writes publish events with NOTIFY in their transaction, so an event is
+sent only if the change is committed. A notification carries the event
+type, the IDs it is routed by and the data sent to the clients. Every
+worker process keeps one LISTEN connection and hands the events to its
+subscribers through bounded in-memory queues. A subscriber that falls
+behind by a whole queue is disconnected and reconnects, rather than
+holding events of everybody else in memory.
+
+Event routing:
+    tweet: Sent to the author and the followers of the author.
+    like: Sent to the author of the liked tweet.
+    follow: Sent to the followed user.
+    unfollow: Not sent, only updates the routing of tweets.
+
+Attributes:
+    HEARTBEAT: Comment sent to idle streams to keep them open.
+    RECIPIENT_FIELDS: Field with the ID of the user receiving an event
+     by event type.
+    LISTENER_ERRORS: Errors of a lost or broken LISTEN connection.
+    event_hub (EventHub): Event hub of the worker process.
+    logger (Logger): A logger with an error level required to
+     display current information about the operation of functions.
+"""
+
+
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from types import MappingProxyType
+from typing import AsyncIterator, Dict, Iterable, Optional, Set
+
+import asyncpg
+from sqlalchemy.engine import URL
+
+from backend.api.core.config import config
+from backend.api.db.crud.event import EVENTS_CHANNEL
+
+HEARTBEAT = b': heartbeat\n\n'
+DISCONNECT = None
+TWEET_EVENT = 'tweet'
+FOLLOW_EVENT = 'follow'
+UNFOLLOW_EVENT = 'unfollow'
+RECIPIENT_FIELDS = MappingProxyType({
+    TWEET_EVENT: 'author_id',
+    'like': 'author_id',
+    FOLLOW_EVENT: 'followed_id',
+})
+LISTENER_ERRORS = (OSError, asyncpg.InterfaceError, asyncpg.PostgresError)
+
+logger = logging.getLogger('uvicorn.error')
+
+
+class Subscription:
+    """
+    Events stream of one connected client.
+
+    Attributes:
+        user_id: ID of the subscribed user.
+        following: IDs of the users the subscribed user follows.
+        queue: Encoded events waiting to be sent, DISCONNECT ends the stream.
+    """
+
+    def __init__(
+        self, hub: 'EventHub', user_id: int, following: Iterable[int],
+    ):
+        """
+        Initialize a subscription with an empty queue.
+
+        Args:
+            hub: Event hub delivering the events.
+            user_id: ID of the subscribed user.
+            following: IDs of the users the subscribed user follows.
+        """
+        self.user_id = user_id
+        self.following = set(following)
+        self.queue: asyncio.Queue = asyncio.Queue(config.event_queue_size)
+        self._hub = hub
+
+    def __enter__(self) -> 'Subscription':
+        """
+        Start receiving events.
+
+        Returns:
+            The subscription.
+        """
+        self._hub.add(self)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """
+        Stop receiving events.
+
+        Args:
+            exc_info: Exception raised in the block, if any.
+        """
+        self._hub.remove(self)
+
+    def close(self) -> None:
+        """End the stream after the queued events."""
+        if not self.queue.full():
+            self.queue.put_nowait(DISCONNECT)
+
+    def push(self, encoded_event: bytes) -> None:
+        """
+        Queue an event, disconnecting the subscriber if the queue is full.
+
+        Args:
+            encoded_event: Event in the Server-Sent Events format.
+        """
+        if self.queue.full():
+            return
+        if self.queue.qsize() == self.queue.maxsize - 1:
+            self.queue.put_nowait(DISCONNECT)
+            return
+        self.queue.put_nowait(encoded_event)
+
+
+class EventHub:
+    """
+    Fan-out of the notifications of the LISTEN connection.
+
+    Attributes:
+        listening: Set while the LISTEN connection receives events.
+    """
+
+    def __init__(self):
+        """Initialize a hub without subscribers and connection."""
+        self.listening = asyncio.Event()
+        self._subscribers: Dict[int, Set[Subscription]] = defaultdict(set)
+        self._followers: Dict[int, Set[Subscription]] = defaultdict(set)
+        self._listener: Optional[asyncio.Task] = None
+
+    def start(self, database_url: URL) -> None:
+        """
+        Start listening to the events channel of the database.
+
+        Args:
+            database_url: SQLAlchemy URL of the primary database.
+        """
+        dsn = database_url.set(drivername='postgresql').render_as_string(
+            hide_password=False,
+        )
+        self._listener = asyncio.create_task(self._listen(dsn))
+
+    async def stop(self) -> None:
+        """Stop listening and disconnect every subscriber."""
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        for subscriptions in self._subscribers.values():
+            for subscription in subscriptions:
+                subscription.close()
+
+    def subscribe(
+        self, user_id: int, following: Iterable[int],
+    ) -> Subscription:
+        """
+        Create a subscription, active inside its with block.
+
+        Args:
+            user_id: ID of the subscribed user.
+            following: IDs of the users the subscribed user follows.
+
+        Returns:
+            The subscription.
+        """
+        return Subscription(self, user_id, following)
+
+    def add(self, subscription: Subscription) -> None:
+        """
+        Route the events of a user to a subscription.
+
+        Args:
+            subscription: New subscription.
+        """
+        self._subscribers[subscription.user_id].add(subscription)
+        for followed_id in subscription.following:
+            self._followers[followed_id].add(subscription)
+
+    def remove(self, subscription: Subscription) -> None:
+        """
+        Stop routing events to a subscription.
+
+        Args:
+            subscription: Finished subscription.
+        """
+        _discard(self._subscribers, subscription.user_id, subscription)
+        for followed_id in subscription.following:
+            _discard(self._followers, followed_id, subscription)
+
+    def deliver(self, payload: str) -> None:
+        """
+        Hand a notification to the subscribers it is routed to.
+
+        Args:
+            payload: Notification with the event type and data.
+        """
+        event = json.loads(payload)
+        event_type = event['type']
+        if event_type in {FOLLOW_EVENT, UNFOLLOW_EVENT}:
+            self._update_following(
+                event_type, event['follower_id'], event['followed_id'],
+            )
+        recipient_field = RECIPIENT_FIELDS.get(event_type)
+        if recipient_field is None:
+            return
+        encoded_event = 'event: {0}\ndata: {1}\n\n'.format(
+            event_type, json.dumps(event['data']),
+        ).encode()
+        for subscription in self._recipients(event, recipient_field):
+            subscription.push(encoded_event)
+
+    def _recipients(
+        self, event: dict, recipient_field: str,
+    ) -> Set[Subscription]:
+        recipient_id = event[recipient_field]
+        recipients = set(self._subscribers.get(recipient_id, ()))
+        if event['type'] == TWEET_EVENT:
+            recipients.update(self._followers.get(recipient_id, ()))
+        return recipients
+
+    def _update_following(
+        self, event_type: str, follower_id: int, followed_id: int,
+    ) -> None:
+        for subscription in self._subscribers.get(follower_id, ()):
+            if event_type == FOLLOW_EVENT:
+                subscription.following.add(followed_id)
+                self._followers[followed_id].add(subscription)
+            else:
+                subscription.following.discard(followed_id)
+                _discard(self._followers, followed_id, subscription)
+
+    async def _listen(self, dsn: str) -> None:
+        while True:
+            try:
+                connection = await asyncpg.connect(dsn)
+            except LISTENER_ERRORS as error:
+                logger.warning('Events listener cannot connect: {0}'.format(
+                    error,
+                ))
+                await asyncio.sleep(config.event_reconnect_delay)
+                continue
+            try:
+                await self._serve(connection)
+            except LISTENER_ERRORS as error:
+                logger.warning('Events listener failed: {0}'.format(error))
+            finally:
+                self.listening.clear()
+                await connection.close()
+            await asyncio.sleep(config.event_reconnect_delay)
+
+    async def _serve(self, connection: asyncpg.Connection) -> None:
+        terminated = asyncio.Event()
+        connection.add_termination_listener(
+            lambda _connection: terminated.set(),
+        )
+        await connection.add_listener(EVENTS_CHANNEL, self._on_notification)
+        self.listening.set()
+        await terminated.wait()
+        logger.warning('Events listener connection lost, reconnecting')
+
+    def _on_notification(self, connection, pid, channel, payload) -> None:
+        try:
+            self.deliver(payload)
+        except (ValueError, KeyError, TypeError):
+            logger.exception('Malformed event: {0}'.format(payload))
+
+
+async def event_stream(
+    hub: EventHub, user_id: int, following: Iterable[int],
+) -> AsyncIterator[bytes]:
+    """
+    Stream the events of a user in the Server-Sent Events format.
+
+    Idle streams get a heartbeat comment so that proxies keep them open.
+
+    Args:
+        hub: Event hub delivering the events.
+        user_id: ID of the subscribed user.
+        following: IDs of the users the subscribed user follows.
+
+    Yields:
+        Encoded events and heartbeats.
+    """
+    with hub.subscribe(user_id, following) as subscription:
+        yield HEARTBEAT
+        while True:
+            try:
+                encoded_event = await asyncio.wait_for(
+                    subscription.queue.get(), config.event_heartbeat,
+                )
+            except asyncio.TimeoutError:
+                yield HEARTBEAT
+                continue
+            if encoded_event is DISCONNECT:
+                return
+            yield encoded_event
+
+
+def _discard(
+    index: Dict[int, Set[Subscription]],
+    user_id: int,
+    subscription: Subscription,
+) -> None:
+    subscriptions = index.get(user_id)
+    if subscriptions is None:
+        return
+    subscriptions.discard(subscription)
+    if not subscriptions:
+        index.pop(user_id)
+
+
+event_hub = EventHub()
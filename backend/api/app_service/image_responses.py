@@ -0,0 +1,219 @@
+"""
+A module contains responses serving stored images.
+
+Content-addressed files never change, so the digest in their name is used
+as a strong entity tag and clients may cache them forever. Small files of
+this kind are also kept in memory, so repeated requests for a hot image
+touch neither the database nor the file system.
+
+If an internal nginx location is configured, the backend only resolves
+the file and nginx sends its content, as requested by the
+X-Accel-Redirect header.
+
+Attributes:
+    IMMUTABLE_CACHE_CONTROL: Cache-Control of content-addressed files.
+    ETAG_HEADER: Name of the entity tag header.
+    hot_images: In-memory cache of small content-addressed images.
+"""
+
+
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import quote
+
+from aiofiles import open as async_open
+from fastapi import Request, Response, status
+from fastapi.responses import FileResponse
+
+from backend.api.app_service.blob_store import (is_blob_name,
+                                                resolve_file_path)
+from backend.api.app_service.cache import ByteBudgetCache
+from backend.api.app_service.image_variants import nearest_width
+from backend.api.core.config import config
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+ETAG_HEADER = 'etag'
+
+hot_images = ByteBudgetCache(
+    config.hot_image_cache_size, config.hot_image_max_size,
+)
+
+
+def content_etag(file_name: str, size: Optional[int]) -> Optional[str]:
+    """
+    Get the entity tag of a content-addressed image without reading it.
+
+    Args:
+        file_name: Requested file name.
+        size: Requested image width in pixels.
+
+    Returns:
+        Strong entity tag, or None if the name does not address content.
+    """
+    if not is_blob_name(file_name):
+        return None
+    digest = Path(file_name).stem
+    if size is None:
+        return '"{0}"'.format(digest)
+    return '"{0}-{1}"'.format(digest, nearest_width(size))
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """
+    Check whether the client already has the current representation.
+
+    Args:
+        request: Current request.
+        etag: Entity tag of the current representation.
+
+    Returns:
+        True if the tag is listed in the If-None-Match header.
+    """
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is None:
+        return False
+    return etag in {
+        tag.strip().removeprefix('W/') for tag in if_none_match.split(',')
+    }
+
+
+def immutable_headers(etag: str) -> Dict[str, str]:
+    """
+    Get the caching headers of a content-addressed image.
+
+    Args:
+        etag: Entity tag of the image.
+
+    Returns:
+        Headers with the entity tag and the Cache-Control directive.
+    """
+    return {ETAG_HEADER: etag, 'cache-control': IMMUTABLE_CACHE_CONTROL}
+
+
+def cached_image_response(
+    request: Request,
+    file_name: str,
+    size: Optional[int],
+) -> Optional[Response]:
+    """
+    Answer a request for an image without reading it from disk.
+
+    Not Modified is answered only for images that are cached or stored,
+    so a client holding the tag of a removed image gets an error. Range
+    requests are left to the file response.
+
+    Args:
+        request: Current request.
+        file_name: Requested file name.
+        size: Requested image width in pixels.
+
+    Returns:
+        Not Modified response, response with cached bytes or None if
+        the image has to be read from disk.
+    """
+    etag = content_etag(file_name, size)
+    if etag is None:
+        return None
+    headers = immutable_headers(etag)
+    cached = hot_images.get(etag)
+    if is_not_modified(request, etag):
+        if cached is None and not resolve_file_path(file_name).is_file():
+            return None
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=headers,
+        )
+    if cached is None or 'range' in request.headers:
+        return None
+    body, media_type = cached
+    headers['accept-ranges'] = 'bytes'
+    return Response(body, media_type=media_type, headers=headers)
+
+
+async def image_response(
+    request: Request,
+    file_path: Path,
+    etag: Optional[str],
+) -> Response:
+    """
+    Serve an image from disk, caching it in memory if it is small.
+
+    If the media directory is served by nginx, the response only
+    redirects nginx to the file.
+
+    Args:
+        request: Current request.
+        file_path: Path of the image.
+        etag: Entity tag of a content-addressed image.
+
+    Returns:
+        File response, or Not Modified response if the client has the
+        current representation.
+    """
+    stat_result = file_path.stat()
+    headers = {} if etag is None else immutable_headers(etag)
+    response = FileResponse(
+        file_path, headers=headers, stat_result=stat_result,
+    )
+    validators = headers or {ETAG_HEADER: response.headers[ETAG_HEADER]}
+    if is_not_modified(request, validators[ETAG_HEADER]):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=validators,
+        )
+    if config.media_accel_redirect_prefix is not None:
+        return accel_redirect_response(
+            file_path, response.media_type, validators,
+        )
+    if etag is None or 'range' in request.headers:
+        return response
+    if stat_result.st_size > hot_images.max_entry_bytes:
+        return response
+    headers['accept-ranges'] = 'bytes'
+    return Response(
+        await read_hot_image(file_path, etag, response.media_type),
+        media_type=response.media_type,
+        headers=headers,
+    )
+
+
+async def read_hot_image(file_path: Path, etag: str, media_type: str) -> bytes:
+    """
+    Read an image and keep it in the in-memory cache.
+
+    Args:
+        file_path: Path of the image.
+        etag: Entity tag of the image.
+        media_type: Media type of the image.
+
+    Returns:
+        Content of the image.
+    """
+    async with async_open(file_path, 'rb') as image:
+        body = await image.read()
+    hot_images.set(etag, body, media_type)
+    return body
+
+
+def accel_redirect_response(
+    file_path: Path,
+    media_type: str,
+    headers: Dict[str, str],
+) -> Response:
+    """
+    Let nginx send an image from its internal media location.
+
+    Args:
+        file_path: Path of the image.
+        media_type: Media type of the image.
+        headers: Caching headers of the image.
+
+    Returns:
+        Empty response with the X-Accel-Redirect header.
+    """
+    location = '{0}/{1}'.format(
+        config.media_accel_redirect_prefix.rstrip('/'),
+        quote(file_path.relative_to(config.media_root).as_posix()),
+    )
+    return Response(
+        media_type=media_type,
+        headers={**headers, 'x-accel-redirect': location},
+    )
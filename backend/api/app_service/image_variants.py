@@ -0,0 +1,181 @@
+"""
+A module contains the image variants pipeline.
+
+Resized variants of uploaded images are rendered as WebP files next to
+the stored originals, in a process pool so that decoding and resizing
+never run on the event loop. Variants of new uploads are rendered in
+the background after the upload is committed, missing variants are
+rendered on first request.
+
+Attributes:
+    logger (Logger): A logger with an error level required to
+     display current information about the operation of functions.
+    variant_pool (VariantPool): Process pool that renders the variants.
+"""
+
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional
+
+from PIL import Image, ImageOps
+
+from backend.api.core.config import config
+
+VARIANTS_DIR = '.variants'
+VARIANT_FORMAT = 'WEBP'
+VARIANT_EXTENSION = '.webp'
+VARIANT_QUALITY = 80
+
+logger = logging.getLogger('uvicorn.error')
+
+
+def render_variant(source: str, target: str, width: int) -> None:
+    """
+    Render a resized WebP copy of an image.
+
+    Runs in a worker process. The variant is written to a temporary
+    file and renamed into place, so readers never see a partial file.
+
+    Args:
+        source: Path of the original image.
+        target: Path of the variant.
+        width: Maximum width of the variant in pixels.
+    """
+    with Image.open(source) as original:
+        image = ImageOps.exif_transpose(original)
+        image.thumbnail((width, image.height))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        temporary_target = '{0}.{1}.part'.format(target, os.getpid())
+        image.save(
+            temporary_target, VARIANT_FORMAT, quality=VARIANT_QUALITY,
+        )
+    os.replace(temporary_target, target)
+
+
+def nearest_width(size: int) -> int:
+    """
+    Choose the configured variant width for a requested size.
+
+    Args:
+        size: Requested image width in pixels.
+
+    Returns:
+        The smallest configured width not below the requested size,
+        or the largest width if the size exceeds all of them.
+    """
+    widths = sorted(config.image_variant_widths)
+    return next((width for width in widths if width >= size), widths[-1])
+
+
+def variant_path(source: Path, width: int) -> Path:
+    """
+    Get the path of a variant of a stored image.
+
+    Args:
+        source: Path of the original image.
+        width: Width of the variant.
+
+    Returns:
+        Path of the variant in the variants directory.
+    """
+    relative_dir = source.parent.relative_to(config.media_root)
+    return Path(
+        config.media_root,
+        VARIANTS_DIR,
+        relative_dir,
+        '{0}_{1}{2}'.format(source.stem, width, VARIANT_EXTENSION),
+    )
+
+
+class VariantPool:
+    """
+    Renders image variants in a process pool.
+
+    Without a started pool the variants are rendered in the default
+    thread pool of the event loop.
+    """
+
+    def __init__(self):
+        """Initialize a stopped pool."""
+        self._executor: Optional[Executor] = None
+        self._in_progress: Dict[Path, asyncio.Future] = {}
+
+    def start(self) -> None:
+        """Start the worker processes."""
+        self._executor = ProcessPoolExecutor(
+            max_workers=config.image_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+        )
+
+    def stop(self) -> None:
+        """
+        Stop the worker processes.
+
+        Pending renderings are cancelled and the workers exit in the
+        background, so stopping does not block the event loop.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def get_variant(self, source: Path, size: int) -> Path:
+        """
+        Get the variant of an image nearest to a size, rendering it if needed.
+
+        Concurrent requests of a missing variant share one rendering.
+
+        Args:
+            source: Path of the original image.
+            size: Requested image width in pixels.
+
+        Returns:
+            Path of the variant.
+        """
+        target = variant_path(source, nearest_width(size))
+        if target.exists():
+            return target
+        rendering = self._in_progress.get(target)
+        if rendering is None:
+            rendering = asyncio.get_running_loop().run_in_executor(
+                self._executor,
+                render_variant,
+                str(source),
+                str(target),
+                nearest_width(size),
+            )
+            self._in_progress[target] = rendering
+            rendering.add_done_callback(
+                lambda _: self._in_progress.pop(target, None),
+            )
+        await rendering
+        return target
+
+    async def render_all(self, source: Path) -> None:
+        """
+        Render all configured variants of an image.
+
+        Failures are logged: the variant is rendered again on request.
+
+        Args:
+            source: Path of the original image.
+        """
+        renderings = await asyncio.gather(
+            *[
+                self.get_variant(source, width)
+                for width in config.image_variant_widths
+            ],
+            return_exceptions=True,
+        )
+        for rendering in renderings:
+            if isinstance(rendering, Exception):
+                logger.warning('Failed to render variant of {0}: {1}'.format(
+                    source, rendering,
+                ))
+
+
+variant_pool = VariantPool()
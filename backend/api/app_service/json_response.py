@@ -0,0 +1,23 @@
+"""A module contains the JSON response class used by the application."""
+
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        """
+        Encode the response content.
+
+        Args:
+            content: JSON-compatible response content.
+
+        Returns:
+            Encoded response body.
+        """
+        return orjson.dumps(content)
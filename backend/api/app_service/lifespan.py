@@ -0,0 +1,46 @@
+"""
+A module contains the startup and shutdown hooks of the application.
+
+This module contains these coroutines:
+    startup: Required to start the database session manager,
+     the request log listener, the image variants pool and
+     the events listener.
+    shutdown: Required to shut down the database session manager,
+     the request log listener, the image variants pool and
+     the events listener.
+
+Attributes:
+    logger (Logger): A logger with an error level required to
+     display current information about the operation of functions.
+"""
+
+
+import logging
+
+from backend.api.app_service.events import event_hub
+from backend.api.app_service.image_variants import variant_pool
+from backend.api.app_service.middleware import log_listener
+from backend.api.core.base import sessionmanager
+
+logger = logging.getLogger('uvicorn.error')
+
+
+async def startup() -> None:
+    """Start the session manager, log, variants and events listeners."""
+    log_listener.start()
+    variant_pool.start()
+    logger.info('Starting sessionmanager...')
+    await sessionmanager.startup()
+    logger.info('Sessionmanager started')
+    event_hub.start(sessionmanager.engine.url)
+
+
+async def shutdown():
+    """Close sessionmanager if needed, stop the listeners and variants pool."""
+    await event_hub.stop()
+    if sessionmanager.engine is not None:
+        logger.info('Closing sessionmanager...')
+        await sessionmanager.close()
+        logger.info('Sessionmanager closed')
+    variant_pool.stop()
+    log_listener.stop()
@@ -0,0 +1,194 @@
+"""
+A module contains the media upload pipeline.
+
+Uploads are streamed in bounded chunks into a staging file inside the
+media directory. The first chunk is checked against known image
+signatures, the size is limited while reading and the SHA-256 of the
+content is computed on the way. The staged file is renamed into place
+only after the database row is committed.
+
+The multipart parser spools the whole upload before the route handler
+runs, so the size check here only limits what is stored. What the
+server receives is limited by BodyLimitMiddleware and the proxy.
+"""
+
+
+import hashlib
+import time
+from contextlib import suppress
+from pathlib import Path
+from types import MappingProxyType
+from typing import NamedTuple, Optional
+from uuid import uuid4
+
+from aiofiles import open as async_open
+from aiofiles import os as async_os
+from fastapi import HTTPException, UploadFile, status
+
+from backend.api.app_service.telemetry import (media_upload_duration,
+                                               media_upload_size)
+from backend.api.core.config import config
+
+STAGING_DIR = '.incoming'
+WEBP_SIGNATURE_OFFSET = 8
+
+MEDIA_SIGNATURES = (
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+)
+MEDIA_EXTENSIONS = MappingProxyType({
+    'image/png': '.png',
+    'image/jpeg': '.jpg',
+    'image/gif': '.gif',
+    'image/webp': '.webp',
+})
+
+
+class StagedUpload(NamedTuple):
+    """
+    Uploaded file written to the staging directory.
+
+    Attributes:
+        path: Path of the staging file.
+        sha256: Hex digest of the content.
+        size: Size of the content in bytes.
+        content_type: Media type detected from the content.
+    """
+
+    path: Path
+    sha256: str
+    size: int
+    content_type: str
+
+
+def sniff_content_type(head: bytes) -> Optional[str]:
+    """
+    Detect the image type from the first bytes of a file.
+
+    Args:
+        head: Beginning of the file.
+
+    Returns:
+        Media type of the image, or None if it is not supported.
+    """
+    for signature, content_type in MEDIA_SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    if head.startswith(b'RIFF') and head[
+        WEBP_SIGNATURE_OFFSET:WEBP_SIGNATURE_OFFSET + 4
+    ] == b'WEBP':
+        return 'image/webp'
+    return None
+
+
+class UploadTracker:
+    """
+    Checks and digests an upload while it is streamed.
+
+    Attributes:
+        digest: SHA-256 hash object of the content.
+        size: Number of bytes received.
+        content_type: Media type detected from the first chunk.
+    """
+
+    def __init__(self):
+        """Initialize the tracker for an empty upload."""
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.content_type: Optional[str] = None
+
+    def update(self, chunk: bytes) -> None:
+        """
+        Account for the next chunk of the upload.
+
+        Args:
+            chunk: Received bytes.
+
+        Raises:
+            HTTPException: If the file is not a supported image
+             or exceeds the size limit.
+        """
+        if self.content_type is None:
+            self.content_type = sniff_content_type(chunk)
+            if self.content_type is None:
+                raise HTTPException(
+                    status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                    detail='Unsupported file type',
+                )
+        self.size += len(chunk)
+        if self.size > config.max_upload_size:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail='File is too large',
+            )
+        self.digest.update(chunk)
+
+
+async def stage_upload(file: UploadFile) -> StagedUpload:
+    """
+    Stream an uploaded file into the staging directory.
+
+    Args:
+        file: Uploaded file.
+
+    Returns:
+        Staged file with its digest, size and media type.
+
+    Raises:
+        Exception: If the file is not a supported image or exceeds
+         the size limit, or if it could not be written.
+    """
+    start_time = time.perf_counter()
+    staging_path = Path(config.media_root, STAGING_DIR, uuid4().hex)
+    await async_os.makedirs(staging_path.parent, exist_ok=True)
+    tracker = UploadTracker()
+    try:
+        await _write_upload(file, staging_path, tracker)
+    except Exception:
+        with suppress(FileNotFoundError):
+            await async_os.remove(staging_path)
+        raise
+    media_upload_duration.observe(time.perf_counter() - start_time)
+    media_upload_size.observe(tracker.size)
+    return StagedUpload(
+        staging_path,
+        tracker.digest.hexdigest(),
+        tracker.size,
+        tracker.content_type,
+    )
+
+
+async def publish_upload(staged: StagedUpload, file_path: Path) -> None:
+    """
+    Atomically move a staged file to its final path.
+
+    Args:
+        staged: Staged file.
+        file_path: Final path of the file.
+    """
+    await async_os.makedirs(file_path.parent, exist_ok=True)
+    await async_os.replace(staged.path, file_path)
+
+
+async def discard_upload(staged: StagedUpload) -> None:
+    """
+    Remove a staged file that will not be published.
+
+    Args:
+        staged: Staged file.
+    """
+    with suppress(FileNotFoundError):
+        await async_os.remove(staged.path)
+
+
+async def _write_upload(
+    file: UploadFile, staging_path: Path, tracker: UploadTracker,
+) -> None:
+    async with async_open(staging_path, mode='wb') as staging_file:
+        while chunk := await file.read(config.upload_chunk_size):
+            tracker.update(chunk)
+            await staging_file.write(chunk)
+    if tracker.content_type is None:
+        tracker.update(b'')
@@ -1,53 +1,233 @@
 """
 A module contains middleware for requests logging.
 
+Records are put on a queue by the middleware and written by a
+background listener thread, so formatting and output of the log never
+block the event loop. The queue is bounded: if the listener falls behind
+or was never started, new records are dropped and counted instead of
+piling up in memory. Only every n-th request is logged, together with
+every request that ended with a server error, and bodies are logged
+only if enabled and truncated to a configured size.
+
 Attributes:
     logger (Logger): A logger with an error level required to
      display current information about the operation of functions.
+    request_logger (Logger): A logger that puts request records
+     on the log queue.
+    log_listener (DrainingQueueListener): A listener that writes queued records
+     with the handlers of the logger.
 """
 
 
 import logging
 import time
+from itertools import count
+from logging.handlers import QueueHandler, QueueListener
+from queue import Full, Queue
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from fastapi import Request, Response
-from starlette.concurrency import iterate_in_threadpool
-from starlette.middleware.base import BaseHTTPMiddleware
+from backend.api.app_service.telemetry import log_records_dropped
+from backend.api.core.config import config
+
+SERVER_ERROR_STATUS = 500
+HIDDEN_HEADERS = frozenset(('api-key', 'authorization', 'cookie'))
 
 logger = logging.getLogger('uvicorn.error')
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware required for logging requests data."""
+class ForwardingHandler(logging.Handler):
+    """Handler that passes records to the handlers of another logger."""
+
+    def __init__(self, target: logging.Logger):
+        """
+        Initialize the handler.
+
+        Args:
+            target: Logger whose handlers write the records.
+        """
+        super().__init__()
+        self.target = target
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        Pass a record to the target logger.
+
+        Args:
+            record: Log record.
+        """
+        self.target.handle(record)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Queue handler that drops records when the queue is full."""
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """
+        Put a record on the queue without waiting for free space.
+
+        Args:
+            record: Prepared log record.
+        """
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            log_records_dropped.inc()
+
+
+class DrainingQueueListener(QueueListener):
+    """Queue listener that waits for free space to stop."""
+
+    def enqueue_sentinel(self) -> None:
+        """
+        Put the stop sentinel on the queue, waiting for free space.
+
+        The listener thread keeps emptying the queue, so the sentinel
+        gets in after the records queued before it even if it is full.
+        """
+        self.queue.put(self._sentinel)
+
+
+_log_queue: Queue = Queue(config.log_queue_size)
+request_logger = logging.getLogger('backend.api.requests')
+request_logger.addHandler(DroppingQueueHandler(_log_queue))
+request_logger.setLevel(logging.INFO)
+request_logger.propagate = False
+log_listener = DrainingQueueListener(_log_queue, ForwardingHandler(logger))
 
-    @classmethod
-    async def dispatch(cls, request: Request, call_next) -> Response:
+
+class LoggedExchange:
+    """
+    Wrapper of receive and send that records one request.
+
+    Attributes:
+        scope: ASGI scope of the request.
+        log_payloads: Whether headers and bodies are recorded.
+        status_code: Response status code.
+        response_size: Number of sent body bytes.
+    """
+
+    def __init__(
+        self, scope: Scope, receive: Receive, send: Send, log_payloads: bool,
+    ):
         """
-        Show info about current request.
+        Initialize the wrapper.
 
         Args:
-            request: Current client request.
-            call_next: Function that routes the request.
+            scope: ASGI scope of the request.
+            receive: ASGI receive callable of the server.
+            send: ASGI send callable of the server.
+            log_payloads: Whether headers and bodies are recorded.
+        """
+        self.scope = scope
+        self.log_payloads = log_payloads
+        self.status_code = SERVER_ERROR_STATUS
+        self.response_size = 0
+        self._receive = receive
+        self._send = send
+        self._request_body = bytearray()
+        self._response_body = bytearray()
+
+    async def receive(self) -> Message:
+        """
+        Receive a message, keeping the beginning of the request body.
 
         Returns:
-            Response of the request.
+            ASGI message.
+        """
+        message = await self._receive()
+        if self.log_payloads and message['type'] == 'http.request':
+            self._keep(self._request_body, message.get('body', b''))
+        return message
+
+    async def send(self, message: Message) -> None:
+        """
+        Send a message, keeping the status and the beginning of the body.
+
+        Args:
+            message: ASGI message.
+        """
+        message_type = message['type']
+        if message_type == 'http.response.start':
+            self.status_code = message['status']
+        elif message_type == 'http.response.body':
+            response_chunk = message.get('body', b'')
+            self.response_size += len(response_chunk)
+            if self.log_payloads:
+                self._keep(self._response_body, response_chunk)
+        await self._send(message)
+
+    def log(self, process_time: float) -> None:
+        """
+        Put the request record on the log queue.
+
+        Args:
+            process_time: Seconds spent processing the request.
+        """
+        request_logger.info(
+            '{0} {1} Status: {2} Size: {3} Process time: {4:.6f}'.format(
+                self.scope['method'],
+                self.scope['path'],
+                self.status_code,
+                self.response_size,
+                process_time,
+            ),
+        )
+        if self.log_payloads:
+            headers = {
+                name: '***' if name in HIDDEN_HEADERS else header_value
+                for name, header_value in Headers(scope=self.scope).items()
+            }
+            request_logger.info('Headers: {0}'.format(headers))
+            request_logger.info('Body: {0!r}'.format(
+                bytes(self._request_body),
+            ))
+            request_logger.info('Response: {0!r}'.format(
+                bytes(self._response_body),
+            ))
+
+    def _keep(self, kept: bytearray, chunk: bytes) -> None:
+        free_space = config.log_body_limit - len(kept)
+        if free_space > 0:
+            kept.extend(chunk[:free_space])
+
 
+class LoggingMiddleware:
+    """Middleware required for logging requests data."""
+
+    def __init__(self, app: ASGIApp):
         """
-        logger.info('Headers: {0}'.format(request.headers))
-        request_body = await request.body()
-        logger.info('Body: {0}'.format(request_body))
-        start_time = time.time()
-        response = await call_next(request)
-        process_time = time.time() - start_time
-        response_body = [chunk async for chunk in response.body_iterator]
-        logger.info('Process time: {0}'.format(process_time))
+        Initialize the middleware.
+
+        Args:
+            app: Wrapped ASGI application.
+        """
+        self.app = app
+        self._requests = count()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """
+        Process a request, streaming the response through unchanged.
+
+        Args:
+            scope: ASGI scope of the request.
+            receive: ASGI receive callable.
+            send: ASGI send callable.
+        """
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        sampled = next(self._requests) % config.log_sample_every == 0
+        exchange = LoggedExchange(
+            scope, receive, send, sampled and config.log_payloads,
+        )
+        start_time = time.perf_counter()
         try:
-            logger.info('Response: {0}'.format(response_body[0].decode()))
-        except UnicodeDecodeError:
-            logger.info(
-                'Failed to decode in utf-8. Hex response: {0}'.format(
-                    response_body[0],
-                ),
-            )
-        response.body_iterator = iterate_in_threadpool(iter(response_body))
-        return response
+            await self.app(scope, exchange.receive, exchange.send)
+        except Exception:
+            exchange.log(time.perf_counter() - start_time)
+            raise
+        if sampled or exchange.status_code >= SERVER_ERROR_STATUS:
+            exchange.log(time.perf_counter() - start_time)
@@ -47,13 +47,15 @@ class UserSchema(AlternativeUserSchema):
     Detailed version of the schema for displaying information about the user.
 
     Attributes:
-        followers: List of user's subscribers.
-        following: List of users the user is subscribed to.
+        followers_count: Number of user's subscribers.
+        following_count: Number of users the user is subscribed to.
+        followed_by_me: Whether the current user is subscribed to the user.
 
     """
 
-    followers: List[AlternativeUserSchema] = []
-    following: List[AlternativeUserSchema] = []
+    followers_count: int = 0
+    following_count: int = 0
+    followed_by_me: bool = False
 
 
 class TweetSchema(BaseModelWithConfig):
@@ -65,7 +67,8 @@ class TweetSchema(BaseModelWithConfig):
         content: Text content of the tweet.
         attachments: List of links to the tweet's attachments.
         author: The author of the tweet.
-        likes: List of users who liked a tweet.
+        like_count: Number of users who liked a tweet.
+        liked_by_me: Whether the current user liked a tweet.
 
     """
 
@@ -73,7 +76,8 @@ class TweetSchema(BaseModelWithConfig):
     content: str
     attachments: List[str] = []
     author: AlternativeUserSchema
-    likes: List[BasicUserSchema] = []
+    like_count: int = 0
+    liked_by_me: bool = False
 
 
 class InputTweet(BaseModelWithConfig):
@@ -88,3 +92,17 @@ class InputTweet(BaseModelWithConfig):
 
     tweet_data: str
     tweet_media_ids: Optional[List[int]]
+
+
+class TrendSchema(BaseModelWithConfig):
+    """
+    Schema for displaying a trending tag.
+
+    Attributes:
+        name: Hashtag or mention with its sign.
+        tweets_count: Number of tweets with the tag in the trends window.
+
+    """
+
+    name: str
+    tweets_count: int
@@ -0,0 +1,89 @@
+"""
+A module contains schemas for paginated responses.
+
+Pages are selected with one extra row, so that the presence of the next
+page is known without another query, and carry the cursor of the next
+page, None on the last one.
+"""
+
+
+from typing import List, Optional, Sequence, Tuple, TypeVar
+
+from backend.api.app_service.schemas.models import (AlternativeUserSchema,
+                                                    BasicUserSchema,
+                                                    TweetSchema)
+from backend.api.app_service.schemas.responses import Response
+
+PageItem = TypeVar('PageItem')
+
+
+class TweetsResponse(Response):
+    """
+    Schema for a response that returns a list of tweets.
+
+    Attributes:
+        tweets: List of tweet objects.
+        next_cursor: Value of before_id for the next page,
+         or None if this page is the last one.
+    """
+
+    tweets: List[TweetSchema] = []
+    next_cursor: Optional[int] = None
+
+
+class LikesResponse(Response):
+    """
+    Schema for a response that returns a page of users who liked a tweet.
+
+    Attributes:
+        likes: List of users who liked a tweet.
+        next_cursor: Value of before_id for the next page,
+         or None if this page is the last one.
+    """
+
+    likes: List[BasicUserSchema] = []
+    next_cursor: Optional[int] = None
+
+
+class SearchResponse(Response):
+    """
+    Schema for a response that returns a page of found tweets.
+
+    Attributes:
+        tweets: List of tweet objects, best match first.
+        next_cursor: Value of cursor for the next page,
+         or None if this page is the last one.
+    """
+
+    tweets: List[TweetSchema] = []
+    next_cursor: Optional[str] = None
+
+
+class FollowsResponse(Response):
+    """
+    Schema for a response that returns a page of followers or followed users.
+
+    Attributes:
+        users: List of users.
+        next_cursor: Value of before_id for the next page,
+         or None if this page is the last one.
+    """
+
+    users: List[AlternativeUserSchema] = []
+    next_cursor: Optional[int] = None
+
+
+def split_page(
+    rows: Sequence[PageItem], limit: int,
+) -> Tuple[Sequence[PageItem], bool]:
+    """
+    Cut a page fetched with one extra row.
+
+    Args:
+        rows: Selected rows.
+        limit: Requested page size.
+
+    Returns:
+        Rows of the page and whether a next page exists.
+    """
+    return rows[:limit], len(rows) > limit
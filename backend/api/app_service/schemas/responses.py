@@ -1,10 +1,10 @@
 """A module contains schemas for responses validation."""
 
 
-from typing import List
+from typing import Dict, List
 
 from backend.api.app_service.schemas.models import (BaseModelWithConfig,
-                                                    TweetSchema, UserSchema)
+                                                    TrendSchema, UserSchema)
 
 
 class Response(BaseModelWithConfig):
@@ -45,15 +45,15 @@ class ErrorResponse(Response):
     error_message: str
 
 
-class TweetsResponse(Response):
+class TrendsResponse(Response):
     """
-    Schema for a response that returns a list of tweets.
+    Schema for a response that returns the trending tags.
 
     Attributes:
-        tweets: List of tweet objects.
+        trends: List of tags, most used first.
     """
 
-    tweets: List[TweetSchema] = []
+    trends: List[TrendSchema] = []
 
 
 class AddMediaResponse(Response):
@@ -76,3 +76,14 @@ class AddTweetResponse(Response):
     """
 
     tweet_id: int
+
+
+class PoolStatsResponse(Response):
+    """
+    Schema for a response that returns connection pool statistics.
+
+    Attributes:
+        pool: Pool size and usage counters, empty if pooling is disabled.
+    """
+
+    pool: Dict[str, float] = {}
@@ -0,0 +1,74 @@
+"""
+A module contains functions that format database rows for responses.
+
+Read routes select only the columns they return and build response
+dictionaries directly from the rows. The dictionaries already have the
+shape of the response schemas, so they are encoded without being
+validated again.
+"""
+
+from sqlalchemy import Row
+
+
+def user_brief(row: Row) -> dict:
+    """
+    Format a row with user ID and name.
+
+    Args:
+        row: Row with id and name columns.
+
+    Returns:
+        User brief info in the AlternativeUserSchema format.
+    """
+    return {'id': row.id, 'name': row.name}
+
+
+def liker_brief(row: Row) -> dict:
+    """
+    Format a row with ID and name of a user who liked a tweet.
+
+    Args:
+        row: Row with id and name columns.
+
+    Returns:
+        User brief info in the BasicUserSchema format.
+    """
+    return {'user_id': row.id, 'name': row.name}
+
+
+def tweet_to_dict(row: Row) -> dict:
+    """
+    Format a feed row.
+
+    Args:
+        row: Row selected by select_timeline_page.
+
+    Returns:
+        Tweet info in the TweetSchema format.
+    """
+    return {
+        'id': row.id,
+        'content': row.content,
+        'attachments': row.attachments or [],
+        'author': {'id': row.author_id, 'name': row.author_name},
+        'like_count': row.like_count,
+        'liked_by_me': row.liked_by_me,
+    }
+
+
+def user_to_dict(user: Row) -> dict:
+    """
+    Format a user profile.
+
+    Args:
+        user: Row selected by select_user_profile.
+
+    Returns:
+        User detail info in the UserSchema format.
+    """
+    return {
+        **user_brief(user),
+        'followers_count': user.followers_count,
+        'following_count': user.following_count,
+        'followed_by_me': user.followed_by_me,
+    }
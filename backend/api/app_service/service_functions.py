@@ -2,43 +2,54 @@
 A module containing functions for the application to operate.
 
 This module contains these coroutines:
-    startup: Required to start the database session manager.
-    shutdown: Required to shut down the database session manager.
     get_api_key: Required to get api-key header of a request.
+    get_current_user: Required to resolve the api-key to a user.
+    get_write_session: Required to get a primary database session
+     for the writes of the current user.
+    get_read_session: Required to get a replica database session
+     for the reads of the current user.
 And these Functions:
     generate_random_string: Required to generate random username
      for authorization.
 
 Attributes:
-    logger (Logger): A logger with an error level required to
-     display current information about the operation of functions.
+    user_cache (TTLCache): Cache of users by their API key.
+    recent_writers (TTLCache): IDs of the users who wrote within
+     the read-your-writes window.
 """
 
 
-import logging
 from secrets import choice
 from string import ascii_lowercase
+from typing import AsyncGenerator, NamedTuple
 
-from fastapi import HTTPException, Request, status
+from fastapi import Depends, HTTPException, Request, status
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.api.core.base import sessionmanager
+from backend.api.app_service.cache import TTLCache
+from backend.api.core.base import get_session, sessionmanager
+from backend.api.core.config import config
+from backend.api.db.crud.user import get_or_create_user
+from backend.api.db.models import User
 
-logger = logging.getLogger('uvicorn.error')
+user_cache = TTLCache(config.user_cache_size, config.user_cache_ttl)
+recent_writers = TTLCache(
+    config.user_cache_size, config.read_your_writes_window,
+)
 
 
-async def startup() -> None:
-    """Start the session manager."""
-    logger.info('Starting sessionmanager...')
-    await sessionmanager.startup()
-    logger.info('Sessionmanager started')
+class CurrentUser(NamedTuple):
+    """
+    Lightweight identity of the user making the request.
 
+    Attributes:
+        id: User ID.
+        name: Username.
+    """
 
-async def shutdown():
-    """Close sessionmanager if needed."""
-    if sessionmanager.engine is not None:
-        logger.info('Closing sessionmanager...')
-        await sessionmanager.close()
-        logger.info('Sessionmanager closed')
+    id: int
+    name: str
 
 
 async def get_api_key(request: Request) -> str:
@@ -64,6 +75,97 @@ async def get_api_key(request: Request) -> str:
     return api_key
 
 
+async def get_current_user(
+    api_key: str = Depends(get_api_key),
+    session: AsyncSession = Depends(get_session),
+) -> CurrentUser:
+    """
+    Resolve the authorization key to a user, registering unknown keys.
+
+    Known keys are served from the in-process cache without touching
+    the database. A user resolved from the database, possibly just
+    registered, reads from the primary for the read-your-writes window.
+
+    Args:
+        api_key: API key of the current user.
+        session: Current database session.
+
+    Returns:
+        Identity of the current user.
+    """
+    curr_user = user_cache.get(api_key)
+    if curr_user is not None:
+        return curr_user
+
+    async with session.begin():
+        user = await get_or_create_user(
+            session, api_key, generate_random_string(),
+        )
+    curr_user = CurrentUser(user.id, user.name)
+
+    user_cache.set(api_key, curr_user)
+    recent_writers.set(curr_user.id, True)
+    return curr_user
+
+
+async def get_write_session(
+    curr_user: CurrentUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get a primary database session for the writes of the current user.
+
+    The reads of the user go to the primary database from the start of
+    the write until the read-your-writes window after its end passes,
+    so the user sees the changes before the replicas catch up.
+
+    Args:
+        curr_user: Current user.
+        session: Current database session.
+
+    Yields:
+        An active database session of the primary database.
+    """
+    recent_writers.set(curr_user.id, True)
+    yield session
+    recent_writers.set(curr_user.id, True)
+
+
+async def get_read_session(
+    curr_user: CurrentUser = Depends(get_current_user),
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get a replica database session for the reads of the current user.
+
+    Users who wrote within the read-your-writes window read from the
+    primary database.
+
+    Args:
+        curr_user: Current user.
+
+    Yields:
+        An active database session of a replica or the primary database.
+    """
+    pinned = recent_writers.get(curr_user.id) is not None
+    async with sessionmanager.read_session(primary=pinned) as session:
+        yield session
+
+
+@event.listens_for(User, 'after_insert')
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def invalidate_cached_user(mapper, connection, target: User) -> None:
+    """
+    Drop the cached identity of a created, changed or deleted user.
+
+    Args:
+        mapper: Mapper of the User model.
+        connection: Connection used for the flush.
+        target: Changed user.
+    """
+    user_cache.invalidate(target.key)
+
+
 def generate_random_string() -> str:
     """
     Generate a random username for authorization.
@@ -0,0 +1,74 @@
+"""
+A module contains the extraction of hashtags and mentions from tweets.
+
+Attributes:
+    TAG_PATTERN: Pattern of a hashtag or a mention. The sign must not
+     follow a word character, so e-mail addresses are not mentions.
+    trend_pruning: Schedule of the removal of expired trend buckets.
+"""
+
+
+import re
+import time
+from typing import List
+
+from backend.api.db.models import MAX_TAG_LENGTH
+
+TAG_PATTERN = re.compile(r'(?<![\w#@])[#@]\w+')
+TREND_PRUNE_INTERVAL = 60
+
+
+def extract_tags(tweet_data: str) -> List[str]:
+    """
+    Find the hashtags and mentions of a tweet.
+
+    Tags are case-insensitive and keep their sign, so #python and
+    @python are different tags.
+
+    Args:
+        tweet_data: Tweet text data.
+
+    Returns:
+        Distinct lowercase tags in sorted order.
+    """
+    return sorted({
+        tag.lower()[:MAX_TAG_LENGTH]
+        for tag in TAG_PATTERN.findall(tweet_data)
+    })
+
+
+class Throttle:
+    """
+    Schedule of an action run at most once per interval.
+
+    The schedule is local to the worker process.
+
+    Attributes:
+        interval: Minimum number of seconds between two runs.
+    """
+
+    def __init__(self, interval: float):
+        """
+        Initialize a schedule with the first run due now.
+
+        Args:
+            interval: Minimum number of seconds between two runs.
+        """
+        self.interval = interval
+        self._next_run_at: float = 0
+
+    def ready(self) -> bool:
+        """
+        Check whether the action is due, scheduling the next run if it is.
+
+        Returns:
+            True if the action should run now.
+        """
+        now = time.monotonic()
+        if now < self._next_run_at:
+            return False
+        self._next_run_at = now + self.interval
+        return True
+
+
+trend_pruning = Throttle(TREND_PRUNE_INTERVAL)
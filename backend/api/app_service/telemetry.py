@@ -0,0 +1,207 @@
+"""
+A module contains the application metrics and the middleware recording them.
+
+Requests are labelled with the route template rather than the path, so
+the number of label sets is bounded by the number of routes. The SQL
+statements of every request are counted as well: the count is recorded
+in a histogram, returned in the X-Query-Count header in debug mode and
+logged if it exceeds the warning threshold, which points at N+1 queries.
+Server-Sent Events streams stay open for as long as the client is
+connected, so they are counted by their own gauge instead of the
+in-flight gauge and the duration histogram.
+
+Attributes:
+    UNMATCHED_ROUTE: Route label of requests no route matched.
+    ROUTE_LABELS: Labels identifying the endpoint of a request.
+    UPLOAD_SIZE_BUCKETS: Upper bounds of upload size buckets in bytes.
+    QUERY_COUNT_BUCKETS: Upper bounds of statements per request buckets.
+    http_requests: Counter of finished requests.
+    http_request_duration: Histogram of request processing times.
+    http_requests_in_flight: Gauge of requests being processed.
+    http_request_queries: Histogram of SQL statements per request.
+    sse_connections: Gauge of open Server-Sent Events streams.
+    media_upload_size: Histogram of staged upload sizes.
+    media_upload_duration: Histogram of upload receiving times.
+    log_records_dropped: Counter of request records dropped because
+     the log queue was full.
+    logger (Logger): A logger with an error level required to
+     display current information about the operation of functions.
+"""
+
+
+import logging
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.api.core.config import config
+from backend.api.core.db_metrics import QueryStats, request_queries
+from backend.api.core.metrics import Counter, Gauge, Histogram, registry
+
+SERVER_ERROR_STATUS = 500
+UNMATCHED_ROUTE = '<unmatched>'
+ROUTE_LABELS = ('method', 'route')
+UPLOAD_SIZE_BUCKETS = tuple(1024 * 4 ** power for power in range(9))
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+QUERY_COUNT_HEADER = b'x-query-count'
+EVENT_STREAM_TYPE = b'text/event-stream'
+
+logger = logging.getLogger('uvicorn.error')
+
+http_requests = registry.register(Counter(
+    'http_requests_total',
+    'Finished HTTP requests.',
+    ROUTE_LABELS + ('status',),
+))
+http_request_duration = registry.register(Histogram(
+    'http_request_duration_seconds',
+    'Time spent processing HTTP requests.',
+    ROUTE_LABELS,
+))
+http_requests_in_flight = registry.register(Gauge(
+    'http_requests_in_flight', 'HTTP requests being processed.',
+))
+http_request_queries = registry.register(Histogram(
+    'http_request_db_queries',
+    'SQL statements executed per HTTP request.',
+    ROUTE_LABELS,
+    buckets=QUERY_COUNT_BUCKETS,
+))
+sse_connections = registry.register(Gauge(
+    'sse_connections', 'Open Server-Sent Events streams.',
+))
+media_upload_size = registry.register(Histogram(
+    'media_upload_size_bytes',
+    'Size of staged media uploads.',
+    buckets=UPLOAD_SIZE_BUCKETS,
+))
+media_upload_duration = registry.register(Histogram(
+    'media_upload_duration_seconds',
+    'Time spent receiving and staging media uploads.',
+))
+log_records_dropped = registry.register(Counter(
+    'log_records_dropped_total',
+    'Request log records dropped because the log queue was full.',
+))
+
+
+class ResponseCapture:
+    """
+    Wrapper of send that keeps the response status.
+
+    In debug mode the number of SQL statements run before the response
+    starts is added to its headers. A request answered with an events
+    stream moves from the in-flight gauge to the streams gauge when the
+    response starts.
+
+    Attributes:
+        status_code: Response status code.
+        query_stats: Query statistics of the request.
+        streaming: Whether the response is an events stream.
+    """
+
+    def __init__(self, send: Send, query_stats: QueryStats):
+        """
+        Initialize the wrapper.
+
+        Args:
+            send: ASGI send callable of the server.
+            query_stats: Query statistics of the request.
+        """
+        self.status_code = SERVER_ERROR_STATUS
+        self.query_stats = query_stats
+        self.streaming = False
+        self._send = send
+
+    async def send(self, message: Message) -> None:
+        """
+        Send a message, keeping the status of the response.
+
+        Args:
+            message: ASGI message.
+        """
+        if message['type'] == 'http.response.start':
+            self._start(message)
+        await self._send(message)
+
+    def _start(self, message: Message) -> None:
+        self.status_code = message['status']
+        if _is_event_stream(message):
+            self.streaming = True
+            http_requests_in_flight.dec()
+            sse_connections.inc()
+        if config.debug:
+            message['headers'] = [
+                *message.get('headers', ()),
+                (QUERY_COUNT_HEADER, str(self.query_stats.count).encode()),
+            ]
+
+
+class MetricsMiddleware:
+    """Middleware counting and timing requests and their SQL statements."""
+
+    def __init__(self, app: ASGIApp):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: Wrapped ASGI application.
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """
+        Process a request, recording its route, status and duration.
+
+        Args:
+            scope: ASGI scope of the request.
+            receive: ASGI receive callable.
+            send: ASGI send callable.
+        """
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        capture = ResponseCapture(send, QueryStats())
+        stats_token = request_queries.set(capture.query_stats)
+        http_requests_in_flight.inc()
+        start_time = time.perf_counter()
+        try:
+            await self.app(scope, receive, capture.send)
+        except Exception:
+            capture.status_code = SERVER_ERROR_STATUS
+            self._record(scope, capture, start_time)
+            request_queries.reset(stats_token)
+            raise
+        self._record(scope, capture, start_time)
+        request_queries.reset(stats_token)
+
+    def _record(
+        self, scope: Scope, capture: ResponseCapture, start_time: float,
+    ):
+        route_labels = (
+            scope['method'],
+            getattr(scope.get('route'), 'path', UNMATCHED_ROUTE),
+        )
+        if capture.streaming:
+            sse_connections.dec()
+        else:
+            http_requests_in_flight.dec()
+            http_request_duration.observe(
+                time.perf_counter() - start_time, route_labels,
+            )
+        http_requests.inc(route_labels + (str(capture.status_code),))
+        query_count = capture.query_stats.count
+        http_request_queries.observe(query_count, route_labels)
+        if query_count > config.query_warning_threshold:
+            logger.warning('{0} {1} ran {2} SQL statements'.format(
+                *route_labels, query_count,
+            ))
+
+
+def _is_event_stream(message: Message) -> bool:
+    return any(
+        header_name == b'content-type'
+        and header_value.startswith(EVENT_STREAM_TYPE)
+        for header_name, header_value in message.get('headers', ())
+    )
@@ -7,51 +7,125 @@ Attributes:
 """
 
 
+import asyncio
+import time
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator, AsyncIterator
+from typing import (AsyncGenerator, AsyncIterator, Dict, Optional, Sequence,
+                    Tuple)
 
 from sqlalchemy.ext.asyncio import (AsyncConnection, AsyncEngine, AsyncSession,
                                     async_sessionmaker, create_async_engine)
 from sqlalchemy.orm import DeclarativeBase, declarative_base
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 
-from backend.api.db.db_service import check_tables
+from backend.api.core.config import PoolConfig
+from backend.api.core.db_metrics import (instrument_engine,
+                                         register_pool_metrics)
+from backend.api.core.replicas import CONNECTION_ERRORS, ReplicaSet
+from backend.api.db.migrations import upgrade_schema
 
 Base: DeclarativeBase = declarative_base()
 
 
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Connection pool that records how long connection checkouts take.
+
+    Attributes:
+        waiting: Number of checkouts currently waiting for a connection.
+        acquired: Total number of finished checkouts.
+        wait_time_total: Total seconds spent acquiring connections.
+        wait_time_max: Longest single acquisition in seconds.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """
+        Initialize the pool and zero the counters.
+
+        Args:
+            args: Positional arguments of AsyncAdaptedQueuePool.
+            kwargs: Keyword arguments of AsyncAdaptedQueuePool.
+        """
+        super().__init__(*args, **kwargs)
+        self.waiting = 0
+        self.acquired = 0
+        self.wait_time_total: float = 0
+        self.wait_time_max: float = 0
+
+    def _do_get(self):
+        self.waiting += 1
+        start_time = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            self._record_wait(start_time)
+            raise
+        self._record_wait(start_time)
+        return connection
+
+    def _record_wait(self, start_time: float) -> None:
+        wait_time = time.perf_counter() - start_time
+        self.waiting -= 1
+        self.acquired += 1
+        self.wait_time_total += wait_time
+        self.wait_time_max = max(self.wait_time_max, wait_time)
+
+
 class DatabaseSessionManager:
     """
     Database connection session manager.
 
+    Writes go to the primary database. Reads that tolerate replication
+    lag may go to read replicas, which are used in turn.
+
     Attributes:
-        _engine: SQLAlchemy engine.
-        _sessionmaker: Async database sessionmaker.
+        _engine: SQLAlchemy engine of the primary database.
+        _sessionmaker: Async database sessionmaker of the primary database.
+        _replica_engines: SQLAlchemy engines of the read replicas.
+        _replicas: Rotation of the replica engines.
     """
 
     def __init__(self):
         """Initialize the database engine and sessionmaker with None values."""
         self._engine: AsyncEngine | None = None
         self._sessionmaker: async_sessionmaker | None = None
-
-    def init(self, host: str):
+        self._replica_engines: Sequence[AsyncEngine] = ()
+        self._replicas: ReplicaSet[AsyncEngine] = ReplicaSet((), 0)
+
+    def init(
+        self,
+        host: str,
+        pool_config: Optional[PoolConfig] = None,
+        replica_hosts: Sequence[str] = (),
+        replica_retry_after: float = 0,
+    ):
         """
-        Initialize the database engine and sessionmaker with the provided host.
+        Initialize the database engines and sessionmakers.
+
+        Without pool settings every session opens its own connection.
+        Statements of the engines are counted and timed for the metrics.
 
         Args:
-            host: Database connection string.
+            host: Connection string of the primary database.
+            pool_config: Connection pool settings of every engine.
+            replica_hosts: Connection strings of the read replicas.
+            replica_retry_after: Seconds a failed replica is skipped for.
         """
-        self._engine = create_async_engine(host, poolclass=NullPool)
+        self._engine = _create_engine(host, pool_config)
         self._sessionmaker = async_sessionmaker(
             autocommit=False,
             bind=self._engine,
         )
+        self._replica_engines = [
+            _create_engine(replica_host, pool_config)
+            for replica_host in replica_hosts
+        ]
+        self._replicas = ReplicaSet(self._replica_engines, replica_retry_after)
 
     async def startup(self):
-        """Start manager: Initializes metadata if necessary."""
+        """Start manager: Creates or migrates the database schema."""
         async with self.connect() as conn:
-            if not await self.check_tables_exists(conn):
-                await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(upgrade_schema, Base.metadata)
 
     @classmethod
     async def drop_all(cls, connection: AsyncConnection):
@@ -84,9 +158,15 @@ class DatabaseSessionManager:
         """
         if self._engine is None:
             raise RuntimeError('DatabaseSessionManager is not initialized.')
+        await asyncio.gather(*[
+            replica_engine.dispose()
+            for replica_engine in self._replica_engines
+        ])
         await self._engine.dispose()
         self._engine = None
         self._sessionmaker = None
+        self._replica_engines = ()
+        self._replicas = ReplicaSet((), 0)
 
     @asynccontextmanager
     async def connect(self) -> AsyncIterator[AsyncConnection]:
@@ -136,20 +216,75 @@ class DatabaseSessionManager:
         finally:
             await session.close()
 
-    @classmethod
-    async def check_tables_exists(cls, connection: AsyncConnection) -> bool:
+    @asynccontextmanager
+    async def read_session(
+        self, primary: bool = False,
+    ) -> AsyncIterator[AsyncSession]:
         """
-        Check for table existence: used when starting the manager.
+        Initialize a session for reads that tolerate replication lag.
+
+        The session is bound to the next replica that accepts a
+        connection. A replica that cannot be reached is skipped by the
+        following sessions for a while and the next one is tried. Without
+        reachable replicas the primary is used.
 
         Args:
-            connection: Async connection to database.
+            primary: Use the primary even if replicas are available.
+
+        Yields:
+            AsyncSession: An active database session.
+
+        Raises:
+            RuntimeError: If the DatabaseSessionManager is not initialized.
+            Exception: If any other exception occurs during the session yield.
+        """
+        replica_connection = None
+        if not primary:
+            replica_connection = await self._connect_replica(
+                len(self._replicas),
+            )
+        if replica_connection is None:
+            async with self.session() as primary_session:
+                yield primary_session
+            return
+
+        replica, connection = replica_connection
+        session = AsyncSession(bind=connection)
+        try:
+            yield session
+        except CONNECTION_ERRORS:
+            self._replicas.mark_failed(replica)
+            await session.rollback()
+            raise
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+            await connection.close()
+
+    def pool_stats(self) -> Dict[str, float]:
+        """
+        Get connection pool statistics.
 
         Returns:
-            If tables exists return True else False.
+            Pool size and usage counters, empty if the pool is disabled.
         """
-        return await connection.run_sync(
-            lambda sync_conn: check_tables(sync_conn),
-        )
+        if self._engine is None:
+            return {}
+        pool = self._engine.pool
+        if not isinstance(pool, InstrumentedQueuePool):
+            return {}
+        return {
+            'size': pool.size(),
+            'checked_in': pool.checkedin(),
+            'checked_out': pool.checkedout(),
+            'overflow': pool.overflow(),
+            'waiting': pool.waiting,
+            'acquired': pool.acquired,
+            'wait_time_total': pool.wait_time_total,
+            'wait_time_max': pool.wait_time_max,
+        }
 
     @property
     def engine(self) -> AsyncEngine:
@@ -161,8 +296,51 @@ class DatabaseSessionManager:
         """
         return self._engine
 
+    async def _connect_replica(
+        self, attempts: int,
+    ) -> Optional[Tuple[AsyncEngine, AsyncConnection]]:
+        """
+        Connect to the next reachable replica.
+
+        Args:
+            attempts: Number of replicas to try.
+
+        Returns:
+            The replica engine and its connection, None if no replica
+            could be reached.
+        """
+        replica = self._replicas.acquire()
+        if replica is None or attempts <= 0:
+            return None
+        try:
+            connection = await replica.connect()
+        except CONNECTION_ERRORS:
+            self._replicas.mark_failed(replica)
+            return await self._connect_replica(attempts - 1)
+        return replica, connection
+
+
+def _create_engine(
+    host: str, pool_config: Optional[PoolConfig],
+) -> AsyncEngine:
+    if pool_config is None:
+        engine = create_async_engine(host, poolclass=NullPool)
+    else:
+        engine = create_async_engine(
+            host,
+            poolclass=InstrumentedQueuePool,
+            pool_size=pool_config.size,
+            max_overflow=pool_config.max_overflow,
+            pool_recycle=pool_config.recycle,
+            pool_pre_ping=pool_config.pre_ping,
+            pool_timeout=pool_config.timeout,
+        )
+    instrument_engine(engine)
+    return engine
+
 
 sessionmanager = DatabaseSessionManager()
+register_pool_metrics(sessionmanager.pool_stats)
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
@@ -7,6 +7,41 @@ Attributes:
 
 
 import os
+from typing import NamedTuple, Optional, Tuple
+
+
+def _env_flag(name: str, default: str) -> bool:
+    """
+    Read a boolean flag from the environment.
+
+    Args:
+        name: Name of the environment variable.
+        default: Value used when the variable is not set.
+
+    Returns:
+        True if the variable is set to a truthy value.
+    """
+    return os.getenv(name, default).lower() in {'1', 'true', 'yes', 'on'}
+
+
+class PoolConfig(NamedTuple):
+    """
+    Settings of the database connection pool.
+
+    Attributes:
+        size: Number of connections kept open in the pool.
+        max_overflow: Connections allowed above size under load.
+        recycle: Seconds after which a connection is reopened,
+         -1 disables recycling.
+        pre_ping: Test connections for liveness on checkout.
+        timeout: Seconds to wait for a free connection before failing.
+    """
+
+    size: int = 10
+    max_overflow: int = 10
+    recycle: int = 1800
+    pre_ping: bool = True
+    timeout: float = 30
 
 
 class Config:
@@ -17,6 +52,49 @@ class Config:
 
     Attributes:
         db_config: Database config initialized in os environment.
+        feed_page_size: Default number of tweets in one feed page.
+        max_feed_page_size: Upper limit for the requested feed page size.
+        fanout_follower_limit: Authors with more followers than this are
+         not pushed to the followers timelines, their tweets are pulled
+         when the feed is read.
+        timeline_backfill_size: Number of recent tweets copied into
+         the timeline when a user follows somebody.
+        db_pool: Connection pool settings, or None to open a new
+         connection for every session.
+        db_replicas: Connection strings of the read replicas.
+        replica_retry_after: Seconds an unreachable replica is left
+         out of the rotation.
+        read_your_writes_window: Seconds the reads of a user go to the
+         primary database after the user writes.
+        trend_window: Number of minutes the trends are counted over.
+        trends_count: Default number of tags in the trends.
+        user_cache_size: Maximum number of API keys in the user cache.
+        user_cache_ttl: Seconds a cached API key stays valid.
+        log_sample_every: Log every n-th request; server errors
+         are always logged.
+        log_payloads: Log request headers and bodies of sampled requests.
+        log_body_limit: Maximum number of logged bytes of a body.
+        log_queue_size: Number of request records waiting to be written
+         after which new records are dropped.
+        debug: Add the number of SQL statements of a request to the
+         X-Query-Count response header.
+        query_warning_threshold: Log a warning for requests running more
+         SQL statements than this.
+        event_queue_size: Number of undelivered events after which
+         a slow events stream is disconnected.
+        event_heartbeat: Seconds of silence after which an events
+         stream gets a heartbeat.
+        event_reconnect_delay: Seconds between attempts to restore
+         the events listener connection.
+        media_root: Directory with uploaded media files.
+        max_upload_size: Maximum size of an uploaded file in bytes.
+        upload_chunk_size: Size of the chunks uploads are streamed in.
+        image_variant_widths: Widths of the resized image variants.
+        image_workers: Number of processes rendering image variants.
+        hot_image_cache_size: Byte budget of the in-memory image cache.
+        hot_image_max_size: Largest image kept in the in-memory cache.
+        media_accel_redirect_prefix: Internal nginx location serving
+         the media directory, or None to serve files from the backend.
     """
 
     db_config: str = os.getenv(
@@ -29,6 +107,64 @@ class Config:
             DB_NAME=os.getenv('DB_NAME', 'fastapi'),
         ),
     )
+    feed_page_size: int = int(os.getenv('FEED_PAGE_SIZE', '20'))
+    max_feed_page_size: int = int(os.getenv('MAX_FEED_PAGE_SIZE', '100'))
+    fanout_follower_limit: int = int(
+        os.getenv('FANOUT_FOLLOWER_LIMIT', '10000'),
+    )
+    timeline_backfill_size: int = int(
+        os.getenv('TIMELINE_BACKFILL_SIZE', '100'),
+    )
+    db_pool: Optional[PoolConfig] = PoolConfig(
+        size=int(os.getenv('DB_POOL_SIZE', '10')),
+        max_overflow=int(os.getenv('DB_POOL_MAX_OVERFLOW', '10')),
+        recycle=int(os.getenv('DB_POOL_RECYCLE', '1800')),
+        pre_ping=_env_flag('DB_POOL_PRE_PING', 'true'),
+        timeout=float(os.getenv('DB_POOL_TIMEOUT', '30')),
+    ) if _env_flag('DB_POOL_ENABLED', 'true') else None
+    db_replicas: Tuple[str, ...] = tuple(
+        replica for replica in os.getenv('DB_REPLICAS', '').split(',')
+        if replica
+    )
+    replica_retry_after: float = float(os.getenv('REPLICA_RETRY_AFTER', '30'))
+    read_your_writes_window: float = float(
+        os.getenv('READ_YOUR_WRITES_WINDOW', '5'),
+    )
+    trend_window: int = int(os.getenv('TREND_WINDOW', '60'))
+    trends_count: int = int(os.getenv('TRENDS_COUNT', '10'))
+    user_cache_size: int = int(os.getenv('USER_CACHE_SIZE', '10000'))
+    user_cache_ttl: float = float(os.getenv('USER_CACHE_TTL', '300'))
+    log_sample_every: int = max(int(os.getenv('LOG_SAMPLE_EVERY', '1')), 1)
+    log_payloads: bool = _env_flag('LOG_PAYLOADS', 'false')
+    log_body_limit: int = int(os.getenv('LOG_BODY_LIMIT', '1024'))
+    log_queue_size: int = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+    debug: bool = _env_flag('DEBUG', 'false')
+    query_warning_threshold: int = int(
+        os.getenv('QUERY_WARNING_THRESHOLD', '20'),
+    )
+    event_queue_size: int = int(os.getenv('EVENT_QUEUE_SIZE', '100'))
+    event_heartbeat: float = float(os.getenv('EVENT_HEARTBEAT', '15'))
+    event_reconnect_delay: float = float(
+        os.getenv('EVENT_RECONNECT_DELAY', '5'),
+    )
+    media_root: str = os.getenv(
+        'MEDIA_ROOT', os.path.abspath('./backend/api/images'),
+    )
+    max_upload_size: int = int(os.getenv('MAX_UPLOAD_SIZE', '10485760'))
+    upload_chunk_size: int = int(os.getenv('UPLOAD_CHUNK_SIZE', '65536'))
+    image_variant_widths: Tuple[int, ...] = tuple(
+        int(width) for width in os.getenv(
+            'IMAGE_VARIANT_WIDTHS', '160,480,960',
+        ).split(',')
+    )
+    image_workers: int = int(os.getenv('IMAGE_WORKERS', '2'))
+    hot_image_cache_size: int = int(
+        os.getenv('HOT_IMAGE_CACHE_SIZE', '33554432'),
+    )
+    hot_image_max_size: int = int(os.getenv('HOT_IMAGE_MAX_SIZE', '262144'))
+    media_accel_redirect_prefix: Optional[str] = (
+        os.getenv('MEDIA_ACCEL_REDIRECT_PREFIX') or None
+    )
 
 
 config = Config
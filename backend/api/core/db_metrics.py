@@ -0,0 +1,143 @@
+"""
+A module contains metrics of the database access.
+
+Statements are counted and timed by engine events, connection pool
+usage is read from the session manager at scrape time. Statements are
+also added up per request, in the query statistics of the context.
+
+Attributes:
+    QUERY_OPERATIONS: Statement kinds used as label values, other
+     statements are counted as OTHER.
+    POOL_METRICS: Help texts of the pool gauges by statistics key.
+    db_queries: Counter of executed statements.
+    db_query_duration: Histogram of statement execution times.
+    request_queries: Query statistics of the current request.
+"""
+
+
+import time
+from contextvars import ContextVar
+from types import MappingProxyType
+from typing import Callable, Mapping, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from backend.api.core.metrics import Counter, GaugeSet, Histogram, registry
+
+QUERY_OPERATIONS = frozenset(('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH'))
+OTHER_OPERATION = 'OTHER'
+START_TIMES_KEY = 'query_start_times'
+
+POOL_METRICS = MappingProxyType({
+    'size': 'Number of connections kept in the pool.',
+    'checked_in': 'Idle connections in the pool.',
+    'checked_out': 'Connections in use.',
+    'overflow': 'Connections opened above the pool size.',
+    'waiting': 'Checkouts waiting for a connection.',
+    'acquired': 'Finished connection checkouts.',
+    'wait_time_total': 'Seconds spent waiting for connections.',
+    'wait_time_max': 'Longest wait for a connection in seconds.',
+})
+
+db_queries = registry.register(Counter(
+    'db_queries_total', 'Executed SQL statements.', ('operation',),
+))
+db_query_duration = registry.register(Histogram(
+    'db_query_duration_seconds',
+    'Execution time of SQL statements.',
+    ('operation',),
+))
+
+
+class QueryStats:
+    """
+    SQL statements executed while processing one request.
+
+    Attributes:
+        count: Number of statements.
+        duration: Total execution time in seconds.
+    """
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.count = 0
+        self.duration: float = 0
+
+
+request_queries: ContextVar[Optional[QueryStats]] = ContextVar(
+    'request_queries', default=None,
+)
+
+
+def statement_operation(statement: str) -> str:
+    """
+    Get the kind of a statement.
+
+    Args:
+        statement: SQL statement.
+
+    Returns:
+        The first keyword of the statement, or OTHER for statements
+        other than queries and data changes.
+    """
+    keywords = statement.split(None, 1)
+    if not keywords or keywords[0].upper() not in QUERY_OPERATIONS:
+        return OTHER_OPERATION
+    return keywords[0].upper()
+
+
+def _before_cursor_execute(conn, **kwargs) -> None:
+    conn.info.setdefault(START_TIMES_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, statement: str, **kwargs) -> None:
+    duration = time.perf_counter() - conn.info[START_TIMES_KEY].pop()
+    operation = (statement_operation(statement),)
+    db_queries.inc(operation)
+    db_query_duration.observe(duration, operation)
+    query_stats = request_queries.get()
+    if query_stats is not None:
+        query_stats.count += 1
+        query_stats.duration += duration
+
+
+def _handle_error(exception_context) -> None:
+    connection = exception_context.connection
+    if connection is not None and connection.info.get(START_TIMES_KEY):
+        connection.info[START_TIMES_KEY].pop()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Count and time the statements executed by an engine.
+
+    Args:
+        engine: SQLAlchemy async engine.
+    """
+    sync_engine = engine.sync_engine
+    event.listen(
+        sync_engine,
+        'before_cursor_execute',
+        _before_cursor_execute,
+        named=True,
+    )
+    event.listen(
+        sync_engine,
+        'after_cursor_execute',
+        _after_cursor_execute,
+        named=True,
+    )
+    event.listen(sync_engine, 'handle_error', _handle_error)
+
+
+def register_pool_metrics(
+    pool_stats: Callable[[], Mapping[str, float]],
+) -> None:
+    """
+    Expose connection pool statistics as gauges.
+
+    Args:
+        pool_stats: Function returning the pool statistics.
+    """
+    registry.register(GaugeSet('db_pool', POOL_METRICS, pool_stats))
@@ -0,0 +1,53 @@
+"""
+A module contains the formatting of the Prometheus text exposition format.
+
+Attributes:
+    LABEL_ESCAPES: Translation of the characters escaped in label values.
+"""
+
+
+import math
+from typing import Sequence, Tuple
+
+LABEL_ESCAPES = str.maketrans({'\\': r'\\', '"': r'\"', '\n': r'\n'})
+
+Labels = Tuple[str, ...]
+
+
+def format_labels(names: Sequence[str], label_values: Labels) -> str:
+    """
+    Format label pairs of a sample.
+
+    Args:
+        names: Label names.
+        label_values: Label values in the order of the names.
+
+    Returns:
+        Labels in braces, empty if there are none.
+    """
+    if not names:
+        return ''
+    pairs = ','.join(
+        '{0}="{1}"'.format(name, _escape(label_value))
+        for name, label_value in zip(names, label_values)
+    )
+    return '{{{0}}}'.format(pairs)
+
+
+def format_value(sample_value: float) -> str:
+    """
+    Format the value of a sample.
+
+    Args:
+        sample_value: Value of the sample.
+
+    Returns:
+        The value in the exposition format.
+    """
+    if math.isinf(sample_value):
+        return '+Inf' if sample_value > 0 else '-Inf'
+    return repr(float(sample_value))
+
+
+def _escape(label_value: str) -> str:
+    return str(label_value).translate(LABEL_ESCAPES)
@@ -0,0 +1,290 @@
+"""
+A module contains an in-process registry of Prometheus-style metrics.
+
+Metrics are plain dictionaries updated from the event loop thread, so
+recording a value takes no lock and costs a dictionary lookup. They are
+rendered in the Prometheus text exposition format on scrape. Values are
+kept per worker process.
+
+Attributes:
+    DEFAULT_BUCKETS: Upper bounds of latency histogram buckets in seconds.
+    registry: The registry of the application metrics.
+"""
+
+
+import math
+from bisect import bisect_left
+from collections import defaultdict
+from typing import (Callable, Dict, Iterable, List, Mapping, Sequence,
+                    TypeVar)
+
+from backend.api.core.exposition import (Labels, format_labels,
+                                         format_value)
+
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+)
+
+MetricType = TypeVar('MetricType')
+
+
+class Metric:
+    """
+    Base of the metrics with labelled samples.
+
+    Attributes:
+        name: Name of the metric.
+        description: Help text of the metric.
+        label_names: Names of the labels.
+        metric_type: Prometheus type of the metric.
+    """
+
+    metric_type = 'untyped'
+
+    def __init__(
+        self, name: str, description: str, label_names: Sequence[str] = (),
+    ):
+        """
+        Initialize the metric.
+
+        Args:
+            name: Name of the metric.
+            description: Help text of the metric.
+            label_names: Names of the labels.
+        """
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+
+    def collect(self) -> Iterable[str]:
+        """
+        Render the metric.
+
+        Yields:
+            Lines of the exposition format.
+        """
+        yield '# HELP {0} {1}'.format(self.name, self.description)
+        yield '# TYPE {0} {1}'.format(self.name, self.metric_type)
+        yield from self.samples()
+
+    def samples(self) -> Iterable[str]:
+        """
+        Render the samples of the metric.
+
+        Returns:
+            Lines of the exposition format.
+        """
+        return ()
+
+
+class Counter(Metric):
+    """Monotonically increasing value per label set."""
+
+    metric_type = 'counter'
+
+    def __init__(self, *args, **kwargs):
+        """
+        Initialize the counter.
+
+        Args:
+            args: Positional arguments of Metric.
+            kwargs: Keyword arguments of Metric.
+        """
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Labels, float] = defaultdict(float)
+
+    def inc(self, label_values: Labels = (), amount: float = 1) -> None:
+        """
+        Increase the value.
+
+        Args:
+            label_values: Label values in the order of the label names.
+            amount: Increment.
+        """
+        self._values[label_values] += amount
+
+    def samples(self) -> Iterable[str]:
+        """
+        Render the samples of the metric.
+
+        Yields:
+            Lines of the exposition format.
+        """
+        for label_values, sample_value in sorted(self._values.items()):
+            yield '{0}{1} {2}'.format(
+                self.name,
+                format_labels(self.label_names, label_values),
+                format_value(sample_value),
+            )
+
+
+class Gauge(Counter):
+    """Value per label set that can go up and down."""
+
+    metric_type = 'gauge'
+
+    def dec(self, label_values: Labels = (), amount: float = 1) -> None:
+        """
+        Decrease the value.
+
+        Args:
+            label_values: Label values in the order of the label names.
+            amount: Decrement.
+        """
+        self._values[label_values] -= amount
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    metric_type = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        """
+        Initialize the histogram.
+
+        Args:
+            name: Name of the metric.
+            description: Help text of the metric.
+            label_names: Names of the labels.
+            buckets: Upper bounds of the buckets in ascending order.
+        """
+        super().__init__(name, description, label_names)
+        self.buckets = tuple(buckets) + (math.inf,)
+        self._counts: Dict[Labels, List[int]] = {}
+        self._sums: Dict[Labels, float] = defaultdict(float)
+
+    def observe(self, observed: float, label_values: Labels = ()) -> None:
+        """
+        Record a value.
+
+        Args:
+            observed: Observed value.
+            label_values: Label values in the order of the label names.
+        """
+        counts = self._counts.get(label_values)
+        if counts is None:
+            counts = [0 for _ in self.buckets]
+            self._counts[label_values] = counts
+        counts[bisect_left(self.buckets, observed)] += 1
+        self._sums[label_values] += observed
+
+    def samples(self) -> Iterable[str]:
+        """
+        Render the samples of the metric.
+
+        Yields:
+            Lines of the exposition format.
+        """
+        for label_values, counts in sorted(self._counts.items()):
+            yield from self._bucket_samples(label_values, counts)
+            labels = format_labels(self.label_names, label_values)
+            yield '{0}_sum{1} {2}'.format(
+                self.name, labels, format_value(self._sums[label_values]),
+            )
+            yield '{0}_count{1} {2}'.format(self.name, labels, sum(counts))
+
+    def _bucket_samples(
+        self, label_values: Labels, counts: List[int],
+    ) -> Iterable[str]:
+        bucket_labels = self.label_names + ('le',)
+        cumulative = 0
+        for upper_bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            yield '{0}_bucket{1} {2}'.format(
+                self.name,
+                format_labels(
+                    bucket_labels, label_values + (format_value(upper_bound),),
+                ),
+                cumulative,
+            )
+
+
+class GaugeSet:
+    """
+    Gauges read from a callback at scrape time.
+
+    Attributes:
+        prefix: Common prefix of the gauge names.
+        descriptions: Help texts of the gauges by key of the callback.
+        callback: Function returning the current values by key.
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        descriptions: Mapping[str, str],
+        callback: Callable[[], Mapping[str, float]],
+    ):
+        """
+        Initialize the gauges.
+
+        Args:
+            prefix: Common prefix of the gauge names.
+            descriptions: Help texts of the gauges by key of the callback.
+            callback: Function returning the current values by key.
+        """
+        self.prefix = prefix
+        self.descriptions = descriptions
+        self.callback = callback
+
+    def collect(self) -> Iterable[str]:
+        """
+        Render the gauges returned by the callback.
+
+        Yields:
+            Lines of the exposition format.
+        """
+        current_values = self.callback()
+        for key, description in self.descriptions.items():
+            if key not in current_values:
+                continue
+            name = '{0}_{1}'.format(self.prefix, key)
+            yield '# HELP {0} {1}'.format(name, description)
+            yield '# TYPE {0} gauge'.format(name)
+            yield '{0} {1}'.format(name, format_value(current_values[key]))
+
+
+class Registry:
+    """Collection of the metrics exposed by the application."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._metrics: list = []
+
+    def register(self, metric: MetricType) -> MetricType:
+        """
+        Add a metric to the exposed ones.
+
+        Args:
+            metric: Metric or gauge set with a collect method.
+
+        Returns:
+            The same metric.
+        """
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """
+        Render all metrics.
+
+        Returns:
+            Metrics in the Prometheus text exposition format.
+        """
+        lines = [
+            line
+            for metric in self._metrics
+            for line in metric.collect()
+        ]
+        lines.append('')
+        return '\n'.join(lines)
+
+
+registry = Registry()
@@ -0,0 +1,78 @@
+"""
+A module contains the round-robin selection of read replicas.
+
+Attributes:
+    CONNECTION_ERRORS: Exceptions meaning that a replica is unreachable.
+"""
+
+
+import time
+from typing import Generic, List, Optional, Sequence, TypeVar
+
+from sqlalchemy.exc import InterfaceError, OperationalError
+
+CONNECTION_ERRORS = (OperationalError, InterfaceError, OSError)
+
+Replica = TypeVar('Replica')
+
+
+class ReplicaSet(Generic[Replica]):
+    """
+    Replicas handed out in turn, skipping the ones that recently failed.
+
+    A failed replica is taken out of the rotation for retry_after seconds
+    and then tried again, so a restarted replica rejoins without any
+    health-check traffic.
+
+    Attributes:
+        replicas: Replicas in the order of the rotation.
+        retry_after: Seconds a failed replica is skipped for.
+    """
+
+    def __init__(self, replicas: Sequence[Replica], retry_after: float):
+        """
+        Initialize the rotation with every replica healthy.
+
+        Args:
+            replicas: Replicas in the order of the rotation.
+            retry_after: Seconds a failed replica is skipped for.
+        """
+        self.replicas = tuple(replicas)
+        self.retry_after = retry_after
+        self._down_until: List[float] = [0 for _ in self.replicas]
+        self._next_index = 0
+
+    def acquire(self) -> Optional[Replica]:
+        """
+        Get the next healthy replica.
+
+        Returns:
+            A replica, or None if there are none or all of them are down.
+        """
+        now = time.monotonic()
+        replica_count = len(self.replicas)
+        for _ in range(replica_count):
+            index = self._next_index
+            self._next_index = (index + 1) % replica_count
+            if self._down_until[index] <= now:
+                return self.replicas[index]
+        return None
+
+    def mark_failed(self, replica: Replica) -> None:
+        """
+        Take a replica out of the rotation for retry_after seconds.
+
+        Args:
+            replica: Replica that failed to serve a request.
+        """
+        index = self.replicas.index(replica)
+        self._down_until[index] = time.monotonic() + self.retry_after
+
+    def __len__(self) -> int:
+        """
+        Get the number of replicas.
+
+        Returns:
+            Number of replicas, healthy or not.
+        """
+        return len(self.replicas)
@@ -0,0 +1,134 @@
+"""
+Functions publishing real-time events with NOTIFY.
+
+Notifications are queued by the transaction of the change and sent when
+it commits, so a rolled back change publishes nothing.
+"""
+
+
+import json
+import logging
+from typing import Sequence, Tuple
+
+from sqlalchemy import Text, cast, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.api.db.models import Tweet
+
+EVENTS_CHANNEL = 'events'
+NOTIFY_PAYLOAD_LIMIT = 7999
+
+logger = logging.getLogger('uvicorn.error')
+
+
+async def publish_tweet(
+    session: AsyncSession,
+    tweet_id: int,
+    content: str,
+    attachments: Sequence[str],
+    author: Tuple[int, str],
+) -> None:
+    """
+    Publish a new tweet in the TweetSchema format.
+
+    Args:
+        session: Current database session.
+        tweet_id: ID of the new tweet.
+        content: Text content of the tweet.
+        attachments: Links to the tweet's attachments.
+        author: ID and name of the author.
+    """
+    tweet = {
+        'id': tweet_id,
+        'content': content,
+        'attachments': list(attachments),
+        'author': _user_brief(author),
+        'like_count': 0,
+        'liked_by_me': False,
+    }
+    await _publish(session, 'tweet', tweet, author_id=author[0])
+
+
+async def publish_like(
+    session: AsyncSession, tweet_id: int, user: Tuple[int, str],
+) -> None:
+    """
+    Publish a like to the author of the liked tweet.
+
+    Args:
+        session: Current database session.
+        tweet_id: ID of the liked tweet.
+        user: ID and name of the user who liked the tweet.
+    """
+    user_id, user_name = user
+    event = func.json_build_object(
+        'type', 'like',
+        'author_id', Tweet.author_id,
+        'data', func.json_build_object(
+            'tweet_id', Tweet.id,
+            'user', func.json_build_object('id', user_id, 'name', user_name),
+        ),
+    )
+    await session.execute(
+        select(func.pg_notify(EVENTS_CHANNEL, cast(event, Text))).where(
+            Tweet.id == tweet_id,
+        ),
+    )
+
+
+async def publish_follow(
+    session: AsyncSession, follower: Tuple[int, str], followed_id: int,
+) -> None:
+    """
+    Publish a new follower to the followed user.
+
+    Args:
+        session: Current database session.
+        follower: ID and name of the follower.
+        followed_id: ID of the followed user.
+    """
+    await _publish(
+        session,
+        'follow',
+        {'user': _user_brief(follower)},
+        follower_id=follower[0],
+        followed_id=followed_id,
+    )
+
+
+async def publish_unfollow(
+    session: AsyncSession, follower_id: int, followed_id: int,
+) -> None:
+    """
+    Publish an unfollow.
+
+    The event is not sent to clients, it stops the tweets of the user
+    reaching the streams of the former follower.
+
+    Args:
+        session: Current database session.
+        follower_id: ID of the former follower.
+        followed_id: ID of the unfollowed user.
+    """
+    await _publish(
+        session,
+        'unfollow',
+        {},
+        follower_id=follower_id,
+        followed_id=followed_id,
+    )
+
+
+def _user_brief(user: Tuple[int, str]) -> dict:
+    user_id, user_name = user
+    return {'id': user_id, 'name': user_name}
+
+
+async def _publish(
+    session: AsyncSession, event_type: str, event_data: dict, **routing,
+) -> None:
+    payload = json.dumps({'type': event_type, 'data': event_data, **routing})
+    if len(payload.encode()) > NOTIFY_PAYLOAD_LIMIT:
+        logger.warning('Event {0} is too large to publish'.format(event_type))
+        return
+    await session.execute(select(func.pg_notify(EVENTS_CHANNEL, payload)))
@@ -0,0 +1,177 @@
+"""
+Functions for crud operations with the followers table.
+
+Every user keeps the numbers of its followers and followed users in
+counters, so reading a profile never counts followers. The counters are
+updated in the transaction that adds or removes the follow, as its last
+statement: the update locks the row of a followed user, which every
+follow of that user waits for.
+"""
+
+
+from typing import Optional, Sequence
+
+from sqlalchemy import Row, case, literal, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.api.db.models import User, followers_association
+
+FOLLOWERS_COLUMNS = ('follower_id', 'followed_id')
+
+
+async def add_follower(
+    session: AsyncSession, follower_id: int, followed_id: int,
+) -> bool:
+    """
+    Make a user follow another one.
+
+    The counters are not changed, see update_follow_counts.
+
+    Args:
+        session: Current database session.
+        follower_id: ID of the follower.
+        followed_id: ID of the followed user.
+
+    Returns:
+        True if a row was added, False if the followed user does not
+        exist or is already followed.
+    """
+    followed = select(literal(follower_id), User.id).where(
+        User.id == followed_id,
+    )
+    inserted = insert(followers_association).from_select(
+        FOLLOWERS_COLUMNS, followed,
+    ).on_conflict_do_nothing().returning(followers_association.c.followed_id)
+    return (await session.execute(inserted)).first() is not None
+
+
+async def remove_follower(
+    session: AsyncSession, follower_id: int, followed_id: int,
+) -> bool:
+    """
+    Make a user stop following another one.
+
+    The counters are not changed, see update_follow_counts.
+
+    Args:
+        session: Current database session.
+        follower_id: ID of the follower.
+        followed_id: ID of the followed user.
+
+    Returns:
+        True if a row was deleted, False if the user was not followed.
+    """
+    deleted = followers_association.delete().where(
+        followers_association.c.follower_id == follower_id,
+        followers_association.c.followed_id == followed_id,
+    ).returning(followers_association.c.followed_id)
+    return (await session.execute(deleted)).first() is not None
+
+
+async def update_follow_counts(
+    session: AsyncSession, follower_id: int, followed_id: int, delta: int,
+) -> None:
+    """
+    Change the counters of an added or removed follow.
+
+    Locks the rows of both users until the end of the transaction, so it
+    is meant to be the last statement of the transaction.
+
+    Args:
+        session: Current database session.
+        follower_id: ID of the follower.
+        followed_id: ID of the followed user.
+        delta: 1 for an added follow, -1 for a removed one.
+    """
+    counted = update(User).where(
+        User.id.in_((follower_id, followed_id)),
+    ).values(
+        followers_count=User.followers_count + case(
+            (User.id == followed_id, delta), else_=0,
+        ),
+        following_count=User.following_count + case(
+            (User.id == follower_id, delta), else_=0,
+        ),
+    )
+    await session.execute(
+        counted.execution_options(synchronize_session=False),
+    )
+
+
+async def select_followers_page(
+    session: AsyncSession,
+    user_id: int,
+    limit: int,
+    before_id: Optional[int] = None,
+) -> Sequence[Row]:
+    """
+    Select one page of the users who follow a user.
+
+    Args:
+        session: Current database session.
+        user_id: ID of the followed user.
+        limit: Maximum number of users in the page.
+        before_id: Return only users with ID lower than this cursor.
+
+    Returns:
+        Rows with ID and name of the followers, highest ID first.
+    """
+    query = select(User.id, User.name).join(
+        followers_association,
+        followers_association.c.follower_id == User.id,
+    ).where(followers_association.c.followed_id == user_id)
+    if before_id is not None:
+        query = query.where(followers_association.c.follower_id < before_id)
+    query = query.order_by(followers_association.c.follower_id.desc())
+    return (await session.execute(query.limit(limit))).all()
+
+
+async def select_following_page(
+    session: AsyncSession,
+    user_id: int,
+    limit: int,
+    before_id: Optional[int] = None,
+) -> Sequence[Row]:
+    """
+    Select one page of the users followed by a user.
+
+    Args:
+        session: Current database session.
+        user_id: ID of the follower.
+        limit: Maximum number of users in the page.
+        before_id: Return only users with ID lower than this cursor.
+
+    Returns:
+        Rows with ID and name of the followed users, highest ID first.
+    """
+    query = select(User.id, User.name).join(
+        followers_association,
+        followers_association.c.followed_id == User.id,
+    ).where(followers_association.c.follower_id == user_id)
+    if before_id is not None:
+        query = query.where(followers_association.c.followed_id < before_id)
+    query = query.order_by(followers_association.c.followed_id.desc())
+    return (await session.execute(query.limit(limit))).all()
+
+
+async def select_following_ids(
+    session: AsyncSession, user_id: int,
+) -> Sequence[int]:
+    """
+    Select IDs of the users followed by a user.
+
+    Args:
+        session: Current database session.
+        user_id: ID of the follower.
+
+    Returns:
+        IDs of the followed users.
+    """
+    return (
+        await session.execute(
+            select(followers_association.c.followed_id).where(
+                followers_association.c.follower_id == user_id,
+            ),
+        )
+    ).scalars().all()
@@ -3,42 +3,73 @@
 
 from typing import List, Optional
 
-from sqlalchemy import select
+from sqlalchemy import ARRAY, Integer, any_, literal, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.api.db.models import Media, User
+from backend.api.db.models import Media, MediaBlob
 
 
 async def get_attachments_links_by_ids(
-    session: AsyncSession, attachments_ids: List[int],
+    session: AsyncSession, attachments_ids: List[int], uploader_id: int,
 ) -> List[str]:
     """
     Get links to images by their ID.
 
+    All attachments are fetched with one query; IDs that do not exist
+    or belong to another user are skipped.
+
     Args:
         session: Current database session.
         attachments_ids: List of IDs of attachments that are needed.
+        uploader_id: ID of the user who must own the attachments.
 
     Returns:
-        List of attachments links.
+        List of attachments links in the order of the requested IDs.
     """
-    attachments_links = []
-    for attachment_id in attachments_ids:
-        attachment = (
+    links = dict(
+        (
             await session.execute(
-                select(Media).where(Media.id == attachment_id),
+                select(Media.id, Media.link).where(
+                    Media.id == any_(
+                        literal(attachments_ids, ARRAY(Integer)),
+                    ),
+                    Media.uploader_id == uploader_id,
+                ),
             )
-        ).scalars().one_or_none()
-        if attachment:
-            attachments_links.append(attachment.link)
-    return attachments_links
+        ).all(),
+    )
+    return [
+        links[attachment_id]
+        for attachment_id in attachments_ids
+        if attachment_id in links
+    ]
+
+
+async def add_blob(
+    session: AsyncSession, sha256: str, size: int, content_type: str,
+) -> None:
+    """
+    Register stored content unless it is already known.
+
+    Args:
+        session: Current database session.
+        sha256: Hex digest of the content.
+        size: Size of the content in bytes.
+        content_type: Media type of the content.
+    """
+    await session.execute(
+        insert(MediaBlob).values(
+            sha256=sha256, size=size, content_type=content_type,
+        ).on_conflict_do_nothing(),
+    )
 
 
 async def add_media(
     file_name: Optional[str],
-    user: User,
-    scheme: str,
-    host: str,
+    uploader_id: int,
+    blob_sha256: str,
+    link: str,
     session: AsyncSession,
 ) -> int:
     """
@@ -46,9 +77,9 @@ async def add_media(
 
     Args:
         file_name: File name.
-        user: File uploader.
-        scheme: Server HTTP scheme.
-        host: Host of server.
+        uploader_id: ID of the file uploader.
+        blob_sha256: Digest of the stored content.
+        link: Link to the media.
         session: Current database session.
 
     Returns:
@@ -56,12 +87,9 @@ async def add_media(
     """
     new_media = Media(
         file_name=file_name,
-        uploader=user,
-        link='{0}://{1}/api/images/{2}'.format(
-            scheme,
-            host,
-            file_name,
-        ),
+        uploader_id=uploader_id,
+        blob_sha256=blob_sha256,
+        link=link,
     )
     session.add(new_media)
     await session.flush()
@@ -0,0 +1,114 @@
+"""
+Functions for the full-text search of tweets.
+
+Tweets are matched against the generated search_vector column through
+its GIN index and ordered by rank, most relevant first. Pages are cut by
+a (rank, id) cursor, so a page does not shift when tweets are added.
+The cursor filters after ranking, so every page still ranks and sorts
+all the matches of the query.
+"""
+
+
+from typing import NamedTuple, Optional, Sequence
+
+from sqlalchemy import Row, exists, func, literal_column, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.api.db.models import SEARCH_CONFIG, Tweet, User, likes_table
+
+CURSOR_SEPARATOR = '_'
+
+
+class SearchCursor(NamedTuple):
+    """
+    Position of the last tweet of a search page.
+
+    Attributes:
+        rank: Rank of the tweet.
+        tweet_id: ID of the tweet.
+    """
+
+    rank: float
+    tweet_id: int
+
+    @classmethod
+    def decode(cls, cursor: str) -> 'SearchCursor':
+        """
+        Read a cursor returned by encode.
+
+        Args:
+            cursor: Encoded cursor.
+
+        Returns:
+            The cursor.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        rank, _, tweet_id = cursor.rpartition(CURSOR_SEPARATOR)
+        return cls(float(rank), int(tweet_id))
+
+    def encode(self) -> str:
+        """
+        Write the cursor as an opaque string.
+
+        Returns:
+            The encoded cursor.
+        """
+        return '{0!r}{1}{2}'.format(self.rank, CURSOR_SEPARATOR, self.tweet_id)
+
+
+async def select_search_page(
+    session: AsyncSession,
+    user_id: int,
+    search_query: str,
+    limit: int,
+    after: Optional[SearchCursor] = None,
+) -> Sequence[Row]:
+    """
+    Select one page of tweets matching a search query, best match first.
+
+    Args:
+        session: Current database session.
+        user_id: ID of the user searching.
+        search_query: Query in the web search syntax: words, quoted
+         phrases, OR and -word.
+        limit: Maximum number of tweets in the page.
+        after: Return only tweets ranked after this cursor.
+
+    Returns:
+        Rows with tweet columns, author ID and name, whether the user
+        liked the tweet and the rank.
+    """
+    ts_query = func.websearch_to_tsquery(
+        literal_column("'{0}'::regconfig".format(SEARCH_CONFIG)),
+        search_query,
+    )
+    matches = select(
+        Tweet.id.label('tweet_id'),
+        func.ts_rank(Tweet.search_vector, ts_query).label('rank'),
+    ).where(Tweet.search_vector.bool_op('@@')(ts_query)).subquery()
+
+    liked_by_me = exists().where(
+        likes_table.c.tweet_id == Tweet.id,
+        likes_table.c.user_id == user_id,
+    ).label('liked_by_me')
+
+    query = select(
+        Tweet.id,
+        Tweet.content,
+        Tweet.attachments,
+        Tweet.like_count,
+        liked_by_me,
+        User.id.label('author_id'),
+        User.name.label('author_name'),
+        matches.c.rank,
+    ).join(matches, Tweet.id == matches.c.tweet_id).join(
+        User, User.id == Tweet.author_id,
+    )
+    if after is not None:
+        query = query.where(
+            tuple_(matches.c.rank, Tweet.id) < tuple_(*after),
+        )
+    query = query.order_by(matches.c.rank.desc(), Tweet.id.desc())
+    return (await session.execute(query.limit(limit))).all()
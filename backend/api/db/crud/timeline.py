@@ -0,0 +1,180 @@
+"""
+Functions for crud operations with home timelines.
+
+Tweets are pushed into the timelines table of the author and of every
+follower when they are created (fan-out-on-write), so reading a feed is
+one range scan over the reader's own timeline rows. Authors with more
+followers than the configured limit are not fanned out: their tweets are
+pulled from the tweets table when their followers read the feed.
+"""
+
+
+from typing import Optional, Sequence
+
+from sqlalchemy import Row, exists, literal, select, union, union_all
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.api.core.config import config
+from backend.api.db.models import (Tweet, User, followers_association,
+                                   likes_table, timelines_table)
+
+TIMELINE_COLUMNS = ('user_id', 'tweet_id', 'author_id')
+
+
+async def should_fan_out(session: AsyncSession, author_id: int) -> bool:
+    """
+    Check whether new tweets of the author are pushed to followers.
+
+    Args:
+        session: Current database session.
+        author_id: ID of the author of the tweet.
+
+    Returns:
+        True if the author has few enough followers for fan-out-on-write.
+    """
+    followers_count = (
+        await session.execute(
+            select(User.followers_count).where(User.id == author_id),
+        )
+    ).scalar_one()
+    return followers_count <= config.fanout_follower_limit
+
+
+async def push_tweet_to_timelines(
+    session: AsyncSession, tweet: Tweet,
+) -> None:
+    """
+    Add a new tweet to the timeline of its author and followers.
+
+    Args:
+        session: Current database session.
+        tweet: Newly created tweet.
+    """
+    recipients = select(
+        literal(tweet.author_id),
+        literal(tweet.id),
+        literal(tweet.author_id),
+    )
+    if tweet.fanned_out:
+        recipients = union_all(
+            recipients,
+            select(
+                followers_association.c.follower_id,
+                literal(tweet.id),
+                literal(tweet.author_id),
+            ).where(
+                followers_association.c.followed_id == tweet.author_id,
+            ),
+        )
+    await session.execute(
+        insert(timelines_table).from_select(
+            TIMELINE_COLUMNS, recipients,
+        ).on_conflict_do_nothing(),
+    )
+
+
+async def backfill_timeline(
+    session: AsyncSession, user_id: int, author_id: int,
+) -> None:
+    """
+    Copy recent tweets of a newly followed author into a user's timeline.
+
+    Args:
+        session: Current database session.
+        user_id: ID of the follower.
+        author_id: ID of the followed user.
+    """
+    recent_tweets = select(
+        literal(user_id), Tweet.id, Tweet.author_id,
+    ).where(
+        Tweet.author_id == author_id,
+        Tweet.fanned_out.is_(True),
+    ).order_by(Tweet.id.desc()).limit(config.timeline_backfill_size)
+    await session.execute(
+        insert(timelines_table).from_select(
+            TIMELINE_COLUMNS, recent_tweets,
+        ).on_conflict_do_nothing(),
+    )
+
+
+async def remove_author_from_timeline(
+    session: AsyncSession, user_id: int, author_id: int,
+) -> None:
+    """
+    Remove tweets of an unfollowed author from a user's timeline.
+
+    Args:
+        session: Current database session.
+        user_id: ID of the former follower.
+        author_id: ID of the unfollowed user.
+    """
+    if user_id == author_id:
+        return
+    await session.execute(
+        timelines_table.delete().where(
+            timelines_table.c.user_id == user_id,
+            timelines_table.c.author_id == author_id,
+        ),
+    )
+
+
+async def select_timeline_page(
+    session: AsyncSession,
+    user_id: int,
+    limit: int,
+    before_id: Optional[int] = None,
+) -> Sequence[Row]:
+    """
+    Select one page of a user's home timeline, newest first.
+
+    Merges the precomputed timeline rows with tweets of followed authors
+    that were not fanned out.
+
+    Args:
+        session: Current database session.
+        user_id: ID of the user whose timeline is read.
+        limit: Maximum number of tweets in the page.
+        before_id: Return only tweets with ID lower than this cursor.
+
+    Returns:
+        Rows with tweet columns, author ID and name and whether
+        the user liked the tweet.
+    """
+    pushed = select(timelines_table.c.tweet_id).where(
+        timelines_table.c.user_id == user_id,
+    )
+    pulled = select(Tweet.id).where(
+        Tweet.author_id.in_(
+            select(followers_association.c.followed_id).where(
+                followers_association.c.follower_id == user_id,
+            ),
+        ),
+        Tweet.fanned_out.is_(False),
+    )
+    if before_id is not None:
+        pushed = pushed.where(timelines_table.c.tweet_id < before_id)
+        pulled = pulled.where(Tweet.id < before_id)
+    page_ids = union(
+        pushed.order_by(timelines_table.c.tweet_id.desc()).limit(limit),
+        pulled.order_by(Tweet.id.desc()).limit(limit),
+    ).subquery()
+
+    liked_by_me = exists().where(
+        likes_table.c.tweet_id == Tweet.id,
+        likes_table.c.user_id == user_id,
+    ).label('liked_by_me')
+
+    query = select(
+        Tweet.id,
+        Tweet.content,
+        Tweet.attachments,
+        Tweet.like_count,
+        liked_by_me,
+        User.id.label('author_id'),
+        User.name.label('author_name'),
+    ).join(page_ids, Tweet.id == page_ids.c.tweet_id).join(
+        User, User.id == Tweet.author_id,
+    )
+    query = query.order_by(Tweet.id.desc()).limit(limit)
+    return (await session.execute(query)).all()
@@ -0,0 +1,102 @@
+"""
+Functions for crud operations with tweet tags and trends.
+
+Every use of a tag increments its counter in the bucket of the current
+minute, so trends are summed over the buckets of the window and reading
+them never touches the tweets. Minutes are taken from the database
+clock, which all workers share.
+"""
+
+
+from datetime import timedelta
+from typing import Sequence
+
+from sqlalchemy import Row, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.api.db.models import trend_buckets_table, tweet_tags_table
+
+BUCKET_UNIT = 'minute'
+
+
+async def add_tweet_tags(
+    session: AsyncSession, tweet_id: int, tags: Sequence[str],
+) -> None:
+    """
+    Store the tags of a new tweet and count them in the current bucket.
+
+    Args:
+        session: Current database session.
+        tweet_id: ID of the new tweet.
+        tags: Distinct tags of the tweet in sorted order, so concurrent
+         tweets lock the counters in the same order.
+    """
+    await session.execute(
+        insert(tweet_tags_table).values([
+            {'tweet_id': tweet_id, 'tag': tag} for tag in tags
+        ]),
+    )
+    bucket_start = func.date_trunc(BUCKET_UNIT, func.now())
+    counters = insert(trend_buckets_table).values([
+        {'bucket_start': bucket_start, 'tag': tag, 'tweets_count': 1}
+        for tag in tags
+    ])
+    await session.execute(
+        counters.on_conflict_do_update(
+            index_elements=[
+                trend_buckets_table.c.bucket_start,
+                trend_buckets_table.c.tag,
+            ],
+            set_={
+                'tweets_count': (
+                    trend_buckets_table.c.tweets_count +
+                    counters.excluded.tweets_count
+                ),
+            },
+        ),
+    )
+
+
+async def select_trends(
+    session: AsyncSession, window: int, limit: int,
+) -> Sequence[Row]:
+    """
+    Select the most used tags of the last minutes.
+
+    Args:
+        session: Current database session.
+        window: Number of minutes, including the current one.
+        limit: Maximum number of tags.
+
+    Returns:
+        Rows with the tag and its number of tweets, most used first.
+    """
+    tweets_count = func.sum(trend_buckets_table.c.tweets_count)
+    query = select(
+        trend_buckets_table.c.tag,
+        tweets_count.label('tweets_count'),
+    ).where(
+        trend_buckets_table.c.bucket_start > _window_start(window),
+    ).group_by(trend_buckets_table.c.tag)
+    query = query.order_by(tweets_count.desc(), trend_buckets_table.c.tag)
+    return (await session.execute(query.limit(limit))).all()
+
+
+async def prune_trend_buckets(session: AsyncSession, window: int) -> None:
+    """
+    Delete the buckets that left the trends window.
+
+    Args:
+        session: Current database session.
+        window: Number of minutes, including the current one.
+    """
+    await session.execute(
+        trend_buckets_table.delete().where(
+            trend_buckets_table.c.bucket_start <= _window_start(window),
+        ),
+    )
+
+
+def _window_start(window: int):
+    return func.date_trunc(BUCKET_UNIT, func.now()) - timedelta(minutes=window)
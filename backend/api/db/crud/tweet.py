@@ -3,11 +3,13 @@
 
 from typing import List, Optional, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import CTE, Row, exists, literal, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 
-from backend.api.db.models import Tweet, User
+from backend.api.db.crud.timeline import (push_tweet_to_timelines,
+                                          should_fan_out)
+from backend.api.db.models import Tweet, User, likes_table
 
 
 async def select_tweet_by_id(
@@ -24,42 +26,128 @@ async def select_tweet_by_id(
         Tweet obtained from database by ID, or None if not found.
     """
     return (
-        await session.execute(select(Tweet).where(
-            Tweet.id == tweet_id,
-            ),
-        )
+        await session.execute(select(Tweet).where(Tweet.id == tweet_id))
     ).unique().scalar_one_or_none()
 
 
-async def select_all_tweets(session: AsyncSession) -> Sequence[Tweet]:
+async def tweet_exists(session: AsyncSession, tweet_id: int) -> bool:
     """
-    Select all tweet objects in the database.
+    Check whether a tweet exists.
 
     Args:
         session: Current database session.
+        tweet_id: ID of the tweet.
 
     Returns:
-        List of tweets obtained from database.
+        True if the tweet exists.
     """
+    return (
+        await session.execute(select(exists().where(Tweet.id == tweet_id)))
+    ).scalar_one()
+
+
+async def add_like(
+    session: AsyncSession, tweet_id: int, user_id: int,
+) -> bool:
+    """
+    Like a tweet and increment its like counter.
+
+    Runs as one statement: the insert into the likes table is a CTE
+    the counter update reads from, so the cost does not depend on the
+    number of likes and the counter is changed only if a row is added.
+
+    Args:
+        session: Current database session.
+        tweet_id: ID of the tweet.
+        user_id: ID of the user who likes the tweet.
+
+    Returns:
+        True if the like was added, False if the tweet does not exist
+        or is already liked by the user.
+    """
+    liked_tweet = select(literal(user_id), Tweet.id).where(
+        Tweet.id == tweet_id,
+    )
+    inserted = insert(likes_table).from_select(
+        ('user_id', 'tweet_id'), liked_tweet,
+    ).on_conflict_do_nothing().returning(likes_table.c.tweet_id)
+    return await _update_like_count(session, inserted.cte('inserted_like'), 1)
+
+
+async def remove_like(
+    session: AsyncSession, tweet_id: int, user_id: int,
+) -> bool:
+    """
+    Remove a like from a tweet and decrement its like counter.
+
+    Args:
+        session: Current database session.
+        tweet_id: ID of the tweet.
+        user_id: ID of the user who liked the tweet.
+
+    Returns:
+        True if the like was removed, False if there was no such like.
+    """
+    deleted = likes_table.delete().where(
+        likes_table.c.tweet_id == tweet_id,
+        likes_table.c.user_id == user_id,
+    ).returning(likes_table.c.tweet_id)
+    return await _update_like_count(session, deleted.cte('deleted_like'), -1)
+
+
+async def _update_like_count(
+    session: AsyncSession, changed_likes: CTE, delta: int,
+) -> bool:
+    counted = update(Tweet).where(
+        Tweet.id.in_(select(changed_likes.c.tweet_id)),
+    ).values(like_count=Tweet.like_count + delta).returning(Tweet.id)
     return (
         await session.execute(
-            select(Tweet).order_by(Tweet.id).options(
-                joinedload(Tweet.author),
-            ),
+            counted.execution_options(synchronize_session=False),
         )
-    ).unique().scalars().all()
+    ).first() is not None
+
+
+async def select_likers_page(
+    session: AsyncSession,
+    tweet_id: int,
+    limit: int,
+    before_id: Optional[int] = None,
+) -> Sequence[Row]:
+    """
+    Select one page of users who liked a tweet, ordered by user ID.
+
+    Args:
+        session: Current database session.
+        tweet_id: ID of the liked tweet.
+        limit: Maximum number of users in the page.
+        before_id: Return only users with ID lower than this cursor.
+
+    Returns:
+        Rows with ID and name of the users.
+    """
+    query = select(User.id, User.name).join(
+        likes_table, likes_table.c.user_id == User.id,
+    ).where(likes_table.c.tweet_id == tweet_id)
+    if before_id is not None:
+        query = query.where(User.id < before_id)
+    query = query.order_by(User.id.desc()).limit(limit)
+    return (await session.execute(query)).all()
 
 
 async def add_tweet(
-    tweet_data: str, attachments: List[int], user: User, session: AsyncSession,
+    tweet_data: str,
+    attachments: List[str],
+    author_id: int,
+    session: AsyncSession,
 ) -> int:
     """
-    Add a tweet to the database.
+    Add a tweet to the database and to the home timelines.
 
     Args:
         tweet_data: Tweet text data.
         attachments: List of links to the tweet's attachments.
-        user: The author of the tweet.
+        author_id: ID of the author of the tweet.
         session: Current database session.
 
     Returns:
@@ -68,8 +156,10 @@ async def add_tweet(
     new_tweet = Tweet(
         content=tweet_data,
         attachments=attachments,
-        author=user,
+        author_id=author_id,
+        fanned_out=await should_fan_out(session, author_id),
     )
     session.add(new_tweet)
     await session.flush()
+    await push_tweet_to_timelines(session, new_tweet)
     return new_tweet.id
@@ -3,94 +3,93 @@
 
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import Row, exists, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 
-from backend.api.db.models import User
+from backend.api.db.models import User, followers_association
 
 
-async def select_user_by_key(
-    session: AsyncSession, key: str, show_detail_info: bool = False,
-) -> Optional[User]:
+async def select_user_profile(
+    session: AsyncSession, user_id: int, viewer_id: int,
+) -> Optional[Row]:
     """
-    Select user object by key.
+    Select the profile of a user.
+
+    The numbers of followers and followed users are read from the
+    counters of the user, so the cost does not depend on them.
 
     Args:
         session: Current database session.
-        key: API key for obtaining user from database.
-        show_detail_info: Show or not show detailed info.
+        user_id: ID of the user.
+        viewer_id: ID of the user viewing the profile.
 
     Returns:
-        User obtained from database by key, or None if not found
+        Row with ID, name and follower counters of the user and whether
+        the viewer follows the user, or None if not found.
     """
-    if show_detail_info:
-        query = (
-            await session.execute(
-                select(User).where(User.key == key).options(
-                    joinedload(User.followers),
-                    joinedload(User.following),
-                ),
-            )
-        ).unique().scalar_one_or_none()
-
-    else:
-        query = (
-            await session.execute(select(User).where(
-                User.key == key,
-                ),
-            )
-        ).unique().scalar_one_or_none()
-    return query
-
-
-async def select_user_by_id(
-    session: AsyncSession, user_id: int, show_detail_info: bool = False,
-) -> Optional[User]:
+    followed_by_me = exists().where(
+        followers_association.c.follower_id == viewer_id,
+        followers_association.c.followed_id == User.id,
+    ).label('followed_by_me')
+    return (
+        await session.execute(
+            select(
+                User.id,
+                User.name,
+                User.followers_count,
+                User.following_count,
+                followed_by_me,
+            ).where(User.id == user_id),
+        )
+    ).one_or_none()
+
+
+async def user_exists(session: AsyncSession, user_id: int) -> bool:
     """
-    Select user object by ID.
+    Check whether a user exists.
 
     Args:
         session: Current database session.
-        user_id: ID for obtaining user from database
-        show_detail_info: Show or not show detailed info.
+        user_id: ID of the user.
 
     Returns:
-        User obtained from database by ID, or None if not found
+        True if the user exists.
     """
-    if show_detail_info:
-        query = (
-            await session.execute(
-                select(User).where(
-                    User.id == user_id,
-                ).options(
-                    joinedload(User.followers),
-                    joinedload(User.following),
-                ),
-            )
-        ).unique().scalar_one_or_none()
-    else:
-        query = (
-            await session.execute(select(User).where(User.id == user_id))
-        ).unique().scalar_one_or_none()
-    return query
-
-
-async def add_user(
-    user_key: str, user_name: str, session: AsyncSession,
-) -> User:
+    return (
+        await session.execute(select(exists().where(User.id == user_id)))
+    ).scalar_one()
+
+
+async def get_or_create_user(
+    session: AsyncSession, user_key: str, user_name: str,
+) -> Row:
     """
-    Add user to the database.
+    Get the user by key, adding it to the database if it does not exist.
+
+    Runs as one INSERT ... ON CONFLICT DO NOTHING statement that also
+    selects the existing row, so concurrent first requests with the same
+    key do not violate the unique constraint.
 
     Args:
-        user_key: API key of user.
-        user_name: Username.
         session: Current database session.
+        user_key: API key of user.
+        user_name: Username used if the user is created.
 
     Returns:
-        New user object.
+        Row with ID and name of the user.
     """
-    new_user = User(key=user_key, name=user_name)
-    session.add(new_user)
-    await session.flush()
-    return new_user
+    inserted = insert(User).values(key=user_key, name=user_name)
+    inserted = inserted.on_conflict_do_nothing(index_elements=[User.key])
+    inserted = inserted.returning(User.id, User.name).cte('inserted_user')
+    existing = select(User.id, User.name).where(User.key == user_key)
+    user = (
+        await session.execute(
+            select(inserted.c.id, inserted.c.name).union_all(existing),
+        )
+    ).first()
+    if user is None:
+        # The row was inserted by a concurrent transaction that committed
+        # after this statement took its snapshot.
+        user = (await session.execute(existing)).one()
+    return user
@@ -0,0 +1,336 @@
+"""
+A module contains versioned migrations of the database schema.
+
+An empty database gets the current schema from the models and is stamped
+with every known version. A database created before the migrations
+existed has no version table: it is upgraded from the baseline schema by
+applying every migration in order. Migrations run in the startup
+transaction under an advisory lock, so workers starting together apply
+each of them once.
+
+Attributes:
+    MIGRATION_LOCK_ID: Key of the advisory lock held while migrating.
+    migrations_metadata: Metadata of the migration bookkeeping tables.
+    schema_versions_table: Table with the applied migration versions.
+    MIGRATIONS: Migrations in the order they are applied.
+    logger (Logger): A logger with an error level required to
+     display current information about the operation of functions.
+"""
+
+
+import logging
+from typing import NamedTuple, Tuple
+
+from sqlalchemy import (Column, DateTime, Integer, MetaData, String, Table,
+                        inspect)
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import func, select
+
+from backend.api.db.db_service import check_tables
+
+MIGRATION_LOCK_ID = 5381203
+
+migrations_metadata = MetaData()
+
+schema_versions_table: Table = Table(
+    'schema_versions',
+    migrations_metadata,
+    Column('version', Integer, primary_key=True, autoincrement=False),
+    Column('description', String, nullable=False),
+    Column(
+        'applied_at',
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    ),
+)
+
+
+class Migration(NamedTuple):
+    """
+    A schema migration.
+
+    Attributes:
+        version: Sequential number of the migration.
+        description: Short description of the change.
+        statements: SQL statements applied in order.
+    """
+
+    version: int
+    description: str
+    statements: Tuple[str, ...]
+
+
+MIGRATIONS: Tuple[Migration, ...] = (
+    Migration(
+        version=1,
+        description='Timelines, like counters and content-addressed media',
+        statements=(
+            """
+            ALTER TABLE likes DROP CONSTRAINT IF EXISTS likes_tweet_id_fkey
+            """,
+            """
+            ALTER TABLE likes ADD CONSTRAINT likes_tweet_id_fkey
+            FOREIGN KEY (tweet_id) REFERENCES tweets (id) ON DELETE CASCADE
+            """,
+            """
+            ALTER TABLE tweets
+            ADD COLUMN IF NOT EXISTS like_count INTEGER NOT NULL DEFAULT 0,
+            ADD COLUMN IF NOT EXISTS fanned_out BOOLEAN NOT NULL DEFAULT true
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS ix_tweets_author_id_id_pulled
+            ON tweets (author_id, id) WHERE fanned_out IS false
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS timelines (
+                user_id INTEGER NOT NULL
+                    REFERENCES users (id) ON DELETE CASCADE,
+                tweet_id INTEGER NOT NULL
+                    REFERENCES tweets (id) ON DELETE CASCADE,
+                author_id INTEGER NOT NULL,
+                PRIMARY KEY (user_id, tweet_id)
+            )
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS ix_timelines_user_id_author_id
+            ON timelines (user_id, author_id)
+            """,
+            """
+            INSERT INTO timelines (user_id, tweet_id, author_id)
+            SELECT author_id, id, author_id FROM tweets
+            WHERE author_id IS NOT NULL
+            UNION ALL
+            SELECT followers.follower_id, tweets.id, tweets.author_id
+            FROM tweets
+            JOIN followers ON followers.followed_id = tweets.author_id
+            WHERE followers.follower_id IS NOT NULL
+            ON CONFLICT DO NOTHING
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS media_blobs (
+                sha256 VARCHAR(64) PRIMARY KEY,
+                size INTEGER NOT NULL,
+                content_type VARCHAR NOT NULL
+            )
+            """,
+            """
+            ALTER TABLE media ADD COLUMN IF NOT EXISTS blob_sha256
+            VARCHAR(64) REFERENCES media_blobs (sha256)
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS ix_media_file_name
+            ON media (file_name)
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS ix_media_blob_sha256
+            ON media (blob_sha256)
+            """,
+        ),
+    ),
+    Migration(
+        version=2,
+        description='Keys of association tables and foreign key indexes',
+        statements=(
+            """
+            DELETE FROM followers
+            WHERE follower_id IS NULL OR followed_id IS NULL
+            """,
+            """
+            DELETE FROM followers AS duplicate USING followers AS kept
+            WHERE duplicate.ctid > kept.ctid
+            AND duplicate.follower_id = kept.follower_id
+            AND duplicate.followed_id = kept.followed_id
+            """,
+            """
+            ALTER TABLE followers DROP CONSTRAINT IF EXISTS followers_pkey
+            """,
+            """
+            ALTER TABLE followers ADD CONSTRAINT followers_pkey
+            PRIMARY KEY (follower_id, followed_id)
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS ix_followers_followed_id_follower_id
+            ON followers (followed_id, follower_id)
+            """,
+            """
+            DELETE FROM likes WHERE user_id IS NULL OR tweet_id IS NULL
+            """,
+            """
+            DELETE FROM likes AS duplicate USING likes AS kept
+            WHERE duplicate.ctid > kept.ctid
+            AND duplicate.user_id = kept.user_id
+            AND duplicate.tweet_id = kept.tweet_id
+            """,
+            """
+            ALTER TABLE likes DROP CONSTRAINT IF EXISTS likes_pkey
+            """,
+            """
+            ALTER TABLE likes ADD CONSTRAINT likes_pkey
+            PRIMARY KEY (user_id, tweet_id)
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS ix_likes_tweet_id_user_id
+            ON likes (tweet_id, user_id)
+            """,
+            """
+            UPDATE tweets SET like_count = (
+                SELECT count(*) FROM likes WHERE likes.tweet_id = tweets.id
+            )
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS ix_tweets_author_id_id
+            ON tweets (author_id, id)
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS ix_media_uploader_id
+            ON media (uploader_id)
+            """,
+        ),
+    ),
+    Migration(
+        version=3,
+        description='Full-text search of tweets',
+        statements=(
+            """
+            ALTER TABLE tweets ADD COLUMN IF NOT EXISTS search_vector
+            tsvector GENERATED ALWAYS AS
+            (to_tsvector('simple', content)) STORED
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS ix_tweets_search_vector
+            ON tweets USING gin (search_vector)
+            """,
+        ),
+    ),
+    Migration(
+        version=4,
+        description='Tweet tags and trend counters',
+        statements=(
+            """
+            CREATE TABLE IF NOT EXISTS tweet_tags (
+                tweet_id INTEGER NOT NULL
+                    REFERENCES tweets (id) ON DELETE CASCADE,
+                tag VARCHAR(100) NOT NULL,
+                PRIMARY KEY (tweet_id, tag)
+            )
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS ix_tweet_tags_tag_tweet_id
+            ON tweet_tags (tag, tweet_id)
+            """,
+            r"""
+            INSERT INTO tweet_tags (tweet_id, tag)
+            SELECT DISTINCT tweets.id, left(lower(found.match[1]), 100)
+            FROM tweets
+            CROSS JOIN LATERAL regexp_matches(
+                tweets.content, '(?:^|[^\w#@])([#@]\w+)', 'g'
+            ) AS found (match)
+            ON CONFLICT DO NOTHING
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS trend_buckets (
+                bucket_start TIMESTAMP WITH TIME ZONE NOT NULL,
+                tag VARCHAR(100) NOT NULL,
+                tweets_count INTEGER NOT NULL,
+                PRIMARY KEY (bucket_start, tag)
+            )
+            """,
+        ),
+    ),
+    Migration(
+        version=5,
+        description='Follower counters of users',
+        statements=(
+            """
+            ALTER TABLE users
+            ADD COLUMN IF NOT EXISTS followers_count INTEGER NOT NULL
+                DEFAULT 0,
+            ADD COLUMN IF NOT EXISTS following_count INTEGER NOT NULL
+                DEFAULT 0
+            """,
+            """
+            UPDATE users SET
+                followers_count = (
+                    SELECT count(*) FROM followers
+                    WHERE followers.followed_id = users.id
+                ),
+                following_count = (
+                    SELECT count(*) FROM followers
+                    WHERE followers.follower_id = users.id
+                )
+            """,
+        ),
+    ),
+    Migration(
+        version=6,
+        description='Drop the unused index of uploaded file names',
+        statements=(
+            'DROP INDEX IF EXISTS ix_media_file_name',
+        ),
+    ),
+)
+
+logger = logging.getLogger('uvicorn.error')
+
+
+def upgrade_schema(connection: Connection, metadata: MetaData) -> None:
+    """
+    Bring the database schema up to date.
+
+    Args:
+        connection: Synchronous connection in the startup transaction.
+        metadata: Metadata of the current models.
+    """
+    connection.execute(select(func.pg_advisory_xact_lock(MIGRATION_LOCK_ID)))
+    if not inspect(connection).has_table(schema_versions_table.name):
+        is_empty = not check_tables(connection)
+        migrations_metadata.create_all(connection)
+        if is_empty:
+            metadata.create_all(connection)
+            stamp_versions(connection, MIGRATIONS)
+            return
+    applied_versions = set(
+        connection.execute(select(schema_versions_table.c.version)).scalars(),
+    )
+    for migration in MIGRATIONS:
+        if migration.version not in applied_versions:
+            apply_migration(connection, migration)
+
+
+def apply_migration(connection: Connection, migration: Migration) -> None:
+    """
+    Apply a migration and record its version.
+
+    Args:
+        connection: Synchronous connection in the startup transaction.
+        migration: Migration to apply.
+    """
+    for statement in migration.statements:
+        connection.exec_driver_sql(statement)
+    stamp_versions(connection, (migration,))
+    logger.info('Applied migration {0}: {1}'.format(
+        migration.version, migration.description,
+    ))
+
+
+def stamp_versions(
+    connection: Connection, migrations: Tuple[Migration, ...],
+) -> None:
+    """
+    Record migrations as applied.
+
+    Args:
+        connection: Synchronous connection in the startup transaction.
+        migrations: Applied migrations.
+    """
+    connection.execute(
+        schema_versions_table.insert(),
+        [
+            {
+                'version': migration.version,
+                'description': migration.description,
+            }
+            for migration in migrations
+        ],
+    )
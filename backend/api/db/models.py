@@ -4,21 +4,32 @@ A module contains ORM models.
 Attributes:
     followers_association: Table for followers/following relationship.
     likes_table: Table for likes relationship.
+    timelines_table: Table with precomputed home timelines.
+    tweet_tags_table: Table with hashtags and mentions of tweets.
+    trend_buckets_table: Table with per-minute counts of tag uses.
 """
 
 
-from typing import List
-
-from sqlalchemy import ARRAY, Column, ForeignKey, Integer, String, Table
-from sqlalchemy.orm import Mapped, Relationship, relationship
+from sqlalchemy import (ARRAY, Boolean, Column, ForeignKey, Index, Integer,
+                        String, Table)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import (Mapped, Relationship, backref, deferred,
+                            relationship)
+from sqlalchemy.schema import Computed
+from sqlalchemy.types import DateTime
 
 from backend.api.core.base import Base
 
 USER_ID_FIELD = 'users.id'
+TWEET_ID_FIELD = 'tweets.id'
 USER_MODEL_NAME = 'User'
+CASCADE = 'CASCADE'
 
 MAX_NAME_LENGTH = 25
 MAX_CONTENT_LENGTH = 500
+SHA256_HEX_LENGTH = 64
+SEARCH_CONFIG = 'simple'
+MAX_TAG_LENGTH = 100
 
 followers_association: Table = Table(
     'followers',
@@ -27,13 +38,20 @@ followers_association: Table = Table(
         'follower_id',
         Integer,
         ForeignKey(USER_ID_FIELD),
+        primary_key=True,
     ),
     Column(
         'followed_id',
         Integer,
         ForeignKey(USER_ID_FIELD),
+        primary_key=True,
     ),
 )
+Index(
+    'ix_followers_followed_id_follower_id',
+    followers_association.c.followed_id,
+    followers_association.c.follower_id,
+)
 
 likes_table: Table = Table(
     'likes',
@@ -42,12 +60,67 @@ likes_table: Table = Table(
         'user_id',
         Integer,
         ForeignKey(USER_ID_FIELD),
+        primary_key=True,
+    ),
+    Column(
+        'tweet_id',
+        Integer,
+        ForeignKey(TWEET_ID_FIELD, ondelete=CASCADE),
+        primary_key=True,
+    ),
+)
+Index(
+    'ix_likes_tweet_id_user_id',
+    likes_table.c.tweet_id,
+    likes_table.c.user_id,
+)
+
+timelines_table: Table = Table(
+    'timelines',
+    Base.metadata,
+    Column(
+        'user_id',
+        Integer,
+        ForeignKey(USER_ID_FIELD, ondelete=CASCADE),
+        primary_key=True,
     ),
     Column(
         'tweet_id',
         Integer,
-        ForeignKey('tweets.id'),
+        ForeignKey(TWEET_ID_FIELD, ondelete=CASCADE),
+        primary_key=True,
     ),
+    Column('author_id', Integer, nullable=False),
+)
+Index(
+    'ix_timelines_user_id_author_id',
+    timelines_table.c.user_id,
+    timelines_table.c.author_id,
+)
+
+tweet_tags_table: Table = Table(
+    'tweet_tags',
+    Base.metadata,
+    Column(
+        'tweet_id',
+        Integer,
+        ForeignKey(TWEET_ID_FIELD, ondelete=CASCADE),
+        primary_key=True,
+    ),
+    Column('tag', String(MAX_TAG_LENGTH), primary_key=True),
+)
+Index(
+    'ix_tweet_tags_tag_tweet_id',
+    tweet_tags_table.c.tag,
+    tweet_tags_table.c.tweet_id,
+)
+
+trend_buckets_table: Table = Table(
+    'trend_buckets',
+    Base.metadata,
+    Column('bucket_start', DateTime(timezone=True), primary_key=True),
+    Column('tag', String(MAX_TAG_LENGTH), primary_key=True),
+    Column('tweets_count', Integer, nullable=False),
 )
 
 
@@ -60,7 +133,11 @@ class User(Base):
         id: User ID column.
         key: User key column.
         name: Username column.
-        followers: User followers relationship.
+        followers: User followers relationship, never loaded implicitly.
+        followers_count: Number of followers, updated together with
+         the followers table.
+        following_count: Number of followed users, updated together
+         with the followers table.
     """
 
     __tablename__: str = 'users'
@@ -81,49 +158,21 @@ class User(Base):
         secondary=followers_association,
         primaryjoin=id == followers_association.c.followed_id,
         secondaryjoin=id == followers_association.c.follower_id,
-        backref='following',
-        lazy='joined',
+        backref=backref('following', lazy='raise'),
+        lazy='raise',
+    )
+    followers_count: Mapped[Column[Integer]] = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default='0',
+    )
+    following_count: Mapped[Column[Integer]] = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default='0',
     )
-
-    async def to_dict(self) -> dict:
-        """
-        Format a user object into a dictionary.
-
-        Returns:
-            User detail info in dict format.
-        """
-        followers: List[dict] = [
-            await follower.alt_to_repr()
-            for follower in self.followers
-        ] if self.followers else []
-        following: List[dict] = [
-            await following.alt_to_repr()
-            for following in self.following
-        ] if self.following else []
-        return {
-            'id': self.id,
-            'name': self.name,
-            'followers': followers,
-            'following': following,
-        }
-
-    async def to_repr(self) -> dict:
-        """
-        Format a user object into a dictionary for repr.
-
-        Returns:
-            User brief info.
-        """
-        return {'user_id': self.id, 'name': self.name}
-
-    async def alt_to_repr(self) -> dict:
-        """
-        Alternative format a user object into a dictionary for repr.
-
-        Returns:
-            User brief info.
-        """
-        return {'id': self.id, 'name': self.name}
 
 
 class Tweet(Base):
@@ -137,7 +186,12 @@ class Tweet(Base):
         attachments: Array of tweet attachments links column.
         author_id: Author of the tweet ID.
         author: User table relationship; foreign key is author_id.
-        likes: Users who liked relationship
+        likes: Users who liked relationship, never loaded implicitly.
+        like_count: Number of likes, updated together with likes.
+        fanned_out: Whether the tweet was pushed to the followers timelines
+         or has to be pulled when they read the feed.
+        search_vector: Lexemes of the content for full-text search,
+         generated by the database and never loaded implicitly.
 
     """
 
@@ -165,28 +219,63 @@ class Tweet(Base):
     likes = relationship(
         USER_MODEL_NAME,
         secondary=likes_table,
-        lazy='joined',
+        lazy='raise',
+        passive_deletes=True,
+    )
+    like_count: Mapped[Column[Integer]] = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default='0',
     )
+    fanned_out: Mapped[Column[Boolean]] = Column(
+        Boolean,
+        nullable=False,
+        default=True,
+        server_default='true',
+    )
+    search_vector: Mapped[Column[TSVECTOR]] = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('{0}', content)".format(SEARCH_CONFIG),
+            persisted=True,
+        ),
+    ))
+
+
+Index('ix_tweets_author_id_id', Tweet.author_id, Tweet.id)
+Index(
+    'ix_tweets_search_vector',
+    Tweet.search_vector,
+    postgresql_using='gin',
+)
+Index(
+    'ix_tweets_author_id_id_pulled',
+    Tweet.author_id,
+    Tweet.id,
+    postgresql_where=Tweet.fanned_out.is_(False),
+)
+
+
+class MediaBlob(Base):
+    """
+    Stored media content, addressed by its SHA-256 digest.
 
-    async def to_dict(self) -> dict:
-        """
-        Format a tweet object into a dictionary.
+    Attributes:
+        __tablename__: Table name.
+        sha256: Hex digest of the content.
+        size: Size of the content in bytes.
+        content_type: Media type of the content.
+    """
 
-        Returns:
-            Tweet detail info in dict format.
-        """
-        author: dict = await self.author.alt_to_repr() if self.author else None
-        likes: List[dict] = [
-            await like.to_repr()
-            for like in self.likes
-        ] if self.likes else []
-        return {
-            'id': self.id,
-            'content': self.content,
-            'attachments': self.attachments,
-            'author': author,
-            'likes': likes,
-        }
+    __tablename__: str = 'media_blobs'
+
+    sha256: Mapped[Column[String]] = Column(
+        String(SHA256_HEX_LENGTH),
+        primary_key=True,
+    )
+    size: Mapped[Column[Integer]] = Column(Integer, nullable=False)
+    content_type: Mapped[Column[String]] = Column(String, nullable=False)
 
 
 class Media(Base):
@@ -198,8 +287,10 @@ class Media(Base):
         id: Media ID column.
         uploader_id: Media uploader ID column.
         uploader: User table relationship.
-        file_name: File name.
+        file_name: File name given by the uploader.
         link: Link to media in backend.
+        blob_sha256: Digest of the stored content, None for files
+         uploaded before content addressing.
     """
 
     __tablename__: str = 'media'
@@ -212,7 +303,13 @@ class Media(Base):
     uploader_id: Mapped[Column[Integer]] = Column(
         Integer,
         ForeignKey('users.id'),
+        index=True,
     )
     uploader: Mapped[Relationship] = relationship('User')
     file_name: Mapped[Column[String]] = Column(String, nullable=False)
     link: Mapped[Column[String]] = Column(String, nullable=False)
+    blob_sha256: Mapped[Column[String]] = Column(
+        String(SHA256_HEX_LENGTH),
+        ForeignKey('media_blobs.sha256'),
+        index=True,
+    )
@@ -0,0 +1,57 @@
+"""
+A module contains routes for real-time event requests.
+
+Attributes:
+    router: FastAPI API router.
+    STREAM_HEADERS: Headers keeping proxies from caching or buffering
+     the events stream.
+"""
+
+
+from types import MappingProxyType
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.api.app_service.events import event_hub, event_stream
+from backend.api.app_service.service_functions import (CurrentUser,
+                                                       get_current_user,
+                                                       get_read_session)
+from backend.api.db.crud.follow import select_following_ids
+
+STREAM_HEADERS = MappingProxyType({
+    'cache-control': 'no-cache',
+    'x-accel-buffering': 'no',
+})
+
+router: APIRouter = APIRouter()
+
+
+@router.get('/api/events', response_class=StreamingResponse)
+async def stream_events(
+    curr_user: CurrentUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_session),
+):
+    """
+    Stream new tweets, likes and followers as Server-Sent Events.
+
+    Events are tweets of the current user and of the followed users,
+    likes of tweets of the current user and new followers. The data of
+    a tweet event has the TweetSchema format.
+
+    Args:
+        curr_user: Current user.
+        session: Current database session.
+
+    Returns:
+        An endless text/event-stream response.
+    """
+    async with session.begin():
+        following = await select_following_ids(session, curr_user.id)
+
+    return StreamingResponse(
+        event_stream(event_hub, curr_user.id, following),
+        media_type='text/event-stream',
+        headers=STREAM_HEADERS,
+    )
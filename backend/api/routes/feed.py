@@ -0,0 +1,104 @@
+"""
+A module contains routes for pages of tweets and likes.
+
+Attributes:
+    router: FastAPI API router.
+"""
+
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.api.app_service.json_response import FastJSONResponse
+from backend.api.app_service.schemas.pages import (LikesResponse,
+                                                   TweetsResponse,
+                                                   split_page)
+from backend.api.app_service.schemas.serializers import (liker_brief,
+                                                         tweet_to_dict)
+from backend.api.app_service.service_functions import (CurrentUser,
+                                                       get_current_user,
+                                                       get_read_session)
+from backend.api.core.config import config
+from backend.api.db.crud.timeline import select_timeline_page
+from backend.api.db.crud.tweet import select_likers_page, tweet_exists
+
+router: APIRouter = APIRouter()
+
+
+@router.get('/api/tweets', response_model=TweetsResponse)
+async def get_all_tweets(
+    limit: int = Query(
+        config.feed_page_size, ge=1, le=config.max_feed_page_size,
+    ),
+    before_id: Optional[int] = Query(None, ge=1),
+    curr_user: CurrentUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_session),
+):
+    """
+    Get the home feed: tweets of the followed users and own tweets.
+
+    Args:
+        limit: Maximum number of tweets in the page.
+        before_id: Cursor returned as next_cursor by the previous page.
+        curr_user: Current user.
+        session: Current database session.
+
+    Returns:
+        Result with a boolean value, a page of tweets and the next cursor.
+    """
+    rows, has_next = split_page(
+        await select_timeline_page(
+            session, curr_user.id, limit + 1, before_id,
+        ),
+        limit,
+    )
+    return FastJSONResponse({
+        'result': True,
+        'tweets': [tweet_to_dict(row) for row in rows],
+        'next_cursor': rows[-1].id if has_next else None,
+    })
+
+
+@router.get('/api/tweets/{tweet_id}/likes', response_model=LikesResponse)
+async def get_tweet_likes(
+    tweet_id: int,
+    limit: int = Query(
+        config.feed_page_size, ge=1, le=config.max_feed_page_size,
+    ),
+    before_id: Optional[int] = Query(None, ge=1),
+    curr_user: CurrentUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_session),
+):
+    """
+    Get users who liked a tweet.
+
+    Args:
+        tweet_id: ID of the liked tweet.
+        limit: Maximum number of users in the page.
+        before_id: Cursor returned as next_cursor by the previous page.
+        curr_user: Current user.
+        session: Current database session.
+
+    Returns:
+        Result with a boolean value, a page of users and the next cursor.
+
+    Raises:
+        HTTPException: If tweet not found.
+    """
+    likers, has_next = split_page(
+        await select_likers_page(session, tweet_id, limit + 1, before_id),
+        limit,
+    )
+    if not likers and not await tweet_exists(session, tweet_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='Tweet not found.',
+        )
+
+    return FastJSONResponse({
+        'result': True,
+        'likes': [liker_brief(liker) for liker in likers],
+        'next_cursor': likers[-1].id if has_next else None,
+    })
@@ -0,0 +1,106 @@
+"""
+A module contains routes for follow requests.
+
+Attributes:
+    router: FastAPI API router.
+"""
+
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.api.app_service.schemas.responses import Response
+from backend.api.app_service.service_functions import (CurrentUser,
+                                                       get_current_user,
+                                                       get_write_session)
+from backend.api.db.crud.event import publish_follow, publish_unfollow
+from backend.api.db.crud.follow import (add_follower, remove_follower,
+                                        update_follow_counts)
+from backend.api.db.crud.timeline import (backfill_timeline,
+                                          remove_author_from_timeline)
+from backend.api.db.crud.user import user_exists
+
+router = APIRouter()
+
+
+@router.post('/api/users/{user_id}/follow', response_model=Response)
+async def follow_user(
+        user_id: int,
+        curr_user: CurrentUser = Depends(get_current_user),
+        session: AsyncSession = Depends(get_write_session),
+):
+    """
+    Follow a user.
+
+    The follow is one insert into the followers table, whatever the
+    number of followers of the user. It is published to the events
+    streams of the followed user. The counters are updated last, so the
+    row of the followed user is locked only until the commit.
+
+    Args:
+        user_id: ID of the user to follow.
+        curr_user: Current user.
+        session: Current database session.
+
+    Returns:
+        Result with a boolean value
+
+    Raises:
+        HTTPException: If the user is not found or is already followed.
+
+    """
+    async with session.begin():
+        if not await add_follower(session, curr_user.id, user_id):
+            if not await user_exists(session, user_id):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail='User to follow not found',
+                )
+            raise HTTPException(
+                status_code=status.HTTP_405_METHOD_NOT_ALLOWED,
+                detail='Already following this user',
+            )
+        await backfill_timeline(session, curr_user.id, user_id)
+        await publish_follow(session, curr_user, user_id)
+        await update_follow_counts(session, curr_user.id, user_id, 1)
+
+    return Response(result=True)
+
+
+@router.delete('/api/users/{user_id}/follow', response_model=Response)
+async def unfollow_user(
+        user_id: int,
+        curr_user: CurrentUser = Depends(get_current_user),
+        session: AsyncSession = Depends(get_write_session),
+):
+    """
+    Unfollow a user.
+
+    Args:
+        user_id: ID of the user to unfollow.
+        curr_user: Current user.
+        session: Current database session.
+
+    Returns:
+        Result with a boolean value.
+
+    Raises:
+        HTTPException: If the user you want to stop following
+        has not been found or is not yet subscribed.
+    """
+    async with session.begin():
+        if not await remove_follower(session, curr_user.id, user_id):
+            if not await user_exists(session, user_id):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail='User to unfollow not found.',
+                )
+            raise HTTPException(
+                status_code=status.HTTP_405_METHOD_NOT_ALLOWED,
+                detail='Not following this user.',
+            )
+        await remove_author_from_timeline(session, curr_user.id, user_id)
+        await publish_unfollow(session, curr_user.id, user_id)
+        await update_follow_counts(session, curr_user.id, user_id, -1)
+
+    return Response(result=True)
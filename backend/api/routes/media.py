@@ -6,88 +6,117 @@ Attributes:
 """
 
 
-import os
 from pathlib import Path
+from typing import Optional
 
-from aiofiles import open as async_open
-from fastapi import APIRouter, Depends, Request, UploadFile
-from fastapi.responses import FileResponse
+from fastapi import (APIRouter, BackgroundTasks, Depends, Query, Request,
+                     Response, UploadFile)
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.api.app_service.blob_store import (blob_name,
+                                                resolve_file_path,
+                                                store_upload)
+from backend.api.app_service.image_responses import (cached_image_response,
+                                                     content_etag,
+                                                     image_response)
+from backend.api.app_service.image_variants import variant_pool
+from backend.api.app_service.media_storage import discard_upload, stage_upload
 from backend.api.app_service.schemas.responses import (AddMediaResponse,
                                                        ErrorResponse)
-from backend.api.app_service.service_functions import (generate_random_string,
-                                                       get_api_key)
-from backend.api.core.base import get_session
-from backend.api.db.crud.media import add_media
-from backend.api.db.crud.user import add_user, select_user_by_key
+from backend.api.app_service.service_functions import (CurrentUser,
+                                                       get_current_user,
+                                                       get_write_session)
+from backend.api.db.crud.media import add_blob, add_media
 
 router: APIRouter = APIRouter()
 
 
 @router.get('/api/images/{file_name}')
-async def get_image(file_name: str) -> FileResponse:
+async def get_image(
+    request: Request,
+    file_name: str,
+    size: Optional[int] = Query(None, ge=1),
+) -> Response:
     """
     Get image by name.
 
+    If a size is given, the resized variant with the nearest width
+    is served instead of the original. Content-addressed images are
+    served with a strong entity tag and cached by clients for good,
+    and small ones are kept in memory.
+
     Args:
+        request: Current request argument.
         file_name: Name of the file.
+        size: Requested image width in pixels.
 
     Returns:
-        FileResponse with the image file or an error message
+        Response with the image, Not Modified response or an error message
 
     Raises:
         FileNotFoundError: If file doesn't exist on server.
     """
-    file_path = Path(os.path.abspath('./backend/api/images/{0}'.format(
-        file_name,
-    )))
-    if file_path.exists():
-        return FileResponse(file_path)
-    raise FileNotFoundError('File {0} not Found'.format(file_name))
+    cached_response = cached_image_response(request, file_name, size)
+    if cached_response is not None:
+        return cached_response
+    file_path = resolve_file_path(file_name)
+    if not file_path.is_file():
+        raise FileNotFoundError('File {0} not Found'.format(file_name))
+    if size is not None:
+        file_path = await variant_pool.get_variant(file_path, size)
+    return await image_response(
+        request, file_path, content_etag(file_name, size),
+    )
 
 
 @router.post('/api/medias', response_model=AddMediaResponse | ErrorResponse)
 async def load_media(
     request: Request,
     file: UploadFile,
-    api_key: str = Depends(get_api_key),
-    session: AsyncSession = Depends(get_session),
+    background_tasks: BackgroundTasks,
+    curr_user: CurrentUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_write_session),
 ):
     """
     Upload images to the server and add information about them to the database.
 
+    The file is streamed to a staging file and moved into the
+    content-addressed store once the media row is committed. Resized
+    variants are rendered in the background.
+
     Args:
         request: Current request argument.
         file: File to add.
-        api_key: API key of the current user.
+        background_tasks: Tasks run after the response is sent.
+        curr_user: Current user.
         session: Current database session.
 
     Returns:
         Dictionary with result and added media ID or error information
     """
-    file_path = Path(
-        os.path.abspath('./backend/api/images/{0}'.format(
-            file.filename,
-        ),
-        ),
+    staged = await stage_upload(file)
+    link = '{0}://{1}/api/images/{2}'.format(
+        request.url.scheme,
+        request.client.host,
+        blob_name(staged.sha256, staged.content_type),
+    )
+    try:
+        async with session.begin():
+            await add_blob(
+                session, staged.sha256, staged.size, staged.content_type,
+            )
+            media_id = await add_media(
+                Path(file.filename).name,
+                curr_user.id,
+                staged.sha256,
+                link,
+                session,
+            )
+    except Exception:
+        await discard_upload(staged)
+        raise
+    background_tasks.add_task(
+        variant_pool.render_all, await store_upload(staged),
     )
-    file_path.parent.mkdir(parents=True, exist_ok=True)
-
-    async with async_open(file_path, mode='wb+') as local_file:
-        content = await file.read()
-        await local_file.write(content)
-
-    async with session.begin():
-        curr_user = await select_user_by_key(session, api_key)
-        if not curr_user:
-            await add_user(api_key, generate_random_string(), session)
-        media_id = await add_media(
-            file.filename,
-            curr_user,
-            request.url.scheme,
-            request.client.host,
-            session,
-        )
 
     return {'result': True, 'media_id': media_id}
@@ -0,0 +1,78 @@
+"""
+A module contains routes for search requests.
+
+Attributes:
+    router: FastAPI API router.
+"""
+
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.api.app_service.json_response import FastJSONResponse
+from backend.api.app_service.schemas.pages import SearchResponse, split_page
+from backend.api.app_service.schemas.serializers import tweet_to_dict
+from backend.api.app_service.service_functions import (CurrentUser,
+                                                       get_current_user,
+                                                       get_read_session)
+from backend.api.core.config import config
+from backend.api.db.crud.search import SearchCursor, select_search_page
+
+MAX_SEARCH_QUERY_LENGTH = 200
+
+router: APIRouter = APIRouter()
+
+
+@router.get('/api/tweets/search', response_model=SearchResponse)
+async def search_tweets(
+    search_query: str = Query(
+        alias='q', min_length=1, max_length=MAX_SEARCH_QUERY_LENGTH,
+    ),
+    limit: int = Query(
+        config.feed_page_size, ge=1, le=config.max_feed_page_size,
+    ),
+    cursor: Optional[str] = Query(None),
+    curr_user: CurrentUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_session),
+):
+    """
+    Search tweets by their text, best match first.
+
+    Args:
+        search_query: Words to search for; quoted phrases, OR and
+         -word are supported.
+        limit: Maximum number of tweets in the page.
+        cursor: Cursor returned as next_cursor by the previous page.
+        curr_user: Current user.
+        session: Current database session.
+
+    Returns:
+        Result with a boolean value, a page of tweets and the next cursor.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+    """
+    try:
+        after = None if cursor is None else SearchCursor.decode(cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail='Invalid search cursor.',
+        )
+    rows, has_next = split_page(
+        await select_search_page(
+            session, curr_user.id, search_query, limit + 1, after,
+        ),
+        limit,
+    )
+    next_cursor = None
+    if has_next:
+        last_row = rows[-1]
+        next_cursor = SearchCursor(last_row.rank, last_row.id).encode()
+    return FastJSONResponse({
+        'result': True,
+        'tweets': [tweet_to_dict(row) for row in rows],
+        'next_cursor': next_cursor,
+    })
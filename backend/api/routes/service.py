@@ -0,0 +1,50 @@
+"""
+A module contains routes for service information requests.
+
+Attributes:
+    router: FastAPI API router.
+    PROMETHEUS_CONTENT_TYPE: Media type of the metrics exposition format.
+"""
+
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from backend.api.app_service.schemas.responses import PoolStatsResponse
+from backend.api.core.base import sessionmanager
+from backend.api.core.metrics import registry
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4'
+
+router: APIRouter = APIRouter()
+
+
+@router.get(
+    '/metrics/db-pool',
+    response_model=PoolStatsResponse,
+    include_in_schema=False,
+)
+async def get_db_pool_stats():
+    """
+    Get database connection pool statistics.
+
+    Served next to the metrics, outside of the /api/ prefix the proxy
+    exposes to clients.
+
+    Returns:
+        Result with a boolean value and pool counters.
+    """
+    return PoolStatsResponse(result=True, pool=sessionmanager.pool_stats())
+
+
+@router.get('/metrics', include_in_schema=False)
+async def get_metrics():
+    """
+    Get the metrics of this worker process in the Prometheus text format.
+
+    Returns:
+        Request, database and media upload metrics.
+    """
+    return PlainTextResponse(
+        registry.render(), media_type=PROMETHEUS_CONTENT_TYPE,
+    )
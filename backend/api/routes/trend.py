@@ -0,0 +1,48 @@
+"""
+A module contains routes for trend requests.
+
+Attributes:
+    router: FastAPI API router.
+"""
+
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.api.app_service.json_response import FastJSONResponse
+from backend.api.app_service.schemas.responses import TrendsResponse
+from backend.api.app_service.service_functions import get_read_session
+from backend.api.core.config import config
+from backend.api.db.crud.trend import select_trends
+
+MAX_TRENDS_COUNT = 50
+
+router: APIRouter = APIRouter()
+
+
+@router.get('/api/trends', response_model=TrendsResponse)
+async def get_trends(
+    limit: int = Query(config.trends_count, ge=1, le=MAX_TRENDS_COUNT),
+    session: AsyncSession = Depends(get_read_session),
+):
+    """
+    Get the hashtags and mentions used most in the trends window.
+
+    The trends are summed over per-minute counters, so the cost does
+    not depend on the number of tweets.
+
+    Args:
+        limit: Maximum number of tags.
+        session: Current database session.
+
+    Returns:
+        Result with a boolean value and the trending tags.
+    """
+    trends = await select_trends(session, config.trend_window, limit)
+    return FastJSONResponse({
+        'result': True,
+        'trends': [
+            {'name': trend.tag, 'tweets_count': trend.tweets_count}
+            for trend in trends
+        ],
+    })
@@ -13,15 +13,17 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.api.app_service.schemas.models import InputTweet
 from backend.api.app_service.schemas.responses import (AddTweetResponse,
-                                                       Response,
-                                                       TweetsResponse)
-from backend.api.app_service.service_functions import (generate_random_string,
-                                                       get_api_key)
-from backend.api.core.base import get_session
+                                                       Response)
+from backend.api.app_service.service_functions import (CurrentUser,
+                                                       get_current_user,
+                                                       get_write_session)
+from backend.api.app_service.tags import extract_tags, trend_pruning
+from backend.api.core.config import config
+from backend.api.db.crud.event import publish_like, publish_tweet
 from backend.api.db.crud.media import get_attachments_links_by_ids
-from backend.api.db.crud.tweet import (add_tweet, select_all_tweets,
-                                       select_tweet_by_id)
-from backend.api.db.crud.user import add_user, select_user_by_key
+from backend.api.db.crud.trend import add_tweet_tags, prune_trend_buckets
+from backend.api.db.crud.tweet import (add_like, add_tweet, remove_like,
+                                       select_tweet_by_id, tweet_exists)
 
 router: APIRouter = APIRouter()
 
@@ -29,44 +31,49 @@ router: APIRouter = APIRouter()
 @router.post('/api/tweets', response_model=AddTweetResponse)
 async def create_tweet(
     tweet: InputTweet,
-    api_key: str = Depends(get_api_key),
-    session: AsyncSession = Depends(get_session),
+    curr_user: CurrentUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_write_session),
 ):
     """
     Add a tweet to the database.
 
+    Hashtags and mentions of the tweet are stored and counted for the
+    trends, expired trend counters are removed once a minute. The tweet
+    is published to the events streams of the author and followers.
+
     Args:
         tweet: Tweet to add.
-        api_key: API key of the current user.
+        curr_user: Current user.
         session: Current database session.
 
     Returns:
         Result with a boolean value and added tweet ID.
     """
     tweet_media_ids: Optional[List[int]] = tweet.tweet_media_ids
+    tags = extract_tags(tweet.tweet_data)
 
     async with session.begin():
-        curr_user = await select_user_by_key(session, api_key)
-        if not curr_user:
-            curr_user = await add_user(
-                api_key,
-                generate_random_string(),
-                session,
-            )
-
         attachments = []
         if tweet_media_ids:
             attachments = await get_attachments_links_by_ids(
                 session,
                 tweet_media_ids,
+                curr_user.id,
             )
 
         tweet_id = await add_tweet(
             tweet.tweet_data,
             attachments,
-            curr_user,
+            curr_user.id,
             session,
         )
+        await publish_tweet(
+            session, tweet_id, tweet.tweet_data, attachments, curr_user,
+        )
+        if tags:
+            await add_tweet_tags(session, tweet_id, tags)
+        if trend_pruning.ready():
+            await prune_trend_buckets(session, config.trend_window)
 
     return AddTweetResponse(result=True, tweet_id=tweet_id)
 
@@ -74,15 +81,15 @@ async def create_tweet(
 @router.delete('/api/tweets/{tweet_id}', response_model=Response)
 async def delete_tweet(
     tweet_id: int,
-    api_key: str = Depends(get_api_key),
-    session: AsyncSession = Depends(get_session),
+    curr_user: CurrentUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_write_session),
 ):
     """
     Delete a tweet.
 
     Args:
         tweet_id: ID of the tweet to delete.
-        api_key: API key of the current user.
+        curr_user: Current user.
         session: Current database session.
 
     Returns:
@@ -92,14 +99,6 @@ async def delete_tweet(
         HTTPException: If tweet not found or user can't delete this tweet.
     """
     async with session.begin():
-        curr_user = await select_user_by_key(session, api_key)
-        if not curr_user:
-            curr_user = await add_user(
-                api_key,
-                generate_random_string(),
-                session,
-            )
-
         tweet = await select_tweet_by_id(session, tweet_id)
         if not tweet:
             raise HTTPException(
@@ -124,15 +123,19 @@ async def delete_tweet(
 )
 async def like_tweet(
     tweet_id: int,
-    api_key: str = Depends(get_api_key),
-    session: AsyncSession = Depends(get_session),
+    curr_user: CurrentUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_write_session),
 ):
     """
     Add a like to a tweet.
 
+    The like is one statement on the likes table, whatever the number
+    of likes of the tweet. It is published to the events streams of
+    the author of the tweet.
+
     Args:
         tweet_id: ID of the tweet to like.
-        api_key: API key of the current user.
+        curr_user: Current user.
         session: Current database session.
 
     Returns:
@@ -142,44 +145,32 @@ async def like_tweet(
         HTTPException: If tweet not found or already liked.
     """
     async with session.begin():
-        curr_user = await select_user_by_key(session, api_key)
-        if not curr_user:
-            curr_user = await add_user(
-                api_key,
-                generate_random_string(),
-                session,
-            )
-
-        tweet = await select_tweet_by_id(session, tweet_id)
-        if not tweet:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail='Tweet not found.',
-            )
-
-        if curr_user in tweet.likes:
+        if not await add_like(session, tweet_id, curr_user.id):
+            if not await tweet_exists(session, tweet_id):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail='Tweet not found.',
+                )
             raise HTTPException(
                 status_code=status.HTTP_405_METHOD_NOT_ALLOWED,
                 detail='Tweet already liked.',
             )
-
-        tweet.likes.append(curr_user)
-        session.add(tweet)
+        await publish_like(session, tweet_id, curr_user)
     return Response(result=True)
 
 
 @router.delete('/api/tweets/{tweet_id}/likes', response_model=Response)
 async def unlike_tweet(
     tweet_id: int,
-    api_key: str = Depends(get_api_key),
-    session: AsyncSession = Depends(get_session),
+    curr_user: CurrentUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_write_session),
 ):
     """
     Remove a like from a tweet.
 
     Args:
         tweet_id: ID of the tweet to unlike.
-        api_key: API key of the current user.
+        curr_user: Current user.
         session: Current database session.
 
     Returns:
@@ -189,51 +180,14 @@ async def unlike_tweet(
         HTTPException: If tweet not found or was not liked.
     """
     async with session.begin():
-        curr_user = await select_user_by_key(session, api_key)
-        if not curr_user:
-            curr_user = await add_user(
-                api_key,
-                generate_random_string(),
-                session,
-            )
-
-        tweet = await select_tweet_by_id(session, tweet_id)
-        if not tweet:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail='Tweet not found.',
-            )
-
-        if curr_user not in tweet.likes:
+        if not await remove_like(session, tweet_id, curr_user.id):
+            if not await tweet_exists(session, tweet_id):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail='Tweet not found.',
+                )
             raise HTTPException(
                 status_code=status.HTTP_405_METHOD_NOT_ALLOWED,
                 detail='Tweet was not liked.',
             )
-        tweet.likes.remove(curr_user)
-        session.add(tweet)
     return Response(result=True)
-
-
-@router.get('/api/tweets', response_model=TweetsResponse)
-async def get_all_tweets(
-    api_key: str = Depends(get_api_key),
-    session: AsyncSession = Depends(get_session),
-):
-    """
-    Get the tweet feed.
-
-    Args:
-        api_key: API key of the current user.
-        session: Current database session.
-
-    Returns:
-        Result with a boolean value and a list of tweets.
-    """
-    curr_user = await select_user_by_key(session, api_key)
-    if not curr_user:
-        await add_user(api_key, generate_random_string(), session)
-
-    tweets = await select_all_tweets(session)
-    tweets = [await tweet.to_dict() for tweet in tweets]
-
-    return TweetsResponse(result=True, tweets=tweets)
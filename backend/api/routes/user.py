@@ -1,202 +1,156 @@
 """
-A module contains routes for media requests.
+A module contains routes for user profile requests.
 
 Attributes:
     router: FastAPI API router.
 """
 
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional, Sequence
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.api.app_service.schemas.responses import Response, UserResponse
-from backend.api.app_service.service_functions import (generate_random_string,
-                                                       get_api_key)
-from backend.api.core.base import get_session
-from backend.api.db.crud.user import (add_user, select_user_by_id,
-                                      select_user_by_key)
+from backend.api.app_service.json_response import FastJSONResponse
+from backend.api.app_service.schemas.pages import FollowsResponse, split_page
+from backend.api.app_service.schemas.responses import UserResponse
+from backend.api.app_service.schemas.serializers import (user_brief,
+                                                         user_to_dict)
+from backend.api.app_service.service_functions import (CurrentUser,
+                                                       get_current_user,
+                                                       get_read_session)
+from backend.api.core.config import config
+from backend.api.db.crud.follow import (select_followers_page,
+                                        select_following_page)
+from backend.api.db.crud.user import select_user_profile, user_exists
 
 router = APIRouter()
 
 
-@router.post('/api/users/{user_id}/follow', response_model=Response)
-async def follow_user(
-        user_id: int,
-        api_key: str = Depends(get_api_key),
-        session: AsyncSession = Depends(get_session),
+@router.get('/api/users/me', response_model=UserResponse)
+async def get_info_about_current_user(
+        curr_user: CurrentUser = Depends(get_current_user),
+        session: AsyncSession = Depends(get_read_session),
 ):
     """
-    Follow a user.
+    Get information about the current user.
 
     Args:
-        user_id: ID of the user to follow.
-        api_key: API key of the current user.
+        curr_user: Current user.
         session: Current database session.
 
     Returns:
-        Result with a boolean value
-
-    Raises:
-        HTTPException: If the user is not found or is already followed.r
-
+        Result with a boolean value and user information.
     """
     async with session.begin():
-        curr_user = await select_user_by_key(session, api_key)
-        if not curr_user:
-            curr_user = await add_user(
-                api_key,
-                generate_random_string(),
-                session,
-            )
-
-        user_to_follow = await select_user_by_id(
-            session,
-            user_id,
-            show_detail_info=True,
-        )
-        if not user_to_follow:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail='User to follow not found',
-            )
+        user = await select_user_profile(session, curr_user.id, curr_user.id)
 
-        if curr_user in user_to_follow.followers:
-            raise HTTPException(
-                status_code=status.HTTP_405_METHOD_NOT_ALLOWED,
-                detail='Already following this user',
-            )
+    return FastJSONResponse({'result': True, 'user': user_to_dict(user)})
 
-        user_to_follow.followers.append(curr_user)
-        session.add(user_to_follow)
 
-    return Response(result=True)
-
-
-@router.delete('/api/users/{user_id}/follow', response_model=Response)
-async def unfollow_user(
+@router.get('/api/users/{user_id}', response_model=UserResponse)
+async def get_info_about_user(
         user_id: int,
-        api_key: str = Depends(get_api_key),
-        session: AsyncSession = Depends(get_session),
+        curr_user: CurrentUser = Depends(get_current_user),
+        session: AsyncSession = Depends(get_read_session),
 ):
     """
-    Unfollow a user.
+    Get information about a user by ID.
 
     Args:
-        user_id: ID of the user to unfollow.
-        api_key: API key of the current user.
+        user_id: ID of the user to retrieve.
+        curr_user: Current user.
         session: Current database session.
 
     Returns:
-        Result with a boolean value.
+        Result with a boolean value and user information.
 
     Raises:
-        HTTPException: If the user you want to stop following
-        has not been found or is not yet subscribed.
+        HTTPException: If required user is not found.
     """
     async with session.begin():
-        curr_user = await select_user_by_key(session, api_key)
-        if not curr_user:
-            curr_user = await add_user(
-                api_key,
-                generate_random_string(),
-                session,
-            )
-
-        user_to_unfollow = await select_user_by_id(
-            session,
-            user_id,
-            show_detail_info=True,
+        user = await select_user_profile(session, user_id, curr_user.id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='User not found',
         )
-        if not user_to_unfollow:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail='User to unfollow not found.',
-            )
-
-        if curr_user not in user_to_unfollow.followers:
-            raise HTTPException(
-                status_code=status.HTTP_405_METHOD_NOT_ALLOWED,
-                detail='Not following this user.',
-            )
 
-        user_to_unfollow.followers.remove(curr_user)
-        session.add(user_to_unfollow)
+    return FastJSONResponse({'result': True, 'user': user_to_dict(user)})
 
-    return Response(result=True)
 
-
-@router.get('/api/users/me', response_model=UserResponse)
-async def get_info_about_current_user(
-        api_key: str = Depends(get_api_key),
-        session: AsyncSession = Depends(get_session),
+@router.get('/api/users/{user_id}/followers', response_model=FollowsResponse)
+async def get_followers(
+        user_id: int,
+        limit: int = Query(
+            config.feed_page_size, ge=1, le=config.max_feed_page_size,
+        ),
+        before_id: Optional[int] = Query(None, ge=1),
+        curr_user: CurrentUser = Depends(get_current_user),
+        session: AsyncSession = Depends(get_read_session),
 ):
     """
-    Get information about the current user.
+    Get users who follow a user.
 
     Args:
-        api_key: API key of the current user.
+        user_id: ID of the followed user.
+        limit: Maximum number of users in the page.
+        before_id: Cursor returned as next_cursor by the previous page.
+        curr_user: Current user.
         session: Current database session.
 
     Returns:
-        Result with a boolean value and user information.
+        Result with a boolean value, a page of users and the next cursor.
     """
     async with session.begin():
-        curr_user = await select_user_by_key(session, api_key)
-        if not curr_user:
-            await add_user(
-                api_key,
-                generate_random_string(),
-                session,
-            )
-        user = await select_user_by_key(
-            session,
-            api_key,
-            show_detail_info=True,
+        users = await select_followers_page(
+            session, user_id, limit + 1, before_id,
         )
-        user_dict = await user.to_dict()
-
-        return UserResponse(result=True, user=user_dict)
+        return await _follows_response(session, user_id, users, limit)
 
 
-@router.get('/api/users/{user_id}', response_model=UserResponse)
-async def get_info_about_user(
+@router.get('/api/users/{user_id}/following', response_model=FollowsResponse)
+async def get_following(
         user_id: int,
-        api_key: str = Depends(get_api_key),
-        session: AsyncSession = Depends(get_session),
+        limit: int = Query(
+            config.feed_page_size, ge=1, le=config.max_feed_page_size,
+        ),
+        before_id: Optional[int] = Query(None, ge=1),
+        curr_user: CurrentUser = Depends(get_current_user),
+        session: AsyncSession = Depends(get_read_session),
 ):
     """
-    Get information about a user by ID.
+    Get users followed by a user.
 
     Args:
-        user_id: ID of the user to retrieve.
-        api_key: API key of the current user.
+        user_id: ID of the follower.
+        limit: Maximum number of users in the page.
+        before_id: Cursor returned as next_cursor by the previous page.
+        curr_user: Current user.
         session: Current database session.
 
     Returns:
-        Result with a boolean value and user information.
-
-    Raises:
-        HTTPException: If required user is not found.
+        Result with a boolean value, a page of users and the next cursor.
     """
     async with session.begin():
-        curr_user = await select_user_by_key(session, api_key)
-        if not curr_user:
-            await add_user(
-                api_key,
-                generate_random_string(),
-                session,
-            )
-
-        user = await select_user_by_id(
-            session,
-            user_id,
-            show_detail_info=True,
+        users = await select_following_page(
+            session, user_id, limit + 1, before_id,
+        )
+        return await _follows_response(session, user_id, users, limit)
+
+
+async def _follows_response(
+    session: AsyncSession, user_id: int, users: Sequence[Row], limit: int,
+) -> FastJSONResponse:
+    users, has_next = split_page(users, limit)
+    if not users and not await user_exists(session, user_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='User not found',
         )
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail='User not found',
-            )
-
-        user_dict = await user.to_dict()
-        return UserResponse(result=True, user=user_dict)
+    return FastJSONResponse({
+        'result': True,
+        'users': [user_brief(user) for user in users],
+        'next_cursor': users[-1].id if has_next else None,
+    })
@@ -0,0 +1,5 @@
+"""
+Load-testing benchmarks of the API.
+
+Run ``python -m backend.benchmarks --help`` for the options.
+"""
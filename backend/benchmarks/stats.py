@@ -0,0 +1,98 @@
+"""A module contains the collection of benchmark measurements."""
+
+
+import math
+from collections import defaultdict
+from typing import Dict, List, Sequence
+
+PERCENTILES = (('p50', 0.5), ('p95', 0.95), ('p99', 0.99))
+MILLISECONDS = 1000
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """
+    Get a percentile by the nearest-rank method.
+
+    Args:
+        sorted_values: Measurements in ascending order.
+        fraction: Percentile as a fraction of one.
+
+    Returns:
+        The measurement at the percentile, 0 if there are none.
+    """
+    if not sorted_values:
+        return 0
+    rank = max(math.ceil(fraction * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class Recorder:
+    """
+    Latencies and errors of the requests, grouped by endpoint.
+
+    Endpoints are keyed by the method and the route template,
+    e.g. ``GET /api/tweets/{tweet_id}/likes``.
+    """
+
+    def __init__(self):
+        """Initialize an empty recorder."""
+        self._latencies: Dict[str, List[float]] = defaultdict(list)
+        self._errors: Dict[str, int] = defaultdict(int)
+
+    def record(self, endpoint: str, latency: float, succeeded: bool) -> None:
+        """
+        Record one request.
+
+        Args:
+            endpoint: Method and route template of the request.
+            latency: Seconds from sending the request to the full response.
+            succeeded: Whether the request succeeded.
+        """
+        self._latencies[endpoint].append(latency)
+        if not succeeded:
+            self._errors[endpoint] += 1
+
+    def report(self, elapsed: float) -> dict:
+        """
+        Summarize the recorded requests.
+
+        Args:
+            elapsed: Seconds the load was applied for.
+
+        Returns:
+            Throughput, latency percentiles in milliseconds and error
+            rate of every endpoint and of all requests together.
+        """
+        endpoints = {
+            endpoint: self._summary(latencies, self._errors[endpoint], elapsed)
+            for endpoint, latencies in sorted(self._latencies.items())
+        }
+        all_latencies = [
+            latency
+            for latencies in self._latencies.values()
+            for latency in latencies
+        ]
+        total = self._summary(
+            all_latencies, sum(self._errors.values()), elapsed,
+        )
+        return {'endpoints': endpoints, 'total': total}
+
+    def _summary(
+        self, latencies: List[float], errors: int, elapsed: float,
+    ) -> dict:
+        sorted_latencies = sorted(latencies)
+        requests = len(sorted_latencies)
+        latency_ms = {
+            name: round(percentile(sorted_latencies, fraction) * MILLISECONDS, 3)
+            for name, fraction in PERCENTILES
+        }
+        latency_ms['max'] = round(
+            sorted_latencies[-1] * MILLISECONDS if requests else 0, 3,
+        )
+        return {
+            'requests': requests,
+            'errors': errors,
+            'error_rate': round(errors / requests, 6) if requests else 0,
+            'rps': round(requests / elapsed, 3) if elapsed else 0,
+            'latency_ms': latency_ms,
+        }
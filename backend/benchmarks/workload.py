@@ -0,0 +1,699 @@
+"""
+A module contains the seeded dataset and the requests of the benchmark.
+
+Every route of the API has an operation here. Operations pick their
+arguments from the dataset, so likes, follows and deletions mostly hit
+existing rows instead of failing with 404 or 405. Tweets are written
+from a small vocabulary of words and hashtags, so searches find them
+and trends have tags to count. The events stream is measured as the
+time to its first chunk, and only against a running server: the
+in-process transport buffers whole responses and a stream never ends.
+"""
+
+
+import asyncio
+import hashlib
+import io
+import random
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+import httpx
+from PIL import Image
+
+from backend.benchmarks.stats import Recorder
+
+API_KEY_HEADER = 'api-key'
+WORDS = (
+    'python', 'postgres', 'async', 'cache', 'index', 'latency', 'queue',
+    'replica', 'timeline', 'search',
+)
+TAGS = ('#bench', '#fastapi', '#sqlalchemy', '#perf', '#news')
+IMAGE_SIZE = (64, 64)
+RGB_MAX = 255
+
+
+class SeedConfig(NamedTuple):
+    """
+    Size of the seeded dataset.
+
+    Attributes:
+        users: Number of users.
+        follows_per_user: Number of users every user follows.
+        tweets_per_user: Number of tweets of every user.
+        likes_per_user: Number of tweets every user likes.
+        media_ratio: Fraction of the seeded tweets with an image.
+    """
+
+    users: int = 200
+    follows_per_user: int = 20
+    tweets_per_user: int = 10
+    likes_per_user: int = 20
+    media_ratio: float = 0.2
+
+
+class BenchUser(NamedTuple):
+    """
+    A user of the benchmark.
+
+    Attributes:
+        id: ID of the user.
+        key: API key of the user.
+    """
+
+    id: int
+    key: str
+
+
+class Dataset:
+    """
+    Rows created by the benchmark, used to build valid requests.
+
+    Attributes:
+        users: Users with their API keys.
+        tweets: IDs of the existing tweets.
+        own_tweets: IDs of the tweets of every user.
+        liked: IDs of the tweets liked by every user.
+        following: IDs of the users followed by every user.
+        images: File names of the uploaded images.
+    """
+
+    def __init__(self):
+        """Initialize an empty dataset."""
+        self.users: List[BenchUser] = []
+        self.tweets: List[int] = []
+        self.own_tweets: Dict[int, List[int]] = {}
+        self.liked: Dict[int, Set[int]] = {}
+        self.following: Dict[int, Set[int]] = {}
+        self.images: List[str] = []
+
+    def add_user(self, user: BenchUser) -> None:
+        """
+        Add a user.
+
+        Args:
+            user: The user.
+        """
+        self.users.append(user)
+        self.own_tweets[user.id] = []
+        self.liked[user.id] = set()
+        self.following[user.id] = set()
+
+    def add_tweet(self, user: BenchUser, tweet_id: int) -> None:
+        """
+        Add a tweet.
+
+        Args:
+            user: Author of the tweet.
+            tweet_id: ID of the tweet.
+        """
+        self.tweets.append(tweet_id)
+        self.own_tweets[user.id].append(tweet_id)
+
+    def remove_tweet(self, user: BenchUser, tweet_id: int) -> None:
+        """
+        Remove a deleted tweet.
+
+        Args:
+            user: Author of the tweet.
+            tweet_id: ID of the tweet.
+        """
+        self.own_tweets[user.id].remove(tweet_id)
+        self.tweets.remove(tweet_id)
+        for liked in self.liked.values():
+            liked.discard(tweet_id)
+
+
+def random_image(rng: random.Random) -> bytes:
+    """
+    Render a small PNG image of a random color.
+
+    Args:
+        rng: Random generator.
+
+    Returns:
+        Content of the image.
+    """
+    color = tuple(rng.randint(0, RGB_MAX) for _ in range(3))
+    buffer = io.BytesIO()
+    Image.new('RGB', IMAGE_SIZE, color).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+class ApiClient:
+    """
+    HTTP client that times every request.
+
+    Attributes:
+        client: Underlying async HTTP client.
+        recorder: Recorder of the measurements, None while seeding.
+    """
+
+    def __init__(self, client: httpx.AsyncClient):
+        """
+        Initialize the client.
+
+        Args:
+            client: Underlying async HTTP client.
+        """
+        self.client = client
+        self.recorder: Optional[Recorder] = None
+
+    async def request(
+        self,
+        user: BenchUser,
+        method: str,
+        route: str,
+        path_params: Optional[dict] = None,
+        **kwargs,
+    ) -> Optional[httpx.Response]:
+        """
+        Send a request and record its latency and outcome.
+
+        A request fails on a transport error, on an error status and
+        on a JSON body with a False result.
+
+        Args:
+            user: User sending the request.
+            method: HTTP method.
+            route: Route template of the endpoint.
+            path_params: Values of the route template parameters.
+            kwargs: Keyword arguments of httpx.AsyncClient.request.
+
+        Returns:
+            The response, or None on a transport error.
+        """
+        url = route.format(**(path_params or {}))
+        headers = {API_KEY_HEADER: user.key}
+        start_time = time.perf_counter()
+        try:
+            response = await self.client.request(
+                method, url, headers=headers, **kwargs,
+            )
+        except httpx.HTTPError:
+            response = None
+        self._record(method, route, start_time, is_success(response))
+        return response
+
+    async def first_chunk(self, user: BenchUser, route: str) -> None:
+        """
+        Open a streamed response and record the time to its first chunk.
+
+        Args:
+            user: User sending the request.
+            route: Route of the streaming endpoint.
+        """
+        headers = {API_KEY_HEADER: user.key}
+        start_time = time.perf_counter()
+        success = False
+        try:
+            async with self.client.stream(
+                'GET', route, headers=headers,
+            ) as response:
+                if response.status_code < httpx.codes.BAD_REQUEST:
+                    async for _chunk in response.aiter_raw():
+                        success = True
+                        break
+        except httpx.HTTPError:
+            success = False
+        self._record('GET', route, start_time, success)
+
+    def _record(
+        self, method: str, route: str, start_time: float, success: bool,
+    ) -> None:
+        if self.recorder is not None:
+            self.recorder.record(
+                '{0} {1}'.format(method, route),
+                time.perf_counter() - start_time,
+                success,
+            )
+
+
+def is_success(response: Optional[httpx.Response]) -> bool:
+    """
+    Check whether a request succeeded.
+
+    Args:
+        response: The response, or None on a transport error.
+
+    Returns:
+        True if the request succeeded.
+    """
+    if response is None or response.status_code >= httpx.codes.BAD_REQUEST:
+        return False
+    content_type = response.headers.get('content-type', '')
+    if content_type.startswith('application/json'):
+        return response.json().get('result') is not False
+    return True
+
+
+class Workload:
+    """
+    Requests of the benchmark.
+
+    Attributes:
+        api: Timing HTTP client.
+        dataset: Rows created by the benchmark.
+    """
+
+    def __init__(
+        self, api: ApiClient, dataset: Dataset, streaming: bool = True,
+    ):
+        """
+        Initialize the workload.
+
+        Args:
+            api: Timing HTTP client.
+            dataset: Rows created by the benchmark.
+            streaming: Whether the client can read streamed responses
+             before they end, which the events stream needs.
+        """
+        self.api = api
+        self.dataset = dataset
+        self.streaming = streaming
+
+    def operations(self) -> Tuple[Tuple[Callable, int], ...]:
+        """
+        Get the operations with their weights in the request mix.
+
+        Returns:
+            Pairs of an operation and its relative weight.
+        """
+        operations = (
+            (self.get_feed, 40),
+            (self.get_image, 15),
+            (self.get_user, 8),
+            (self.like_tweet, 8),
+            (self.create_tweet, 6),
+            (self.get_me, 5),
+            (self.get_likes, 5),
+            (self.search_tweets, 5),
+            (self.unlike_tweet, 4),
+            (self.follow_user, 3),
+            (self.get_trends, 3),
+            (self.get_followers, 2),
+            (self.get_following, 2),
+            (self.delete_tweet, 2),
+            (self.unfollow_user, 2),
+            (self.upload_media, 1),
+            (self.get_pool_stats, 1),
+            (self.get_metrics, 1),
+        )
+        if self.streaming:
+            operations += ((self.stream_events, 1),)
+        return operations
+
+    async def get_feed(self, user: BenchUser, rng: random.Random) -> None:
+        """
+        Read the first page and sometimes the second page of the feed.
+
+        Args:
+            user: User sending the request.
+            rng: Random generator.
+        """
+        response = await self.api.request(user, 'GET', '/api/tweets')
+        if not is_success(response):
+            return
+        next_cursor = response.json().get('next_cursor')
+        if next_cursor is not None and rng.random() < 0.25:
+            await self.api.request(
+                user, 'GET', '/api/tweets', params={'before_id': next_cursor},
+            )
+
+    async def get_me(self, user: BenchUser, rng: random.Random) -> None:
+        """
+        Read the profile of the user.
+
+        Args:
+            user: User sending the request.
+            rng: Random generator.
+        """
+        await self.api.request(user, 'GET', '/api/users/me')
+
+    async def get_user(self, user: BenchUser, rng: random.Random) -> None:
+        """
+        Read the profile of a random user.
+
+        Args:
+            user: User sending the request.
+            rng: Random generator.
+        """
+        other = rng.choice(self.dataset.users)
+        await self.api.request(
+            user, 'GET', '/api/users/{user_id}', {'user_id': other.id},
+        )
+
+    async def create_tweet(
+        self,
+        user: BenchUser,
+        rng: random.Random,
+        media_ids: Tuple[int, ...] = (),
+    ) -> None:
+        """
+        Post a tweet.
+
+        Args:
+            user: User sending the request.
+            rng: Random generator.
+            media_ids: IDs of the attached media.
+        """
+        payload = {
+            'tweet_data': 'Benchmark tweet about {0} {1} {2}'.format(
+                rng.choice(WORDS), rng.choice(TAGS), rng.random(),
+            ),
+            'tweet_media_ids': list(media_ids),
+        }
+        response = await self.api.request(
+            user, 'POST', '/api/tweets', json=payload,
+        )
+        if is_success(response):
+            self.dataset.add_tweet(user, response.json()['tweet_id'])
+
+    async def delete_tweet(self, user: BenchUser, rng: random.Random) -> None:
+        """
+        Delete the latest tweet of the user.
+
+        Args:
+            user: User sending the request.
+            rng: Random generator.
+        """
+        own_tweets = self.dataset.own_tweets[user.id]
+        if not own_tweets:
+            return
+        tweet_id = own_tweets[-1]
+        self.dataset.remove_tweet(user, tweet_id)
+        await self.api.request(
+            user, 'DELETE', '/api/tweets/{tweet_id}', {'tweet_id': tweet_id},
+        )
+
+    async def like_tweet(self, user: BenchUser, rng: random.Random) -> None:
+        """
+        Like a random tweet the user has not liked yet.
+
+        Args:
+            user: User sending the request.
+            rng: Random generator.
+        """
+        if not self.dataset.tweets:
+            return
+        tweet_id = rng.choice(self.dataset.tweets)
+        liked = self.dataset.liked[user.id]
+        if tweet_id in liked:
+            return
+        liked.add(tweet_id)
+        await self.api.request(
+            user,
+            'POST',
+            '/api/tweets/{tweet_id}/likes',
+            {'tweet_id': tweet_id},
+        )
+
+    async def unlike_tweet(self, user: BenchUser, rng: random.Random) -> None:
+        """
+        Remove a like of the user.
+
+        Args:
+            user: User sending the request.
+            rng: Random generator.
+        """
+        liked = self.dataset.liked[user.id]
+        if not liked:
+            return
+        tweet_id = liked.pop()
+        await self.api.request(
+            user,
+            'DELETE',
+            '/api/tweets/{tweet_id}/likes',
+            {'tweet_id': tweet_id},
+        )
+
+    async def get_likes(self, user: BenchUser, rng: random.Random) -> None:
+        """
+        Read the users who liked a random tweet.
+
+        Args:
+            user: User sending the request.
+            rng: Random generator.
+        """
+        if not self.dataset.tweets:
+            return
+        await self.api.request(
+            user,
+            'GET',
+            '/api/tweets/{tweet_id}/likes',
+            {'tweet_id': rng.choice(self.dataset.tweets)},
+        )
+
+    async def follow_user(self, user: BenchUser, rng: random.Random) -> None:
+        """
+        Follow a random user the user does not follow yet.
+
+        Args:
+            user: User sending the request.
+            rng: Random generator.
+        """
+        other = rng.choice(self.dataset.users)
+        following = self.dataset.following[user.id]
+        if other.id == user.id or other.id in following:
+            return
+        following.add(other.id)
+        await self.api.request(
+            user, 'POST', '/api/users/{user_id}/follow', {'user_id': other.id},
+        )
+
+    async def unfollow_user(
+        self, user: BenchUser, rng: random.Random,
+    ) -> None:
+        """
+        Stop following one of the followed users.
+
+        Args:
+            user: User sending the request.
+            rng: Random generator.
+        """
+        following = self.dataset.following[user.id]
+        if not following:
+            return
+        other_id = following.pop()
+        await self.api.request(
+            user,
+            'DELETE',
+            '/api/users/{user_id}/follow',
+            {'user_id': other_id},
+        )
+
+    async def upload_media(
+        self, user: BenchUser, rng: random.Random,
+    ) -> Optional[int]:
+        """
+        Upload an image.
+
+        Args:
+            user: User sending the request.
+            rng: Random generator.
+
+        Returns:
+            ID of the media, None if it was not uploaded.
+        """
+        content = random_image(rng)
+        files = {'file': ('bench.png', content, 'image/png')}
+        response = await self.api.request(
+            user, 'POST', '/api/medias', files=files,
+        )
+        if not is_success(response):
+            return None
+        self.dataset.images.append(
+            '{0}.png'.format(hashlib.sha256(content).hexdigest()),
+        )
+        return response.json()['media_id']
+
+    async def get_image(self, user: BenchUser, rng: random.Random) -> None:
+        """
+        Download a random image.
+
+        Args:
+            user: User sending the request.
+            rng: Random generator.
+        """
+        if not self.dataset.images:
+            return
+        await self.api.request(
+            user,
+            'GET',
+            '/api/images/{file_name}',
+            {'file_name': rng.choice(self.dataset.images)},
+        )
+
+    async def get_pool_stats(
+        self, user: BenchUser, rng: random.Random,
+    ) -> None:
+        """
+        Read the connection pool statistics.
+
+        Args:
+            user: User sending the request.
+            rng: Random generator.
+        """
+        await self.api.request(user, 'GET', '/metrics/db-pool')
+
+    async def search_tweets(
+        self, user: BenchUser, rng: random.Random,
+    ) -> None:
+        """
+        Search tweets for a word or a hashtag of the vocabulary.
+
+        Args:
+            user: User sending the request.
+            rng: Random generator.
+        """
+        await self.api.request(
+            user,
+            'GET',
+            '/api/tweets/search',
+            params={'q': rng.choice(WORDS + TAGS)},
+        )
+
+    async def get_trends(self, user: BenchUser, rng: random.Random) -> None:
+        """
+        Read the trending tags.
+
+        Args:
+            user: User sending the request.
+            rng: Random generator.
+        """
+        await self.api.request(user, 'GET', '/api/trends')
+
+    async def get_followers(
+        self, user: BenchUser, rng: random.Random,
+    ) -> None:
+        """
+        Read the first page of followers of a random user.
+
+        Args:
+            user: User sending the request.
+            rng: Random generator.
+        """
+        other = rng.choice(self.dataset.users)
+        await self.api.request(
+            user,
+            'GET',
+            '/api/users/{user_id}/followers',
+            {'user_id': other.id},
+        )
+
+    async def get_following(
+        self, user: BenchUser, rng: random.Random,
+    ) -> None:
+        """
+        Read the first page of users followed by a random user.
+
+        Args:
+            user: User sending the request.
+            rng: Random generator.
+        """
+        other = rng.choice(self.dataset.users)
+        await self.api.request(
+            user,
+            'GET',
+            '/api/users/{user_id}/following',
+            {'user_id': other.id},
+        )
+
+    async def get_metrics(self, user: BenchUser, rng: random.Random) -> None:
+        """
+        Scrape the metrics.
+
+        Args:
+            user: User sending the request.
+            rng: Random generator.
+        """
+        await self.api.request(user, 'GET', '/metrics')
+
+    async def stream_events(
+        self, user: BenchUser, rng: random.Random,
+    ) -> None:
+        """
+        Subscribe to the events stream until its first chunk arrives.
+
+        Args:
+            user: User sending the request.
+            rng: Random generator.
+        """
+        await self.api.first_chunk(user, '/api/events')
+
+
+class Seeder:
+    """
+    Creates the dataset through the API before the load is applied.
+
+    Attributes:
+        workload: Requests of the benchmark.
+        concurrency: Number of requests sent at once.
+    """
+
+    def __init__(self, workload: Workload, concurrency: int):
+        """
+        Initialize the seeder.
+
+        Args:
+            workload: Requests of the benchmark.
+            concurrency: Number of requests sent at once.
+        """
+        self.workload = workload
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def seed(self, seed_config: SeedConfig, rng: random.Random) -> None:
+        """
+        Create users, follows, tweets with images and likes.
+
+        Args:
+            seed_config: Size of the dataset.
+            rng: Random generator.
+        """
+        dataset = self.workload.dataset
+        await self._gather([
+            self._add_user('bench-user-{0}'.format(index))
+            for index in range(seed_config.users)
+        ])
+        await self._gather([
+            self.workload.follow_user(user, rng)
+            for user in dataset.users
+            for _ in range(seed_config.follows_per_user)
+        ])
+        await self._gather([
+            self._add_tweet(user, rng, rng.random() < seed_config.media_ratio)
+            for user in dataset.users
+            for _ in range(seed_config.tweets_per_user)
+        ])
+        await self._gather([
+            self.workload.like_tweet(user, rng)
+            for user in dataset.users
+            for _ in range(seed_config.likes_per_user)
+        ])
+
+    async def _gather(self, coroutines: list) -> None:
+        await asyncio.gather(*[
+            self._limited(coroutine) for coroutine in coroutines
+        ])
+
+    async def _limited(self, coroutine) -> None:
+        async with self._semaphore:
+            await coroutine
+
+    async def _add_user(self, key: str) -> None:
+        response = await self.workload.api.client.get(
+            '/api/users/me', headers={API_KEY_HEADER: key},
+        )
+        response.raise_for_status()
+        self.workload.dataset.add_user(
+            BenchUser(id=response.json()['user']['id'], key=key),
+        )
+
+    async def _add_tweet(
+        self, user: BenchUser, rng: random.Random, with_image: bool,
+    ) -> None:
+        media_ids: Tuple[int, ...] = ()
+        if with_image:
+            media_id = await self.workload.upload_media(user, rng)
+            media_ids = () if media_id is None else (media_id,)
+        await self.workload.create_tweet(user, rng, media_ids)
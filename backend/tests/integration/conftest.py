@@ -6,7 +6,9 @@ from pytest_postgresql import factories
 from pytest_postgresql.janitor import DatabaseJanitor
 
 from backend.api.app import init_app
+from backend.api.app_service.service_functions import user_cache
 from backend.api.core.base import get_session, sessionmanager
+from backend.api.core.config import config
 
 
 @pytest.fixture(autouse=True)
@@ -47,6 +49,7 @@ async def create_tables(connection_test):
     async with sessionmanager.connect() as connection:
         await sessionmanager.drop_all(connection)
         await sessionmanager.create_all(connection)
+    user_cache.clear()
 
 
 @pytest.fixture(scope="function", autouse=True)
@@ -56,3 +59,14 @@ async def session_override(app, connection_test):
             yield session
 
     app.dependency_overrides[get_session] = get_db_override
+
+
+@pytest.fixture
+def query_budget(monkeypatch):
+    monkeypatch.setattr(config, "debug", True)
+
+    def check(response, budget):
+        query_count = int(response.headers["x-query-count"])
+        assert query_count <= budget, f"{query_count} SQL statements, budget is {budget}"
+
+    return check
@@ -1,10 +1,82 @@
 import os.path
 
+import pytest
+
+from backend.api.app_service.image_responses import hot_images
+from backend.api.core.config import config
+
+
+def upload_image_link(client):
+    with open(os.path.abspath('./tests/integration/media/test_image.png'), 'rb') as file:
+        media_id = client.post('/api/medias', headers={'api-key': 'test'},
+                               files={'file': ('test_image.png', file, 'image/png')}).json()['media_id']
+    client.post('/api/tweets', json={"tweet_data": "Tweet with image", "tweet_media_ids": [media_id]},
+                headers={'api-key': "test"})
+    return client.get('/api/tweets', headers={'api-key': "test"}).json()['tweets'][0]['attachments'][0]
+
 
 def test_load_image(client):
-    with open(os.path.abspath('./tests/integration/media/test_image.png'),
-              'rb') as file:
-        client.post('/api/medias', headers={'api-key': 'test'},
-                    files={'file': ('test_image.png', file, 'image/png')})
-    response = client.get('/api/images/test_image.png')
+    file_name = upload_image_link(client).rsplit('/', 1)[-1]
+    response = client.get(f'/api/images/{file_name}')
+    assert response.status_code == 200
+
+
+def test_client_file_name_is_not_served(client):
+    upload_image_link(client)
+    with pytest.raises(FileNotFoundError):
+        client.get('/api/images/test_image.png')
+
+
+def test_duplicate_images_share_content(client):
+    media_ids = []
+    for _ in range(2):
+        with open(os.path.abspath('./tests/integration/media/test_image.png'), 'rb') as file:
+            response = client.post('/api/medias', headers={'api-key': 'test'},
+                                   files={'file': ('test_image.png', file, 'image/png')})
+        media_ids.append(response.json()['media_id'])
+    client.post('/api/tweets', json={"tweet_data": "Duplicate images", "tweet_media_ids": media_ids},
+                headers={'api-key': "test"})
+    attachments = client.get('/api/tweets', headers={'api-key': "test"}).json()['tweets'][0]['attachments']
+    assert len(set(attachments)) == 1
+    file_name = attachments[0].rsplit('/', 1)[-1]
+    response = client.get(f'/api/images/{file_name}')
+    assert response.status_code == 200
+
+
+def test_load_resized_image(client):
+    file_name = upload_image_link(client).rsplit('/', 1)[-1]
+    response = client.get(f'/api/images/{file_name}', params={'size': 100})
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'image/webp'
+
+
+def test_load_image_not_modified(client):
+    file_name = upload_image_link(client).rsplit('/', 1)[-1]
+    response = client.get(f'/api/images/{file_name}')
+    assert 'immutable' in response.headers['cache-control']
+    response = client.get(f'/api/images/{file_name}',
+                          headers={'if-none-match': response.headers['etag']})
+    assert response.status_code == 304
+    response = client.get(f'/api/images/{file_name}', headers={'range': 'bytes=0-9'})
+    assert response.status_code == 206
+    assert len(response.content) == 10
+
+
+def test_missing_image_is_not_answered_not_modified(client):
+    digest = "0" * 64
+    with pytest.raises(FileNotFoundError):
+        client.get(f'/api/images/{digest}.png', headers={'if-none-match': f'"{digest}"'})
+
+
+def test_accel_redirect_leaves_content_to_nginx(client, monkeypatch):
+    file_name = upload_image_link(client).rsplit('/', 1)[-1]
+    monkeypatch.setattr(config, "media_accel_redirect_prefix", "/protected-media/")
+    hot_images.clear()
+    response = client.get(f'/api/images/{file_name}')
     assert response.status_code == 200
+    assert response.content == b''
+    assert response.headers['x-accel-redirect'] == (
+        f'/protected-media/{file_name[:2]}/{file_name[2:4]}/{file_name}'
+    )
+    assert response.headers['etag'] == f'"{file_name.split(".")[0]}"'
+    assert response.headers['content-type'] == 'image/png'
@@ -1,4 +1,12 @@
 import os
+from pathlib import Path
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from backend.api.app_service.body_limit import TOO_LARGE_DETAIL, BodyLimitMiddleware
+from backend.api.app_service.media_storage import STAGING_DIR
+from backend.api.core.config import config
 
 
 def test_load_media(client):
@@ -11,3 +19,48 @@ def test_load_media(client):
     assert response_json == {"result": True, "media_id": 1}
     assert response_json['result'] is True
     assert isinstance(response_json['media_id'], int)
+
+
+def test_load_media_rejects_unsupported_type(client):
+    response = client.post('/api/medias', headers={'api-key': 'test'},
+                           files={'file': ('test.png', b'not an image', 'image/png')})
+    assert response.status_code == 415
+
+
+def staged_files():
+    staging_dir = Path(config.media_root, STAGING_DIR)
+    return set(staging_dir.iterdir()) if staging_dir.exists() else set()
+
+
+def test_load_media_rejects_too_large_file(client, monkeypatch):
+    monkeypatch.setattr(config, "max_upload_size", 100)
+    staged_before = staged_files()
+    with open(os.path.abspath('./tests/integration/media/test_image.png'), 'rb') as file:
+        response = client.post('/api/medias', headers={'api-key': 'test'},
+                               files={'file': ('test_image.png', file, 'image/png')})
+    assert response.status_code == 413
+    assert staged_files() == staged_before
+
+
+def limited_client(max_body_size):
+    app = FastAPI()
+
+    @app.post('/echo')
+    async def echo(request: Request):
+        return {"size": len(await request.body())}
+
+    return TestClient(BodyLimitMiddleware(app, max_body_size=max_body_size))
+
+
+def test_body_limit_rejects_declared_length():
+    client = limited_client(10)
+    assert client.post('/echo', content=b'x' * 10).json() == {"size": 10}
+    response = client.post('/echo', content=b'x' * 11)
+    assert response.status_code == 413
+    assert response.json() == {"detail": TOO_LARGE_DETAIL}
+
+
+def test_body_limit_rejects_streamed_body():
+    response = limited_client(10).post('/echo', content=iter([b'x' * 6, b'x' * 6]))
+    assert response.status_code == 413
+    assert response.json() == {"detail": TOO_LARGE_DETAIL}
@@ -0,0 +1,31 @@
+from sqlalchemy import text
+
+from backend.api.core.base import DatabaseSessionManager, sessionmanager
+from backend.api.core.config import PoolConfig
+
+
+def test_db_pool_stats(client):
+    response = client.get('/metrics/db-pool')
+    assert response.json() == {"result": True, "pool": {}}
+
+
+async def test_db_pool_stats_with_pooling():
+    url = sessionmanager.engine.url.render_as_string(hide_password=False)
+    manager = DatabaseSessionManager()
+    manager.init(url, PoolConfig(size=1, max_overflow=1))
+    try:
+        async with manager.session() as session:
+            await session.execute(text("select 1"))
+            async with manager.session() as overflow_session:
+                await overflow_session.execute(text("select 1"))
+                stats = manager.pool_stats()
+                assert stats["size"] == 1
+                assert stats["checked_out"] == 2
+                assert stats["overflow"] == 1
+        stats = manager.pool_stats()
+        assert stats["checked_out"] == 0
+        assert stats["checked_in"] == 1
+        assert stats["overflow"] == 0
+        assert stats["acquired"] == 2
+    finally:
+        await manager.close()
@@ -0,0 +1,85 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from backend.api.app_service.events import DISCONNECT, EventHub
+from backend.api.app_service.telemetry import (MetricsMiddleware, http_request_duration, http_requests,
+                                               http_requests_in_flight, sse_connections)
+from backend.api.core.base import sessionmanager
+from backend.api.core.config import config
+from backend.api.db.crud.event import publish_follow, publish_tweet
+
+
+def tweet_event(author_id):
+    return json.dumps({"type": "tweet", "author_id": author_id, "data": {"author": {"id": author_id}}})
+
+
+def test_tweets_are_routed_to_followers():
+    hub = EventHub()
+    with hub.subscribe(1, following=[2]) as subscription:
+        hub.deliver(tweet_event(2))
+        hub.deliver(tweet_event(3))
+        assert subscription.queue.qsize() == 1
+        assert subscription.queue.get_nowait().startswith(b"event: tweet\ndata: ")
+        hub.deliver(json.dumps({"type": "follow", "follower_id": 1, "followed_id": 3, "data": {}}))
+        hub.deliver(tweet_event(3))
+        assert subscription.queue.qsize() == 1
+    hub.deliver(tweet_event(2))
+    assert subscription.queue.qsize() == 1
+
+
+def test_slow_subscriber_is_disconnected(monkeypatch):
+    monkeypatch.setattr(config, "event_queue_size", 3)
+    hub = EventHub()
+    with hub.subscribe(1, following=[]) as subscription:
+        for _ in range(5):
+            hub.deliver(tweet_event(1))
+        events = [subscription.queue.get_nowait() for _ in range(3)]
+    assert events[-1] is DISCONNECT
+
+
+async def test_committed_events_reach_subscribers():
+    hub = EventHub()
+    hub.start(sessionmanager.engine.url)
+    try:
+        with hub.subscribe(1, following=[2]) as subscription:
+            await asyncio.wait_for(hub.listening.wait(), timeout=5)
+            async with sessionmanager.session() as session:
+                async with session.begin():
+                    await publish_tweet(session, 10, "Hello", [], (2, "author"))
+                    await publish_follow(session, (3, "follower"), 1)
+            tweet = await asyncio.wait_for(subscription.queue.get(), timeout=5)
+            follow = await asyncio.wait_for(subscription.queue.get(), timeout=5)
+    finally:
+        await hub.stop()
+    assert b'"content": "Hello"' in tweet
+    assert follow.startswith(b"event: follow\n")
+
+
+def sample_value(metric):
+    return sum(float(line.rsplit(" ", 1)[1]) for line in metric.samples())
+
+
+async def test_event_streams_are_not_timed():
+    route_label = 'route="/test/stream"'
+    gauges = {}
+
+    async def stream_app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"text/event-stream; charset=utf-8")]})
+        gauges["open"] = (sample_value(http_requests_in_flight), sample_value(sse_connections))
+        await send({"type": "http.response.body", "body": b""})
+
+    async def send(message):
+        pass
+
+    in_flight = sample_value(http_requests_in_flight)
+    streams = sample_value(sse_connections)
+    scope = {"type": "http", "method": "GET", "route": SimpleNamespace(path="/test/stream")}
+    await MetricsMiddleware(stream_app)(scope, None, send)
+
+    assert gauges["open"] == (in_flight, streams + 1)
+    assert sample_value(http_requests_in_flight) == in_flight
+    assert sample_value(sse_connections) == streams
+    assert not any(route_label in line for line in http_request_duration.samples())
+    assert any(route_label in line for line in http_requests.samples())
@@ -0,0 +1,56 @@
+import os.path
+
+from backend.api.core.base import DatabaseSessionManager, sessionmanager
+from backend.api.core.config import PoolConfig
+from backend.api.core.metrics import registry
+
+
+def test_metrics(client):
+    client.get('/api/tweets', headers={'api-key': 'test'})
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/plain')
+    assert 'http_requests_total{method="GET",route="/api/tweets",status="200"}' in response.text
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/api/tweets",le="+Inf"}' in response.text
+    assert 'db_queries_total{operation="SELECT"}' in response.text
+    assert 'db_query_duration_seconds_bucket{operation="SELECT",le="+Inf"}' in response.text
+    assert 'db_query_duration_seconds_count{operation="SELECT"}' in response.text
+
+
+def test_in_flight_requests(client):
+    response = client.get('/metrics')
+    assert 'http_requests_in_flight 1.0\n' in response.text
+    response = client.get('/metrics')
+    assert 'http_requests_in_flight 1.0\n' in response.text
+
+
+def test_media_upload_metrics(client):
+    with open(os.path.abspath('./tests/integration/media/test_image.png'), 'rb') as file:
+        client.post('/api/medias', headers={'api-key': 'test'},
+                    files={'file': ('test_image.png', file, 'image/png')})
+    response = client.get('/metrics')
+    assert 'media_upload_size_bytes_bucket{le="+Inf"}' in response.text
+    assert 'media_upload_size_bytes_count' in response.text
+    assert 'media_upload_duration_seconds_count' in response.text
+
+
+def test_unpooled_engine_has_no_pool_metrics(client):
+    response = client.get('/metrics')
+    assert 'db_pool_size' not in response.text
+
+
+async def test_pool_metrics_of_pooled_engine(monkeypatch):
+    url = sessionmanager.engine.url.render_as_string(hide_password=False)
+    pooled = DatabaseSessionManager()
+    pooled.init(url, PoolConfig(size=2, max_overflow=1))
+    monkeypatch.setattr(sessionmanager, "_engine", pooled.engine)
+    try:
+        async with pooled.session() as session:
+            await session.connection()
+            metrics = registry.render()
+        assert 'db_pool_size 2.0\n' in metrics
+        assert 'db_pool_checked_out 1.0\n' in metrics
+        assert 'db_pool_overflow' in metrics
+        assert 'db_pool_wait_time_total' in metrics
+    finally:
+        await pooled.close()
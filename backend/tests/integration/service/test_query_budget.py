@@ -0,0 +1,26 @@
+def test_timeline_query_budget(client, query_budget):
+    for number in range(20):
+        tweet_response = client.post('/api/tweets', json={"tweet_data": f"Tweet {number}", "tweet_media_ids": []},
+                                     headers={'api-key': "test"})
+        for api_key in ("test", "other"):
+            client.post(f"/api/tweets/{tweet_response.json()['tweet_id']}/likes", headers={'api-key': api_key})
+    response = client.get('/api/tweets', headers={'api-key': "test"})
+    assert len(response.json()['tweets']) == 20
+    query_budget(response, 3)
+
+
+def test_profile_query_budget(client, query_budget):
+    response = client.get('/api/users/me', headers={'api-key': "test"})
+    query_budget(response, 3)
+
+
+def test_like_query_budget(client, query_budget):
+    tweet_response = client.post('/api/tweets', json={"tweet_data": "Tweet for budget", "tweet_media_ids": []},
+                                 headers={'api-key': "test"})
+    response = client.post(f"/api/tweets/{tweet_response.json()['tweet_id']}/likes", headers={'api-key': "test"})
+    query_budget(response, 3)
+
+
+def test_query_count_header_is_debug_only(client):
+    response = client.get('/api/users/me', headers={'api-key': "test"})
+    assert 'x-query-count' not in response.headers
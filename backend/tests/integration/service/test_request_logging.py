@@ -0,0 +1,98 @@
+import logging
+from queue import Queue
+
+import pytest
+
+from backend.api.app_service.middleware import (DrainingQueueListener, DroppingQueueHandler,
+                                                LoggingMiddleware, request_logger)
+from backend.api.app_service.telemetry import log_records_dropped
+from backend.api.core.config import config
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+@pytest.fixture
+def request_log():
+    handler = ListHandler()
+    request_logger.addHandler(handler)
+    yield handler.messages
+    request_logger.removeHandler(handler)
+
+
+async def echo_app(scope, receive, send):
+    message = await receive()
+    status = 500 if scope["path"] == "/error" else 200
+    await send({"type": "http.response.start", "status": status, "headers": []})
+    await send({"type": "http.response.body", "body": message["body"]})
+
+
+async def call(middleware, path="/echo", headers=(), body=b""):
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    scope = {"type": "http", "method": "POST", "path": path, "headers": list(headers)}
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        pass
+
+    await middleware(scope, receive, send)
+
+
+def status_lines(messages):
+    return [message for message in messages if " Status: " in message]
+
+
+async def test_every_nth_request_and_server_errors_are_logged(monkeypatch, request_log):
+    monkeypatch.setattr(config, "log_sample_every", 2)
+    middleware = LoggingMiddleware(echo_app)
+    for _ in range(4):
+        await call(middleware)
+    await call(middleware, path="/error")
+    lines = status_lines(request_log)
+    assert len(lines) == 3
+    assert lines[-1].startswith("POST /error Status: 500")
+
+
+async def test_payloads_are_masked_and_truncated(monkeypatch, request_log):
+    monkeypatch.setattr(config, "log_payloads", True)
+    monkeypatch.setattr(config, "log_body_limit", 4)
+    headers = [(b"api-key", b"secret key"), (b"x-client", b"tests")]
+    await call(LoggingMiddleware(echo_app), headers=headers, body=b"abcdefgh")
+    assert "Size: 8" in status_lines(request_log)[0]
+    assert "Headers: {'api-key': '***', 'x-client': 'tests'}" in request_log
+    assert "Body: b'abcd'" in request_log
+    assert "Response: b'abcd'" in request_log
+    assert not any("secret key" in message for message in request_log)
+
+
+async def test_payloads_are_not_logged_by_default(request_log):
+    await call(LoggingMiddleware(echo_app), headers=[(b"api-key", b"secret key")], body=b"abc")
+    assert len(request_log) == 1
+
+
+def test_records_over_queue_size_are_dropped():
+    handler = DroppingQueueHandler(Queue(1))
+    dropped_before = sum(float(line.rsplit(" ", 1)[1]) for line in log_records_dropped.samples())
+    for index in range(3):
+        handler.emit(logging.makeLogRecord({"msg": f"record {index}"}))
+    dropped = sum(float(line.rsplit(" ", 1)[1]) for line in log_records_dropped.samples())
+    assert handler.queue.qsize() == 1
+    assert dropped - dropped_before == 2
+
+
+def test_listener_stops_with_full_queue():
+    log_queue = Queue(1)
+    written = ListHandler()
+    log_queue.put_nowait(logging.makeLogRecord({"msg": "queued"}))
+    listener = DrainingQueueListener(log_queue, written)
+    listener.start()
+    listener.stop()
+    assert written.messages == ["queued"]
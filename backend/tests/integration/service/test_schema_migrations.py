@@ -0,0 +1,117 @@
+from sqlalchemy import inspect, select, text
+
+from backend.api.core.base import Base, sessionmanager
+from backend.api.db.migrations import MIGRATIONS, schema_versions_table, upgrade_schema
+
+BASELINE_SCHEMA = (
+    """
+    CREATE TABLE users (
+        id SERIAL PRIMARY KEY,
+        key VARCHAR NOT NULL UNIQUE,
+        name VARCHAR(25) NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE tweets (
+        id SERIAL PRIMARY KEY,
+        content VARCHAR(500) NOT NULL,
+        attachments VARCHAR[],
+        author_id INTEGER REFERENCES users (id)
+    )
+    """,
+    """
+    CREATE TABLE media (
+        id SERIAL PRIMARY KEY,
+        uploader_id INTEGER REFERENCES users (id),
+        file_name VARCHAR NOT NULL,
+        link VARCHAR NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE likes (
+        user_id INTEGER REFERENCES users (id),
+        tweet_id INTEGER REFERENCES tweets (id)
+    )
+    """,
+    """
+    CREATE TABLE followers (
+        follower_id INTEGER REFERENCES users (id),
+        followed_id INTEGER REFERENCES users (id)
+    )
+    """,
+)
+
+BASELINE_DATA = (
+    "INSERT INTO users (id, key, name) VALUES (1, 'first', 'first'), (2, 'second', 'second'), (3, 'third', 'third')",
+    "INSERT INTO tweets (id, content, author_id) VALUES (1, 'Hello #Python', 1), (2, 'Hello @first', 2)",
+    "INSERT INTO likes (user_id, tweet_id) VALUES (2, 1), (2, 1), (3, 1), (NULL, 1)",
+    "INSERT INTO followers (follower_id, followed_id) VALUES (2, 1), (2, 1), (3, 1), (1, 2), (NULL, 2)",
+)
+
+
+async def reset_database(connection):
+    await connection.run_sync(Base.metadata.drop_all)
+    await connection.run_sync(schema_versions_table.drop, checkfirst=True)
+
+
+async def test_upgrade_schema_of_unversioned_database():
+    async with sessionmanager.connect() as connection:
+        await connection.run_sync(schema_versions_table.drop, checkfirst=True)
+        await connection.run_sync(upgrade_schema, Base.metadata)
+        await connection.run_sync(upgrade_schema, Base.metadata)
+        versions = (await connection.execute(select(schema_versions_table.c.version))).scalars().all()
+    assert sorted(versions) == [migration.version for migration in MIGRATIONS]
+
+
+async def test_upgrade_baseline_database():
+    async with sessionmanager.connect() as connection:
+        await reset_database(connection)
+        for statement in BASELINE_SCHEMA + BASELINE_DATA:
+            await connection.execute(text(statement))
+        await connection.run_sync(upgrade_schema, Base.metadata)
+
+        likes = (await connection.execute(text("SELECT user_id, tweet_id FROM likes"))).all()
+        followers = (await connection.execute(text("SELECT follower_id, followed_id FROM followers"))).all()
+        like_counts = dict((await connection.execute(text("SELECT id, like_count FROM tweets"))).all())
+        follow_counts = {
+            row.id: (row.followers_count, row.following_count)
+            for row in await connection.execute(
+                text("SELECT id, followers_count, following_count FROM users"),
+            )
+        }
+        timelines = (await connection.execute(text("SELECT user_id, tweet_id FROM timelines"))).all()
+        tags = (await connection.execute(text("SELECT tweet_id, tag FROM tweet_tags"))).all()
+        versions = (await connection.execute(select(schema_versions_table.c.version))).scalars().all()
+
+        def read_keys(sync_connection):
+            inspector = inspect(sync_connection)
+            primary_keys = {
+                table: inspector.get_pk_constraint(table)['constrained_columns']
+                for table in ('likes', 'followers')
+            }
+            indexes = {
+                index['name']
+                for table in ('likes', 'followers', 'tweets', 'timelines', 'media')
+                for index in inspector.get_indexes(table)
+            }
+            return primary_keys, indexes
+
+        primary_keys, indexes = await connection.run_sync(read_keys)
+
+    assert sorted(likes) == [(2, 1), (3, 1)]
+    assert sorted(followers) == [(1, 2), (2, 1), (3, 1)]
+    assert like_counts == {1: 2, 2: 0}
+    assert follow_counts == {1: (2, 1), 2: (1, 1), 3: (0, 1)}
+    assert sorted(timelines) == [(1, 1), (1, 2), (2, 1), (2, 2), (3, 1)]
+    assert sorted(tags) == [(1, '#python'), (2, '@first')]
+    assert primary_keys == {'likes': ['user_id', 'tweet_id'], 'followers': ['follower_id', 'followed_id']}
+    assert {
+        'ix_likes_tweet_id_user_id',
+        'ix_followers_followed_id_follower_id',
+        'ix_tweets_author_id_id',
+        'ix_tweets_search_vector',
+        'ix_timelines_user_id_author_id',
+        'ix_media_uploader_id',
+    } <= indexes
+    assert 'ix_media_file_name' not in indexes
+    assert sorted(versions) == [migration.version for migration in MIGRATIONS]
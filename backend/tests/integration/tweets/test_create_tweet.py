@@ -1,6 +1,28 @@
+import hashlib
+import os
+
+
 def test_create_tweet(client):
     response = client.post('/api/tweets', json={"tweet_data": "Test add tweet 1", "tweet_media_ids": []},
                            headers={'api-key': "test"})
     response_json = response.json()
     assert response_json['result'] is True
     assert isinstance(response_json['tweet_id'], int)
+
+
+def test_create_tweet_with_attachments(client):
+    with open(os.path.abspath('./tests/integration/media/test_image.png'), 'rb') as file:
+        image = file.read()
+    media_ids = []
+    file_names = []
+    for index, api_key in enumerate(("test", "test", "other")):
+        content = image + bytes([index])
+        response = client.post('/api/medias', headers={'api-key': api_key},
+                               files={'file': ('test_image.png', content, 'image/png')})
+        media_ids.append(response.json()['media_id'])
+        file_names.append(f'{hashlib.sha256(content).hexdigest()}.png')
+    client.post('/api/tweets', json={"tweet_data": "Tweet with media", "tweet_media_ids": media_ids[::-1]},
+                headers={'api-key': "test"})
+    response = client.get('/api/tweets', headers={'api-key': "test"})
+    attachments = response.json()['tweets'][0]['attachments']
+    assert [link.rsplit('/', 1)[-1] for link in attachments] == [file_names[1], file_names[0]]
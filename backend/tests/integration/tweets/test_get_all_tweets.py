@@ -1,3 +1,17 @@
 def test_get_all_tweets(client):
     response = client.get("/api/tweets", headers={'api-key': "test"})
-    assert response.json() == {"result": True, "tweets": []}
+    assert response.json() == {"result": True, "tweets": [], "next_cursor": None}
+
+
+def test_get_tweets_page(client):
+    for number in range(3):
+        client.post('/api/tweets', json={"tweet_data": f"Test tweet {number}", "tweet_media_ids": []},
+                    headers={'api-key': "test"})
+    response = client.get("/api/tweets?limit=2", headers={'api-key': "test"})
+    response_json = response.json()
+    assert [tweet['content'] for tweet in response_json['tweets']] == ["Test tweet 2", "Test tweet 1"]
+    next_cursor = response_json['next_cursor']
+    response = client.get(f"/api/tweets?limit=2&before_id={next_cursor}", headers={'api-key': "test"})
+    response_json = response.json()
+    assert [tweet['content'] for tweet in response_json['tweets']] == ["Test tweet 0"]
+    assert response_json['next_cursor'] is None
@@ -0,0 +1,21 @@
+def test_get_tweet_likes(client):
+    tweet_response = client.post('/api/tweets', json={"tweet_data": "Tweet for likers test", "tweet_media_ids": []},
+                                 headers={'api-key': "test"})
+    tweet_id = tweet_response.json().get("tweet_id")
+    for api_key in ("test", "test 2", "test 3"):
+        client.post(f"/api/tweets/{tweet_id}/likes", headers={'api-key': api_key})
+
+    response = client.get('/api/tweets', headers={'api-key': "test"})
+    tweet = response.json()['tweets'][0]
+    assert tweet['like_count'] == 3
+    assert tweet['liked_by_me'] is True
+
+    response = client.get(f"/api/tweets/{tweet_id}/likes?limit=2", headers={'api-key': "test"})
+    response_json = response.json()
+    assert len(response_json['likes']) == 2
+    next_cursor = response_json['next_cursor']
+    response = client.get(f"/api/tweets/{tweet_id}/likes?limit=2&before_id={next_cursor}",
+                          headers={'api-key': "test"})
+    response_json = response.json()
+    assert len(response_json['likes']) == 1
+    assert response_json['next_cursor'] is None
@@ -0,0 +1,21 @@
+def test_home_timeline(client):
+    author_id = client.get('/api/users/me', headers={'api-key': "author"}).json()['user']['id']
+    client.get('/api/users/me', headers={'api-key': "stranger"})
+    client.post('/api/tweets', json={"tweet_data": "Old tweet", "tweet_media_ids": []},
+                headers={'api-key': "author"})
+    client.post('/api/tweets', json={"tweet_data": "Stranger tweet", "tweet_media_ids": []},
+                headers={'api-key': "stranger"})
+    client.post(f'/api/users/{author_id}/follow', headers={'api-key': "reader"})
+    client.post('/api/tweets', json={"tweet_data": "New tweet", "tweet_media_ids": []},
+                headers={'api-key': "author"})
+    client.post('/api/tweets', json={"tweet_data": "Own tweet", "tweet_media_ids": []},
+                headers={'api-key': "reader"})
+
+    response = client.get('/api/tweets', headers={'api-key': "reader"})
+    contents = [tweet['content'] for tweet in response.json()['tweets']]
+    assert contents == ["Own tweet", "New tweet", "Old tweet"]
+
+    client.delete(f'/api/users/{author_id}/follow', headers={'api-key': "reader"})
+    response = client.get('/api/tweets', headers={'api-key': "reader"})
+    contents = [tweet['content'] for tweet in response.json()['tweets']]
+    assert contents == ["Own tweet"]
@@ -6,4 +6,20 @@ def test_like_and_unlike_tweet(client):
     assert response.json() == {"result": True}
     response = client.delete(f"/api/tweets/{tweet_id}/likes", headers={'api-key': "test"})
     assert response.json() == {"result": True}
-    client.delete(f'/api/tweets/{tweet_id}', headers={'api-key': "test"})
\ No newline at end of file
+    client.delete(f'/api/tweets/{tweet_id}', headers={'api-key': "test"})
+
+
+def test_like_and_unlike_errors(client):
+    tweet_response = client.post('/api/tweets', json={"tweet_data": "Tweet for like errors", "tweet_media_ids": []},
+                                 headers={'api-key': "test"})
+    tweet_id = tweet_response.json().get("tweet_id")
+    client.post(f"/api/tweets/{tweet_id}/likes", headers={'api-key': "test"})
+    response = client.post(f"/api/tweets/{tweet_id}/likes", headers={'api-key': "test"})
+    assert response.status_code == 405
+    assert client.get('/api/tweets', headers={'api-key': "test"}).json()['tweets'][0]['like_count'] == 1
+    client.delete(f"/api/tweets/{tweet_id}/likes", headers={'api-key': "test"})
+    response = client.delete(f"/api/tweets/{tweet_id}/likes", headers={'api-key': "test"})
+    assert response.status_code == 405
+    assert client.get('/api/tweets', headers={'api-key': "test"}).json()['tweets'][0]['like_count'] == 0
+    response = client.post("/api/tweets/100500/likes", headers={'api-key': "test"})
+    assert response.status_code == 404
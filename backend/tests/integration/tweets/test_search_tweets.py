@@ -0,0 +1,30 @@
+def test_search_tweets(client):
+    for tweet_data in ("Postgres full text search", "Search search search", "Nothing relevant here"):
+        client.post('/api/tweets', json={"tweet_data": tweet_data, "tweet_media_ids": []}, headers={'api-key': "test"})
+    response = client.get('/api/tweets/search', params={"q": "search"}, headers={'api-key': "test"})
+    assert response.status_code == 200
+    tweets = response.json()["tweets"]
+    assert [tweet["content"] for tweet in tweets] == ["Search search search", "Postgres full text search"]
+    assert response.json()["next_cursor"] is None
+
+
+def test_search_tweets_pagination(client):
+    for number in range(5):
+        client.post('/api/tweets', json={"tweet_data": f"Paged tweet {number}", "tweet_media_ids": []},
+                    headers={'api-key': "test"})
+    found = []
+    params = {"q": "paged", "limit": 2}
+    while True:
+        page = client.get('/api/tweets/search', params=params, headers={'api-key': "test"}).json()
+        found.extend(tweet["content"] for tweet in page["tweets"])
+        if page["next_cursor"] is None:
+            break
+        params["cursor"] = page["next_cursor"]
+    assert found == [f"Paged tweet {number}" for number in reversed(range(5))]
+
+
+def test_search_tweets_errors(client):
+    response = client.get('/api/tweets/search', params={"q": ""}, headers={'api-key': "test"})
+    assert response.status_code == 422
+    response = client.get('/api/tweets/search', params={"q": "tweet", "cursor": "garbage"}, headers={'api-key': "test"})
+    assert response.status_code == 422
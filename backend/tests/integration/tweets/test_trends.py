@@ -0,0 +1,19 @@
+def test_trends(client):
+    for tweet_data in ("#Python is great", "Learning #python with @mentor", "#GoLang or #python?"):
+        client.post('/api/tweets', json={"tweet_data": tweet_data, "tweet_media_ids": []}, headers={'api-key': "test"})
+    response = client.get('/api/trends', headers={'api-key': "test"})
+    assert response.status_code == 200
+    assert response.json()["trends"] == [
+        {"name": "#python", "tweets_count": 3},
+        {"name": "#golang", "tweets_count": 1},
+        {"name": "@mentor", "tweets_count": 1},
+    ]
+    response = client.get('/api/trends', params={"limit": 1}, headers={'api-key': "test"})
+    assert [trend["name"] for trend in response.json()["trends"]] == ["#python"]
+
+
+def test_tweet_without_tags_is_not_trending(client):
+    client.post('/api/tweets', json={"tweet_data": "mail me at user@example.com", "tweet_media_ids": []},
+                headers={'api-key': "test"})
+    response = client.get('/api/trends', headers={'api-key': "test"})
+    assert response.json()["trends"] == []
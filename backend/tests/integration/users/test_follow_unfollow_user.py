@@ -6,3 +6,17 @@ def test_follow_and_unfollow_user(client):
     assert response.json() == {"result": True}
     response = client.delete(f'/api/users/{user_id}/follow', headers={'api-key': "test"})
     assert response.json() == {"result": True}
+
+
+def test_follow_and_unfollow_errors(client):
+    user_id = client.get('/api/users/me', headers={'api-key': "test 2"}).json()['user']['id']
+    client.post(f'/api/users/{user_id}/follow', headers={'api-key': "test"})
+    response = client.post(f'/api/users/{user_id}/follow', headers={'api-key': "test"})
+    assert response.status_code == 405
+    response = client.post('/api/users/100500/follow', headers={'api-key': "test"})
+    assert response.status_code == 404
+    client.delete(f'/api/users/{user_id}/follow', headers={'api-key': "test"})
+    response = client.delete(f'/api/users/{user_id}/follow', headers={'api-key': "test"})
+    assert response.status_code == 405
+    response = client.delete('/api/users/100500/follow', headers={'api-key': "test"})
+    assert response.status_code == 404
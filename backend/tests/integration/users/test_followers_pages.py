@@ -0,0 +1,62 @@
+def test_follow_updates_counts(client):
+    followed = client.get('/api/users/me', headers={'api-key': "test 2"}).json()['user']
+    follower = client.get('/api/users/me', headers={'api-key': "test"}).json()['user']
+    client.post(f'/api/users/{followed["id"]}/follow', headers={'api-key': "test"})
+
+    response = client.get(f'/api/users/{followed["id"]}', headers={'api-key': "test"})
+    user_json = response.json()['user']
+    assert user_json['followers_count'] == followed['followers_count'] + 1
+    assert user_json['followed_by_me'] is True
+    assert 'followers' not in user_json
+
+    response = client.get('/api/users/me', headers={'api-key': "test"})
+    assert response.json()['user']['following_count'] == follower['following_count'] + 1
+
+    client.delete(f'/api/users/{followed["id"]}/follow', headers={'api-key': "test"})
+    response = client.get(f'/api/users/{followed["id"]}', headers={'api-key': "test"})
+    assert response.json()['user']['followers_count'] == followed['followers_count']
+    assert response.json()['user']['followed_by_me'] is False
+
+
+def test_followers_and_following_pages(client):
+    followed_id = client.get('/api/users/me', headers={'api-key': "test 2"}).json()['user']['id']
+    follower_id = client.get('/api/users/me', headers={'api-key': "test"}).json()['user']['id']
+    client.post(f'/api/users/{followed_id}/follow', headers={'api-key': "test"})
+
+    response = client.get(f'/api/users/{followed_id}/followers', headers={'api-key': "test"})
+    assert response.status_code == 200
+    assert follower_id in [user['id'] for user in response.json()['users']]
+
+    response = client.get(f'/api/users/{follower_id}/following', headers={'api-key': "test"})
+    assert followed_id in [user['id'] for user in response.json()['users']]
+
+    client.delete(f'/api/users/{followed_id}/follow', headers={'api-key': "test"})
+
+
+def test_followers_page_limit(client):
+    followed_id = client.get('/api/users/me', headers={'api-key': "test 2"}).json()['user']['id']
+    client.post(f'/api/users/{followed_id}/follow', headers={'api-key': "test"})
+
+    response = client.get(
+        f'/api/users/{followed_id}/followers',
+        params={'limit': 1},
+        headers={'api-key': "test"},
+    )
+    page = response.json()
+    assert len(page['users']) == 1
+    if page['next_cursor'] is not None:
+        response = client.get(
+            f'/api/users/{followed_id}/followers',
+            params={'limit': 1, 'before_id': page['next_cursor']},
+            headers={'api-key': "test"},
+        )
+        assert page['users'][0]['id'] not in [user['id'] for user in response.json()['users']]
+
+    client.delete(f'/api/users/{followed_id}/follow', headers={'api-key': "test"})
+
+
+def test_followers_of_unknown_user(client):
+    response = client.get('/api/users/100500/followers', headers={'api-key': "test"})
+    assert response.status_code == 404
+    response = client.get('/api/users/100500/following', headers={'api-key': "test"})
+    assert response.status_code == 404
@@ -0,0 +1,50 @@
+import asyncio
+
+from sqlalchemy import func, select, text
+
+from backend.api.core.base import sessionmanager
+from backend.api.db.crud.user import get_or_create_user
+from backend.api.db.models import User
+
+
+async def create_user(user_key, user_name):
+    async with sessionmanager.session() as session:
+        async with session.begin():
+            return await get_or_create_user(session, user_key, user_name)
+
+
+async def count_users(user_key):
+    async with sessionmanager.session() as session:
+        return (await session.execute(select(func.count()).where(User.key == user_key))).scalar_one()
+
+
+async def wait_for_lock_waiter():
+    async with sessionmanager.session() as session:
+        for _ in range(100):
+            waiting = await session.execute(
+                text("select count(*) from pg_stat_activity where wait_event_type = 'Lock'"),
+            )
+            if waiting.scalar_one():
+                return
+            await asyncio.sleep(0.05)
+    raise AssertionError("The concurrent insert did not wait for the first one")
+
+
+async def test_existing_user_is_returned():
+    first = await create_user("repeated key", "first name")
+    second = await create_user("repeated key", "second name")
+    assert second == first
+    assert second.name == "first name"
+    assert await count_users("repeated key") == 1
+
+
+async def test_concurrent_registration_returns_one_user():
+    async with sessionmanager.session() as session:
+        async with session.begin():
+            first = await get_or_create_user(session, "concurrent key", "first name")
+            second_task = asyncio.create_task(create_user("concurrent key", "second name"))
+            await wait_for_lock_waiter()
+            assert not second_task.done()
+    second = await second_task
+    assert second == first
+    assert await count_users("concurrent key") == 1
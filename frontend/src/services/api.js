@@ -86,16 +86,21 @@ export async function unfollowUser(userId) {
   return request({type: 'delete', path: `/api/users/${userId}/follow`})
 }
 
-export async function getTweets(){
-  return request({type: 'get', path: '/api/tweets'})
+export async function getTweets(limit, beforeId){
+  const params = new URLSearchParams()
+  if (limit) params.append('limit', limit)
+  if (beforeId) params.append('before_id', beforeId)
+  return request({type: 'get', path: `/api/tweets?${params}`})
 }
 
-export async function getTweetsWithPagination(offset, limit){
-  return request({type: 'get', path: `/api/tweets?offset=${offset}&limit=${limit}`})
+export async function searchTweets(query, limit, cursor){
+  const params = new URLSearchParams({q: query, limit})
+  if (cursor) params.append('cursor', cursor)
+  return request({type: 'get', path: `/api/tweets/search?${params}`})
 }
 
 export async function getTrends(){
-  return request({type: 'get', path: '/trends'})
+  return request({type: 'get', path: '/api/trends'})
 }
 
 export async function getMe(body){